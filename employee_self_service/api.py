@@ -1,5 +1,6 @@
 import frappe
-from frappe.utils import getdate, now_datetime, add_days
+
+from employee_self_service.employee_self_service.utils.map_markers import get_local_locations
 
 
 @frappe.whitelist(allow_guest=True)
@@ -13,86 +14,5 @@ def locations(date=None):
         total_active_employees – count of active employees
         employee_list – all active employees (for search dropdown)
     """
-    if not date:
-        date = frappe.utils.today()
-    else:
-        # Sanitise input
-        date = str(getdate(date))
-
-    # ── Fetch check-in records with location for the given date ──
-    checkins = frappe.db.sql("""
-        SELECT
-            ec.employee,
-            ec.employee_name,
-            ec.time,
-            ec.location,
-            ec.address,
-            ec.business_vertical,
-            ec.sales_order,
-            ec.log_type,
-            emp.company
-        FROM `tabEmployee Checkin` ec
-        LEFT JOIN `tabEmployee` emp ON emp.name = ec.employee
-        WHERE
-            ec.location IS NOT NULL
-            AND ec.location != ''
-            AND DATE(ec.time) = %(date)s
-            AND IFNULL(ec.rejected, 0) = 0
-        ORDER BY ec.time DESC
-    """, {"date": date}, as_dict=True)
-
-    records = []
-    for row in checkins:
-        records.append({
-            "employee": row.employee or "",
-            "employee_name": row.employee_name or "",
-            "location": row.location or "",
-            "time": frappe.utils.format_datetime(row.time, "hh:mm a") if row.time else "",
-            "company": row.company or "",
-            "address": row.address or "",
-            "business_vertical": row.business_vertical or "",
-            "sales_order": row.sales_order or "",
-            "log_type": row.log_type or "",
-        })
-
-    # ── Active employee count + list ─────────────────────────────
-    employees = frappe.db.sql("""
-        SELECT
-            name AS employee,
-            employee_name,
-            company
-        FROM `tabEmployee`
-        WHERE status = 'Active'
-        ORDER BY employee_name
-    """, as_dict=True)
-
-    employee_list = [
-        {
-            "employee": emp.employee,
-            "employee_name": emp.employee_name or "",
-            "company": emp.company or "",
-        }
-        for emp in employees
-    ]
-
-    # ── NTLE count: employees with NTLE but no check-in ─────────
-    day_start = date
-    day_end = str(add_days(getdate(date), 1))
-    ntle_count = frappe.db.sql("""
-        SELECT COUNT(DISTINCT ntle.employee) AS cnt
-        FROM `tabNo Team Leader Error` ntle
-        WHERE ntle.datetime >= %(day_start)s AND ntle.datetime < %(day_end)s
-        AND ntle.employee NOT IN (
-            SELECT DISTINCT ec.employee
-            FROM `tabEmployee Checkin` ec
-            WHERE ec.time >= %(day_start)s AND ec.time < %(day_end)s
-            AND ec.log_type = 'IN'
-        )
-    """, {"day_start": day_start, "day_end": day_end}, as_dict=True)[0].cnt or 0
-
-    return {
-        "records": records,
-        "total_active_employees": len(employee_list),
-        "employee_list": employee_list,
-        "ntle_count": ntle_count,
-    }
+    # Served from cache; the map's refresher keeps today's entry warm.
+    return get_local_locations(date)
@@ -54,6 +54,26 @@ CUSTOM_FIELDS = {
             "read_only": 1,
             "insert_after": "attendance_image",
         },
+        {
+            # Idempotency key of punches queued offline by the app and
+            # flushed through mobile.v1.checkin_sync; unique so a retried
+            # flush can never create the same punch twice.
+            "fieldname": "client_event_id",
+            "label": "Client Event ID",
+            "fieldtype": "Data",
+            "unique": 1,
+            "read_only": 1,
+            "no_copy": 1,
+            "insert_after": "log_location",
+        },
+        {
+            "fieldname": "device_unique_id",
+            "label": "Device Unique ID",
+            "fieldtype": "Data",
+            "read_only": 1,
+            "no_copy": 1,
+            "insert_after": "client_event_id",
+        },
     ],
 }
 
@@ -6,6 +6,9 @@ from __future__ import unicode_literals
 import frappe
 from frappe.model.document import Document
 
+from employee_self_service.employee_self_service.utils.change_detection import on_change_of
+from employee_self_service.employee_self_service.utils.instrumentation import instrumented
+
 class EmployeeDeviceRegistration(Document):
 	def validate(self):
 		self.update_status_from_employee()
@@ -18,6 +21,8 @@ class EmployeeDeviceRegistration(Document):
 				self.status = employee_status
 
 
+@instrumented("hook")
+@on_change_of("status")
 def update_device_registration_status(doc, method=None):
 	"""Called on Employee on_update to sync status to Employee Device Registration."""
 	registrations = frappe.get_all(
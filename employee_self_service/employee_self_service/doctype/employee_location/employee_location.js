@@ -2,7 +2,18 @@
 // For license information, please see license.txt
 
 frappe.ui.form.on('Employee Location', {
-	// refresh: function(frm) {
-
-	// }
+	refresh: function(frm) {
+		if (!frm.is_new()) {
+			frm.add_custom_button(__('Rebuild Map'), function() {
+				frappe.call({
+					method: 'employee_self_service.employee_self_service.utils.location_track.rebuild_track',
+					args: { name: frm.doc.name },
+					freeze: true,
+					callback: function() {
+						frm.reload_doc();
+					}
+				});
+			});
+		}
+	}
 });
@@ -2,9 +2,10 @@
 # For license information, please see license.txt
 
 import frappe
-
-import json
 from frappe.model.document import Document
+from frappe.utils import cstr, flt
+
+from employee_self_service.employee_self_service.utils.location_track import build_track
 
 
 class EmployeeLocation(Document):
@@ -12,29 +13,11 @@ class EmployeeLocation(Document):
         self.set_map_location()
 
     def set_map_location(self):
-        location_list = []
-        for location in self.location:
-            location_list.append([location.longitude, location.latitude])
-        map_json = {
-            "type": "FeatureCollection",
-            "features": [
-                {
-                    "type": "Feature",
-                    "properties": {},
-                    "geometry": {
-                        "type": "LineString",
-                        "coordinates": location_list,
-                    },
-                },
-                {
-                    "type": "Feature",
-                    "properties": {},
-                    "geometry": {
-                        "type": "Point",
-                        "coordinates": location_list[0],
-                    },
-                },
-            ],
-        }
-
-        self.location_map = json.dumps(map_json)
+        coordinates = [
+            [flt(location.longitude), flt(location.latitude)]
+            for location in self.location
+            if cstr(location.latitude).strip() and cstr(location.longitude).strip()
+        ]
+        self.location_map, self.track_polyline = build_track(coordinates)
+        self.point_count = len(coordinates)
+        self.compacted = 1
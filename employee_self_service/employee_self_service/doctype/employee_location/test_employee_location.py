@@ -2,8 +2,36 @@
 # See license.txt
 
 # import frappe
+import unittest
+
 from frappe.tests.utils import FrappeTestCase
 
+from employee_self_service.employee_self_service.utils.location_track import (
+	encode_polyline,
+	simplify,
+)
+
 
 class TestEmployeeLocation(FrappeTestCase):
 	pass
+
+
+class TestTrackGeometry(unittest.TestCase):
+	def test_encode_polyline(self):
+		# The reference example from Google's polyline format documentation.
+		coordinates = [[-120.2, 38.5], [-120.95, 40.7], [-126.453, 43.252]]
+		self.assertEqual(encode_polyline(coordinates), "_p~iF~ps|U_ulLnnqC_mqNvxq`@")
+
+	def test_encode_polyline_empty(self):
+		self.assertEqual(encode_polyline([]), "")
+
+	def test_simplify_drops_points_within_tolerance(self):
+		points = [[0, 0], [1, 0.00001], [2, 0], [3, 1], [4, 0]]
+		self.assertEqual(simplify(points, 0.001), [[0, 0], [2, 0], [3, 1], [4, 0]])
+
+	def test_simplify_straight_line(self):
+		self.assertEqual(simplify([[0, 0], [1, 0], [2, 0]], 0.1), [[0, 0], [2, 0]])
+
+	def test_simplify_keeps_short_tracks(self):
+		self.assertEqual(simplify([[0, 0], [1, 1]], 0.1), [[0, 0], [1, 1]])
+		self.assertEqual(simplify([], 0.1), [])
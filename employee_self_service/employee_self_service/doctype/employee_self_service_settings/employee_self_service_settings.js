@@ -2,7 +2,11 @@
 // For license information, please see license.txt
 
 frappe.ui.form.on('Employee Self Service Settings', {
-	// refresh: function(frm) {
-
-	// }
+	refresh: function(frm) {
+		frm.add_custom_button(__('Run Retention Now'), function() {
+			frappe.call({
+				method: 'employee_self_service.employee_self_service.utils.retention.run_retention_now'
+			});
+		});
+	}
 });
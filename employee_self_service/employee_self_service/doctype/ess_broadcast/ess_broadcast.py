@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026, Nesscale Solutions Private Limited and contributors
+# For license information, please see license.txt
+
+from __future__ import unicode_literals
+
+import json
+
+import frappe
+import requests
+from frappe.model.document import Document
+
+from employee_self_service.employee_self_service.utils.job_router import enqueue_job
+from employee_self_service.employee_self_service.utils.notification_inbox import (
+	get_broadcast_topic,
+	on_broadcast_delete,
+	on_broadcast_insert,
+)
+
+PUSH_URL = "https://notification.nesscale.com/api/method/ncs_nesscale.api.send_push_notification"
+PUSH_TIMEOUT = 10  # seconds
+TOKEN_BATCH_SIZE = 500
+
+
+class ESSBroadcast(Document):
+	def before_insert(self):
+		self.topic = self.topic or get_broadcast_topic()
+
+	def after_insert(self):
+		on_broadcast_insert()
+		enqueue_job(
+			"employee_self_service.employee_self_service.doctype.ess_broadcast.ess_broadcast.send_broadcast_push",
+			job_class="interactive",
+			enqueue_after_commit=True,
+			broadcast=self.name,
+		)
+
+	def on_trash(self):
+		frappe.db.sql("DELETE FROM `tabESS Broadcast Read` WHERE broadcast = %s", self.name)
+		on_broadcast_delete()
+
+	def send_push(self):
+		"""One request to the topic when ``push_broadcasts_to_topic`` is set
+		in the settings, else the registered device tokens in batches."""
+		if frappe.db.get_single_value("Employee Self Service Settings", "push_broadcasts_to_topic"):
+			self._post({"topic": self.topic, "tokens": []})
+			return
+
+		tokens = frappe.get_all(
+			"Employee Device Info",
+			filters=[["token", "is", "set"]],
+			pluck="token",
+		)
+		tokens = list(dict.fromkeys(tokens))
+		for i in range(0, len(tokens), TOKEN_BATCH_SIZE):
+			self._post({"tokens": tokens[i:i + TOKEN_BATCH_SIZE]})
+
+	def _post(self, target):
+		payload = {
+			"product_name": "OTPL ESS",
+			"subject": self.subject,
+			"message": self.message,
+			"notification_type": "info",
+			"erp_url": frappe.utils.get_url(),
+			"reference_document": self.reference_document,
+			"reference_name": self.reference_name,
+			"other_info": self.other_info,
+		}
+		payload.update(target)
+		try:
+			response = requests.post(
+				PUSH_URL,
+				headers={"Content-Type": "application/json"},
+				data=json.dumps(payload),
+				timeout=PUSH_TIMEOUT,
+			)
+			if response.status_code != 200:
+				frappe.log_error(
+					title="ESS Broadcast Push Error",
+					message="Failed to send broadcast {0}. Status Code: {1}, Response: {2}".format(
+						self.name, response.status_code, response.text
+					),
+				)
+		except Exception:
+			frappe.log_error(title="ESS Broadcast Push Error", message=frappe.get_traceback())
+
+
+def send_broadcast_push(broadcast):
+	"""Background job queued by ``after_insert``."""
+	if frappe.db.exists("ESS Broadcast", broadcast):
+		frappe.get_doc("ESS Broadcast", broadcast).send_push()
+
+
+def on_doctype_update():
+	# Inbox pages and the per-user "older than me" count range on creation.
+	frappe.db.add_index("ESS Broadcast", ["creation"])
+
+
+def create_broadcast(title, message, notification_type=None, reference_document=None,
+	reference_name=None, other_info=None, push_notification=None):
+	"""Store one announcement for every user; the push follows in the
+	background."""
+	doc = frappe.get_doc({
+		"doctype": "ESS Broadcast",
+		"subject": title,
+		"message": message,
+		"document_type": notification_type,
+		"reference_document": reference_document,
+		"reference_name": reference_name,
+		"other_info": other_info,
+		"push_notification": push_notification,
+	})
+	doc.insert(ignore_permissions=True)
+	return doc.name
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026, Nesscale Solutions Private Limited and Contributors
+# See license.txt
+from __future__ import unicode_literals
+
+import unittest
+from unittest.mock import patch
+
+import frappe
+
+from employee_self_service.employee_self_service.doctype.ess_broadcast.ess_broadcast import (
+	create_broadcast,
+)
+from employee_self_service.employee_self_service.utils.notification_inbox import (
+	get_unread_broadcast_count,
+)
+
+USER = "Administrator"
+
+
+class TestESSBroadcast(unittest.TestCase):
+	def setUp(self):
+		self.broadcast = None
+
+	def tearDown(self):
+		if self.broadcast:
+			frappe.delete_doc("ESS Broadcast", self.broadcast, ignore_permissions=True)
+			frappe.db.commit()
+
+	@patch("employee_self_service.employee_self_service.doctype.ess_broadcast.ess_broadcast.enqueue_job")
+	def test_insert_counts_as_unread_after_commit(self, enqueue_job):
+		# Builds the Redis counters, so the insert has to move them.
+		before = get_unread_broadcast_count(USER)
+
+		self.broadcast = create_broadcast("Test Broadcast", "Test broadcast message")
+		self.assertEqual(get_unread_broadcast_count(USER), before)
+
+		frappe.db.commit()
+		self.assertEqual(get_unread_broadcast_count(USER), before + 1)
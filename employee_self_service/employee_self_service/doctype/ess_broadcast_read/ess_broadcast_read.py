@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026, Nesscale Solutions Private Limited and contributors
+# For license information, please see license.txt
+
+from __future__ import unicode_literals
+
+import frappe
+from frappe.model.document import Document
+
+
+class ESSBroadcastRead(Document):
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("ESS Broadcast Read", ["user", "broadcast"])
@@ -5,11 +5,28 @@ import json
 
 import frappe
 import requests
+from frappe.utils import cint
 from frappe.model.document import Document
 
+from employee_self_service.employee_self_service.utils.notification_inbox import (
+    adjust_unread_count,
+)
+
 
 class ESSNotificationLog(Document):
+    def on_update(self):
+        before = self.get_doc_before_save()
+        if before and cint(before.read) != cint(self.read):
+            adjust_unread_count(self.recipient, -1 if self.read else 1)
+
+    def on_trash(self):
+        if not self.read:
+            adjust_unread_count(self.recipient, -1)
+
     def after_insert(self):
+        if not self.read:
+            adjust_unread_count(self.recipient, 1)
+
         target_site_url = "https://notification.nesscale.com/api/method/ncs_nesscale.api.send_push_notification"
 
         erp_url = frappe.utils.get_url()
@@ -49,6 +66,15 @@ class ESSNotificationLog(Document):
             )
 
 
+def on_doctype_update():
+    # Inbox pages and the unread count filter on recipient.
+    frappe.db.add_index("ESS Notification Log", ["recipient", "creation"])
+    # `read` is a reserved word, so quote it and name the index explicitly.
+    frappe.db.add_index(
+        "ESS Notification Log", ["recipient", "`read`"], "recipient_read_index"
+    )
+
+
 def create_ess_notification_log(
     user,
     title,
@@ -8,6 +8,7 @@ import frappe
 from frappe.utils import today, cint
 from frappe.model.document import Document
 from employee_self_service.employee_self_service.utils.otpl_attendance import get_address_from_lat_long
+from employee_self_service.employee_self_service.utils.people_directory import get_person_name
 
 
 class NoTeamLeaderError(Document):
@@ -120,8 +121,7 @@ class NoTeamLeaderError(Document):
 			manager_id = emp.external_report_to
 			if not manager_id:
 				return
-			# Fetch manager name from Employee doc if it exists, else fallback
-			manager_name = frappe.db.get_value("Employee Pull", manager_id, "employee_name") or manager_id
+			manager_name = get_person_name(manager_id)
 			row = frappe.db.sql("""
 				SELECT ll.location, ll.datetime AS checkin_time
 				FROM `tabLeader Location` ll
@@ -149,7 +149,7 @@ class NoTeamLeaderError(Document):
 				LIMIT 1
 			""", {"manager": manager_id, "today": today(), "error_time": self.datetime}, as_dict=1)
 
-			manager_name = frappe.db.get_value("Employee", manager_id, "employee_name") or manager_id
+			manager_name = get_person_name(manager_id)
 		update = {
 			"reporting_manager": manager_id,
 			"reporting_manager_name": manager_name,
@@ -195,7 +195,7 @@ class NoTeamLeaderError(Document):
 			manager_id = emp.external_report_to
 			if not manager_id:
 				return
-			manager_name = frappe.db.get_value("Employee Pull", manager_id, "employee_name") or manager_id
+			manager_name = get_person_name(manager_id)
 			row = frappe.db.sql("""
 				SELECT ll.location, ll.datetime AS checkin_time
 				FROM `tabLeader Location` ll
@@ -211,7 +211,7 @@ class NoTeamLeaderError(Document):
 			manager_id = emp.reports_to
 			if not manager_id:
 				return
-			manager_name = frappe.db.get_value("Employee", manager_id, "employee_name") or manager_id
+			manager_name = get_person_name(manager_id)
 			row = frappe.db.sql("""
 				SELECT ec.location, ec.time AS checkin_time
 				FROM `tabEmployee Checkin` ec
@@ -7,6 +7,7 @@ import frappe
 from frappe.model.document import Document
 from frappe.utils import flt, today
 from employee_self_service.employee_self_service.utils.erp_sync import push_expense_to_remote_erp
+from employee_self_service.employee_self_service.utils.instrumentation import instrumented
 
 
 class OTPLExpense(Document):
@@ -695,6 +696,7 @@ def get_supplier_by_gstin(gstin):
 	return None
 
 
+@instrumented("hook")
 def on_purchase_order_submit(doc, method):
 	"""Hook: when a Purchase Order linked to an OTPL Expense is submitted externally
 	(not from the OTPL Expense on_submit flow), auto-create Purchase Receipt, Purchase Invoice, and Payment Entry.
@@ -14,6 +14,7 @@ from employee_self_service.employee_self_service.utils.leave_escalation import (
 	get_employee_pull_contact,
 )
 from erpnext.hr.doctype.leave_application.leave_application import get_leave_balance_on
+from employee_self_service.employee_self_service.utils.instrumentation import instrumented
 
 class OTPLLeave(Document):
 	def validate(self):
@@ -795,6 +796,11 @@ class OTPLLeave(Document):
 				frappe.msgprint(f"Warning: Could not delete Leave Application {leave_app_name}", alert=True)
 
 
+def on_doctype_update():
+	# Payroll reads a period's approved leaves per employee range.
+	frappe.db.add_index("OTPL Leave", ["employee", "approved_from_date"])
+
+
 @frappe.whitelist()
 def bulk_cancel_otpl_leaves(names):
 	"""Bulk cancel OTPL Leaves from list view"""
@@ -914,6 +920,7 @@ def merge_half_day_pair(first, second):
 	return merged.name
 
 
+@instrumented("hook")
 def validate_leave_application_cancel(doc, method):
 	"""
 	Prevent direct cancellation of Leave Applications created from OTPL Leave.
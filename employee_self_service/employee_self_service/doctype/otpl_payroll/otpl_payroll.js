@@ -9,6 +9,11 @@ frappe.ui.form.on('OTPL Payroll', {
 				.addClass('btn-primary');
 		}
 		frm.add_custom_button(__('View Calculation'), () => view_calculation(frm));
+		if (!frm.is_new()) {
+			['CSV', 'XLSX', 'Parquet'].forEach((label) => {
+				frm.add_custom_button(__(label), () => export_sheet(frm, label.toLowerCase()), __('Export'));
+			});
+		}
 
 		if (frm.doc.from_date && frm.doc.to_date) {
 			const d = frappe.datetime;
@@ -91,6 +96,15 @@ function calculate_salary(frm) {
 	});
 }
 
+function export_sheet(frm, file_format) {
+	// Streamed server-side straight to a private file; the endpoint redirects
+	// to it, so open it in a new tab rather than going through frappe.call.
+	const args = $.param({ name: frm.doc.name, file_format });
+	window.open(
+		'/api/method/employee_self_service.employee_self_service.utils.export.export_payroll?' + args
+	);
+}
+
 // ---------------------------------------------------------------------------
 // View Calculation dialog
 // ---------------------------------------------------------------------------
@@ -23,11 +23,14 @@ from datetime import timedelta
 import frappe
 from frappe import _
 from frappe.model.document import Document
-from frappe.utils import cint, cstr, flt, getdate, get_last_day
+from frappe.utils import cint, cstr, flt, getdate, get_last_day, now_datetime
 
 from employee_self_service.employee_self_service.utils.daily_attendance import (
 	normalize_half_day_period,
 )
+from employee_self_service.employee_self_service.utils.leave_balance import (
+	get_leave_balances,
+)
 
 
 # Constants from the salary spec
@@ -41,6 +44,8 @@ WORKER_HARIDWAR_INCENTIVE = 200.0
 STD_HOURS_PER_DAY = 8.0
 # Salary hours used to compute the per-hour rate for OT.
 SALARY_HOURS_PER_DAY = 8.0
+# Rows per multi-row INSERT/UPDATE when rolling leave balances forward.
+LEAVE_BALANCE_BATCH_SIZE = 500
 
 
 # -----------------------------------------------------------------------------
@@ -68,6 +73,10 @@ class OTPLPayroll(Document):
 		"""
 		_persist_leave_balances(self)
 
+	def on_cancel(self):
+		"""Put back the AL balances this payroll rolled forward."""
+		_restore_leave_balances(self)
+
 
 # -----------------------------------------------------------------------------
 # Whitelisted entry points (called from the JS)
@@ -718,37 +727,21 @@ def _fetch_leave_balances(emp_ids):
 def _fetch_cl_balances(emp_ids, as_on_date):
 	"""Casual Leave balance per employee, as of ``as_on_date``.
 
-	Uses Frappe's standard ``get_leave_balance_on`` against leave type
-	``Casual Leave`` - the same source OTPL Leave uses when splitting
-	an application into CL + LWP.  Available for ALL employees regardless
-	of AL eligibility.
+	Same figure as Frappe's standard ``get_leave_balance_on`` against leave
+	type ``Casual Leave`` - the source OTPL Leave uses when splitting an
+	application into CL + LWP - computed for all employees from one read
+	of the leave ledger.  Available for ALL employees regardless of AL
+	eligibility.
 	"""
 	out = {e: 0.0 for e in emp_ids}
 	if not emp_ids:
 		return out
-	try:
-		from erpnext.hr.doctype.leave_application.leave_application import (
-			get_leave_balance_on,
-		)
-	except Exception:
-		return out
-	for emp in emp_ids:
-		try:
-			# Match the standard "Leave Balance" report: balance as of the
-			# given date, i.e. allocation − leaves taken strictly before
-			# ``as_on_date``. Do NOT pass
-			# ``consider_all_leaves_in_the_allocation_period=True`` — that
-			# would also subtract leaves applied AFTER the payroll period
-			# within the same allocation, which is not what payroll wants.
-			bal = get_leave_balance_on(
-				employee=emp,
-				leave_type="Casual Leave",
-				date=as_on_date,
-			) or 0
-			frappe.msgprint("CL balance for {emp} as of {as_on_date}: {bal}".format(emp=emp, as_on_date=as_on_date, bal=bal))
-			out[emp] = flt(bal)
-		except Exception:
-			out[emp] = 0.0
+	# Match the standard "Leave Balance" report: balance as of the given
+	# date, i.e. allocation − leaves taken strictly before ``as_on_date``.
+	# Do NOT consider all leaves in the allocation period — that would also
+	# subtract leaves applied AFTER the payroll period within the same
+	# allocation, which is not what payroll wants.
+	out.update(get_leave_balances(emp_ids, "Casual Leave", as_on_date))
 	return out
 
 
@@ -1409,23 +1402,130 @@ def _persist_leave_balances(doc):
 	Only AL-eligible employees (i.e. those that already have an entry in
 	OTPL Employee Leave Balance) get updated; CL is tracked by Frappe's
 	standard Leave Allocation system and is not written here.
+
+	Set-based: one SELECT for every balance row of the sheet's employees,
+	one multi-row INSERT into OTPL Leave Balance Log (previous -> new, so
+	``on_cancel`` can undo it) and one CASE UPDATE per chunk.
 	"""
+	closing = {}
 	for r in doc.employees:
-		bal_name = frappe.db.get_value(
-			"OTPL Employee Leave Balance", {"employee": r.employee}, "name"
+		if r.employee:
+			closing[r.employee] = flt(r.closing_al)
+	if not closing:
+		return
+
+	balances = frappe.db.sql(
+		"""
+		SELECT name, employee, al_balance, as_on_date
+		FROM `tabOTPL Employee Leave Balance`
+		WHERE employee IN %(emp_ids)s
+		""",
+		{"emp_ids": tuple(closing)},
+		as_dict=True,
+	)
+	if not balances:
+		return
+
+	now, user = now_datetime(), frappe.session.user
+	for chunk in _chunks(balances, LEAVE_BALANCE_BATCH_SIZE):
+		log_values = []
+		for b in chunk:
+			log_values.extend([
+				frappe.generate_hash(length=10), now, now, user, user,
+				doc.name, b.employee, flt(b.al_balance), closing[b.employee],
+				b.as_on_date, doc.to_date,
+			])
+		frappe.db.sql(
+			"""
+			INSERT INTO `tabOTPL Leave Balance Log`
+				(name, creation, modified, owner, modified_by,
+				 payroll, employee, previous_al_balance, new_al_balance,
+				 previous_as_on_date, new_as_on_date)
+			VALUES {rows}
+			""".format(rows=", ".join(["(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"] * len(chunk))),
+			tuple(log_values),
 		)
-		if not bal_name:
-			continue
-		frappe.db.set_value(
-			"OTPL Employee Leave Balance",
-			bal_name,
-			{
-				"al_balance": flt(r.closing_al),
-				"as_on_date": doc.to_date,
-			},
-			update_modified=True,
+		_bulk_set_leave_balances(
+			[(b.name, closing[b.employee], doc.to_date) for b in chunk], now, user
 		)
-	frappe.db.commit()
+
+
+def _restore_leave_balances(doc):
+	"""Undo ``_persist_leave_balances`` for a cancelled payroll.
+
+	Balances are put back to the values recorded in OTPL Leave Balance Log,
+	but only where the balance is still the one this payroll wrote
+	(``as_on_date`` unchanged) - a later payroll that already rolled the
+	balance forward is never clobbered.
+	"""
+	logs = frappe.db.sql(
+		"""
+		SELECT lg.name AS log_name, bal.name, lg.previous_al_balance,
+			lg.previous_as_on_date
+		FROM `tabOTPL Leave Balance Log` lg
+		INNER JOIN `tabOTPL Employee Leave Balance` bal
+			ON bal.employee = lg.employee
+		WHERE lg.payroll = %(payroll)s
+		  AND lg.restored = 0
+		  AND bal.as_on_date = lg.new_as_on_date
+		""",
+		{"payroll": doc.name},
+		as_dict=True,
+	)
+	if not logs:
+		return
+
+	now, user = now_datetime(), frappe.session.user
+	for chunk in _chunks(logs, LEAVE_BALANCE_BATCH_SIZE):
+		_bulk_set_leave_balances(
+			[(l.name, flt(l.previous_al_balance), l.previous_as_on_date) for l in chunk],
+			now, user,
+		)
+		frappe.db.sql(
+			"""
+			UPDATE `tabOTPL Leave Balance Log`
+			SET restored = 1, modified = %(now)s, modified_by = %(user)s
+			WHERE name IN %(names)s
+			""",
+			{"names": tuple(l.log_name for l in chunk), "now": now, "user": user},
+		)
+
+
+def _bulk_set_leave_balances(updates, now, user):
+	"""Single multi-row UPDATE of OTPL Employee Leave Balance.
+
+	``updates`` is a list of ``(name, al_balance, as_on_date)`` tuples.
+	"""
+	al_cases, date_cases, values = [], [], []
+	for name, al_balance, as_on_date in updates:
+		al_cases.append("WHEN %s THEN %s")
+		values.extend([name, al_balance])
+	for name, al_balance, as_on_date in updates:
+		date_cases.append("WHEN %s THEN %s")
+		values.extend([name, as_on_date])
+	values.extend([now, user])
+	values.extend([u[0] for u in updates])
+
+	frappe.db.sql(
+		"""
+		UPDATE `tabOTPL Employee Leave Balance`
+		SET al_balance = CASE name {al_cases} END,
+			as_on_date = CASE name {date_cases} END,
+			modified = %s,
+			modified_by = %s
+		WHERE name IN ({names})
+		""".format(
+			al_cases=" ".join(al_cases),
+			date_cases=" ".join(date_cases),
+			names=", ".join(["%s"] * len(updates)),
+		),
+		tuple(values),
+	)
+
+
+def _chunks(rows, size):
+	for i in range(0, len(rows), size):
+		yield rows[i:i + size]
 
 
 # -----------------------------------------------------------------------------
@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026, Nesscale Solutions Private Limited and contributors
+# For license information, please see license.txt
+
+from __future__ import unicode_literals
+
+import frappe
+from frappe.model.document import Document
+
+
+class PeopleDirectory(Document):
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("People Directory", ["employee", "source"])
+	frappe.db.add_index("People Directory", ["source", "source_modified"])
@@ -6,6 +6,10 @@ from frappe.model.document import Document
 import json
 import datetime
 
+from employee_self_service.employee_self_service.doctype.ess_broadcast.ess_broadcast import (
+    create_broadcast,
+)
+
 
 class PushNotification(Document):
     def after_insert(self):
@@ -43,18 +47,14 @@ class PushNotification(Document):
                 )
 
         elif self.send_for == "All User":
-            device_infos = frappe.db.get_list(
-                "Employee Device Info",
-                filters=[["Employee Device Info", "token", "is", "set"]],
-                fields=["token", "user"],
+            # Stored once instead of one ESS Notification Log (and push
+            # request) per device; the push is sent in the background.
+            create_broadcast(
+                self.title,
+                self.message,
+                notification_type=self.notification_type,
+                push_notification=self.name,
             )
-            if device_infos:
-                send_multiple_notification(
-                    device_infos,
-                    self.title,
-                    self.message,
-                    self.notification_type,
-                )
 
         elif self.send_for == "Send to Group":
             group_users = frappe.get_all("Employee Group Employees",filters={"parent":self.employee_group,"parenttype":"OTPL Employee Group"},fields=["user"]) or []
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026, Nesscale Solutions Private Limited and Contributors
+# See license.txt
+from __future__ import unicode_literals
+
+import unittest
+from unittest.mock import patch
+
+import frappe
+
+from employee_self_service.employee_self_service.utils.reporting_hierarchy import (
+	get_ancestors,
+	get_descendants,
+	move_node,
+	rebuild_hierarchy,
+)
+
+E, P = "Employee", "Employee Pull"
+
+
+class TestReportingHierarchy(unittest.TestCase):
+	def setUp(self):
+		frappe.db.sql("DELETE FROM `tabReporting Hierarchy`")
+
+	def tearDown(self):
+		frappe.db.rollback()
+
+	def chain(self, node):
+		return [r.ancestor for r in get_ancestors(node, include_self=True)]
+
+	def test_move_node_builds_paths(self):
+		move_node("RH-A", E, None, None)
+		move_node("RH-B", E, "RH-A", E)
+		move_node("RH-C", E, "RH-B", E)
+
+		self.assertEqual(self.chain("RH-C"), ["RH-C", "RH-B", "RH-A"])
+		self.assertEqual(
+			[(d.descendant, d.depth) for d in get_descendants("RH-A")],
+			[("RH-B", 1), ("RH-C", 2)],
+		)
+
+	def test_move_node_moves_subtree(self):
+		move_node("RH-A", E, None, None)
+		move_node("RH-D", E, None, None)
+		move_node("RH-B", E, "RH-A", E)
+		move_node("RH-C", E, "RH-B", E)
+
+		move_node("RH-B", E, "RH-D", E)
+
+		self.assertEqual(self.chain("RH-C"), ["RH-C", "RH-B", "RH-D"])
+		self.assertFalse(get_descendants("RH-A"))
+
+	def test_move_node_refuses_loop(self):
+		move_node("RH-B", E, "RH-A", E)
+		move_node("RH-C", E, "RH-B", E)
+
+		move_node("RH-A", E, "RH-C", E)
+
+		self.assertEqual(self.chain("RH-A"), ["RH-A"])
+		self.assertEqual(self.chain("RH-C"), ["RH-C", "RH-B", "RH-A"])
+
+	def test_move_node_before_parent_is_synced(self):
+		move_node("RH-B", E, "RH-PULL-A", P)
+		move_node("RH-PULL-A", P, "RH-A", E)
+
+		self.assertEqual(self.chain("RH-B"), ["RH-B", "RH-PULL-A", "RH-A"])
+
+	def test_rebuild_hierarchy(self):
+		# RH-B -> external manager RH-PULL-X (remote RX) -> Pull of RX's
+		# manager RY -> local Employee RH-A
+		employees = [
+			frappe._dict(name="RH-A", reports_to=None, external_report_to=None, external_reporting_manager=0),
+			frappe._dict(name="RH-B", reports_to="RH-A", external_report_to="RH-PULL-X", external_reporting_manager=1),
+			frappe._dict(name="RH-C", reports_to="RH-B", external_report_to=None, external_reporting_manager=0),
+		]
+		pulls = [
+			frappe._dict(name="RH-PULL-X", employee="RX", reports_to="RY", external_reports_to=None),
+			frappe._dict(name="RH-PULL-Y", employee="RY", reports_to=None, external_reports_to="RH-A-1"),
+		]
+
+		def get_all(doctype, *args, **kwargs):
+			return {E: employees, P: pulls}[doctype]
+
+		with patch.object(frappe, "get_all", get_all):
+			rebuild_hierarchy()
+
+		self.assertEqual(
+			self.chain("RH-C"),
+			["RH-C", "RH-B", "RH-PULL-X", "RH-PULL-Y", "RH-A"],
+		)
+		self.assertEqual(
+			{(d.descendant, d.descendant_doctype) for d in get_descendants("RH-A")},
+			{("RH-PULL-Y", P), ("RH-PULL-X", P), ("RH-B", E), ("RH-C", E)},
+		)
+
+	def test_rebuild_hierarchy_matches_moves(self):
+		employees = [
+			frappe._dict(name="RH-A", reports_to=None, external_report_to=None, external_reporting_manager=0),
+			frappe._dict(name="RH-B", reports_to="RH-A", external_report_to=None, external_reporting_manager=0),
+			frappe._dict(name="RH-C", reports_to="RH-B", external_report_to=None, external_reporting_manager=0),
+		]
+		move_node("RH-A", E, None, None)
+		move_node("RH-B", E, "RH-A", E)
+		move_node("RH-C", E, "RH-B", E)
+		by_moves = self.rows()
+
+		with patch.object(frappe, "get_all", lambda doctype, *a, **k: employees if doctype == E else []):
+			rebuild_hierarchy()
+
+		self.assertEqual(self.rows(), by_moves)
+
+	def rows(self):
+		return sorted(frappe.db.sql(
+			"SELECT ancestor, ancestor_doctype, descendant, descendant_doctype, depth "
+			"FROM `tabReporting Hierarchy`"
+		))
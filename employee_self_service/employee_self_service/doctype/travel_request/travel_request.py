@@ -14,6 +14,8 @@ from employee_self_service.employee_self_service.utils.leave_escalation import (
 	get_employee_contact,
 	get_employee_pull_contact,
 )
+from employee_self_service.employee_self_service.utils.instrumentation import instrumented
+from employee_self_service.employee_self_service.utils.job_router import routed
 
 
 class TravelRequest(Document):
@@ -315,6 +317,8 @@ def mark_travel_dates_present(employee, date_of_departure, date_of_arrival, trav
 			)
 
 
+@routed("bulk")
+@instrumented("job")
 def process_travel_requests():
 	"""
 	Scheduled task: runs daily.
@@ -0,0 +1,82 @@
+frappe.pages["ess-performance"].on_page_load = function (wrapper) {
+	const page = frappe.ui.make_app_page({
+		parent: wrapper,
+		title: "ESS Performance",
+		single_column: true,
+	});
+
+	const kind = page.add_field({
+		fieldname: "kind",
+		label: __("Kind"),
+		fieldtype: "Select",
+		options: ["", "api", "hook", "job"],
+		change: () => refresh(),
+	});
+
+	page.set_primary_action(__("Refresh"), () => refresh(), "refresh");
+	page.add_menu_item(__("Reset Stats"), () => {
+		frappe.confirm(__("Clear all collected timings?"), () => {
+			frappe.call({
+				method: "employee_self_service.employee_self_service.utils.instrumentation.reset_stats",
+				callback: () => refresh(),
+			});
+		});
+	});
+
+	const $body = $(`<div class="ess-performance frappe-card"></div>`).appendTo(page.main);
+
+	const columns = [
+		["name", __("Name")],
+		["count", __("Calls")],
+		["errors", __("Errors")],
+		["avg_ms", __("Avg ms")],
+		["p50_ms", __("p50 ms")],
+		["p95_ms", __("p95 ms")],
+		["p99_ms", __("p99 ms")],
+		["max_ms", __("Max ms")],
+		["avg_queries", __("Queries / call")],
+		["avg_sql_ms", __("SQL ms")],
+		["avg_http_ms", __("HTTP ms")],
+	];
+
+	function refresh() {
+		frappe.call({
+			method: "employee_self_service.employee_self_service.utils.instrumentation.get_stats",
+			args: { kind: kind.get_value() || null },
+			callback: (r) => render(r.message || []),
+		});
+	}
+
+	function render(rows) {
+		if (!rows.length) {
+			$body.html(`<p class="text-muted">${__("No calls recorded yet.")}</p>`);
+			return;
+		}
+		const head = columns.map(([, label]) => `<th>${label}</th>`).join("");
+		const body = rows
+			.map((row) => {
+				const cells = columns
+					.map(([field]) => {
+						let value = row[field];
+						if (field === "name") {
+							value = `<span class="text-muted">${row.kind}</span> ${frappe.utils.escape_html(value)}`;
+						}
+						return `<td>${value === null || value === undefined ? "-" : value}</td>`;
+					})
+					.join("");
+				return `<tr>${cells}</tr>`;
+			})
+			.join("");
+		$body.html(`
+			<table class="table table-bordered table-condensed">
+				<thead><tr>${head}</tr></thead>
+				<tbody>${body}</tbody>
+			</table>
+			<p class="text-muted small">${__(
+				"Percentiles are bucket upper bounds. Query counts and SQL time come from a sample of calls."
+			)}</p>
+		`);
+	}
+
+	refresh();
+};
@@ -47,6 +47,8 @@ from __future__ import unicode_literals
 import frappe
 from frappe.utils import getdate, add_days, today
 
+from employee_self_service.employee_self_service.utils.leave_occupancy import get_employees_on_leave
+
 
 DISCREPANCY_MISSING_CHECKOUT = "Absent - Missing Check-out"
 DISCREPANCY_MISSING_CHECKIN = "Absent - Missing Check-in"
@@ -239,18 +241,7 @@ def get_data(filters):
 	attendance_map = {a.employee: a for a in attendance_records}
 
 	# Approved leave applications covering the date
-	leave_apps = frappe.db.sql(
-		"""
-		SELECT employee
-		FROM `tabLeave Application`
-		WHERE status = 'Approved' AND docstatus = 1
-		  AND from_date <= %(date)s AND to_date >= %(date)s
-		  AND employee IN %(employees)s
-		""",
-		{"date": date, "employees": emp_ids},
-		as_dict=True,
-	)
-	on_leave = {l.employee for l in leave_apps}
+	on_leave = set(get_employees_on_leave(date, employees=emp_ids))
 
 	# Per-employee holiday flag
 	holiday_map = _build_holiday_map(employees, date)
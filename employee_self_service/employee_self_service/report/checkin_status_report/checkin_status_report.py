@@ -6,6 +6,8 @@ from __future__ import unicode_literals
 import frappe
 from frappe.utils import getdate, today, add_days
 
+from employee_self_service.employee_self_service.utils.people_directory import get_people
+
 
 def execute(filters=None):
 	columns = get_columns()
@@ -159,17 +161,16 @@ def get_data(filters):
 
 	# 4. Build report rows
 	data = []
+	managers = get_people(
+		[emp.external_report_to for emp in all_employees] + [emp.reports_to for emp in all_employees]
+	)
+
 	for emp in all_employees:
 		# Resolve reporting manager name
 		reporting_manager_name = ""
-		if emp.external_reporting_manager and emp.external_report_to:
-			reporting_manager_name = frappe.db.get_value(
-				"Employee Pull", emp.external_report_to, "employee_name"
-			) or emp.external_report_to
-		elif emp.reports_to:
-			reporting_manager_name = frappe.db.get_value(
-				"Employee", emp.reports_to, "employee_name"
-			) or emp.reports_to
+		manager = emp.external_report_to if emp.external_reporting_manager and emp.external_report_to else emp.reports_to
+		if manager:
+			reporting_manager_name = (managers.get(manager) or {}).get("employee_name") or manager
 
 		# Resolve sales order
 		if emp.external_sales_order and emp.external_order:
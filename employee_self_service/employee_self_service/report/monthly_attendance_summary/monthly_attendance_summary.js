@@ -36,6 +36,18 @@ frappe.query_reports['Monthly Attendance Summary'] = {
 		}
 	],
 
+	onload: function(report) {
+		['CSV', 'XLSX', 'Parquet'].forEach(function(label) {
+			report.page.add_inner_button(__(label), function() {
+				var args = $.param({
+					filters: JSON.stringify(report.get_values()),
+					file_format: label.toLowerCase()
+				});
+				window.open('/api/method/employee_self_service.employee_self_service.utils.export.export_monthly_attendance_summary?' + args);
+			}, __('Export'));
+		});
+	},
+
 	formatter: function(value, row, column, data, default_formatter) {
 		value = default_formatter(value, row, column, data);
 
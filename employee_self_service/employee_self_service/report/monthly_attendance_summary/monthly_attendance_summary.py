@@ -7,7 +7,6 @@ import frappe
 from frappe.utils import getdate, add_days
 from calendar import monthrange
 from employee_self_service.mobile.v1.attendance import (
-	get_attendance_records,
 	get_employee_holidays,
 	build_attendance_data,
 )
@@ -73,6 +72,16 @@ def get_columns(year, month, days_in_month):
 
 
 def get_data(filters, year, month, days_in_month):
+	return list(iter_data(filters, year, month, days_in_month))
+
+
+def iter_data(filters, year, month, days_in_month, chunk_size=500):
+	"""Yield one grid row per employee.
+
+	Employees are paged ``chunk_size`` at a time and each page's Attendance
+	is fetched in a single query, so callers that stream the rows (see
+	``utils.export``) never hold more than one page in memory.
+	"""
 	month_start = f"{year}-{month:02d}-01"
 	month_end = f"{year}-{month:02d}-{days_in_month}"
 
@@ -85,94 +94,122 @@ def get_data(filters, year, month, days_in_month):
 	if filters.get("company"):
 		emp_filters["company"] = filters.get("company")
 
-	employees = frappe.get_all(
-		"Employee",
-		filters=emp_filters,
-		fields=["name", "employee_name", "department", "company", "no_check_in"],
-		order_by="employee_name asc",
-	)
-
-	if not employees:
-		return []
-
-	today = getdate()
-	yesterday = getdate(add_days(today, -1))
-	data = []
-
-	for emp in employees:
-		row = {
-			"employee": emp.name,
-			"employee_name": emp.employee_name,
-			"department": emp.department or "",
-			"total_present": 0,
-			"total_absent": 0,
-			"total_leave": 0,
-			"total_half_day": 0,
-			"total_holiday": 0,
-			"total_no_record": 0,
-		}
-
-		# Use shared build_attendance_data for consistent holiday/no_check_in handling
-		attendance_records = get_attendance_records(emp.name, month_start, month_end)
-		emp_holidays = get_employee_holidays(emp.name, month_start, month_end)
-		emp_data = {"no_check_in": emp.get("no_check_in")}
-		attendance_map = build_attendance_data(
-			year, month, days_in_month, attendance_records, emp_holidays, emp_data
+	yesterday = getdate(add_days(getdate(), -1))
+	start = 0
+
+	while True:
+		employees = frappe.get_all(
+			"Employee",
+			filters=emp_filters,
+			fields=["name", "employee_name", "department", "company", "no_check_in"],
+			order_by="employee_name asc, name asc",
+			limit_start=start,
+			limit_page_length=chunk_size,
 		)
+		if not employees:
+			return
 
-		# Track original "On Leave" dates (build_attendance_data maps them to "Absent")
-		on_leave_dates = {
-			getdate(rec.attendance_date).strftime("%Y-%m-%d")
-			for rec in attendance_records
-			if rec.status == "On Leave"
-		}
+		records_by_emp = get_attendance_records_for(
+			[emp.name for emp in employees], month_start, month_end
+		)
+		for emp in employees:
+			yield build_row(
+				emp, year, month, days_in_month, yesterday,
+				records_by_emp.get(emp.name, []),
+				get_employee_holidays(emp.name, month_start, month_end),
+			)
+
+		if len(employees) < chunk_size:
+			return
+		start += chunk_size
+
+
+def get_attendance_records_for(employees, start_date, end_date):
+	"""Submitted Attendance of many employees, grouped by employee."""
+	out = {}
+	for rec in frappe.get_all(
+		"Attendance",
+		filters={
+			"employee": ["in", employees],
+			"attendance_date": ["between", [start_date, end_date]],
+			"docstatus": 1,
+		},
+		fields=["employee", "attendance_date", "status"],
+	):
+		out.setdefault(rec.employee, []).append(rec)
+	return out
+
+
+def build_row(emp, year, month, days_in_month, yesterday, attendance_records, emp_holidays):
+	row = {
+		"employee": emp.name,
+		"employee_name": emp.employee_name,
+		"department": emp.department or "",
+		"total_present": 0,
+		"total_absent": 0,
+		"total_leave": 0,
+		"total_half_day": 0,
+		"total_holiday": 0,
+		"total_no_record": 0,
+	}
 
-		for day in range(1, days_in_month + 1):
-			date = getdate(f"{year}-{month:02d}-{day:02d}")
-			date_str = date.strftime("%Y-%m-%d")
+	# Use shared build_attendance_data for consistent holiday/no_check_in handling
+	emp_data = {"no_check_in": emp.get("no_check_in")}
+	attendance_map = build_attendance_data(
+		year, month, days_in_month, attendance_records, emp_holidays, emp_data
+	)
 
-			# Only show data up to yesterday; today and future dates are blank
-			if date > yesterday:
-				row[f"day_{day}"] = ""
-				continue
+	# Track original "On Leave" dates (build_attendance_data maps them to "Absent")
+	on_leave_dates = {
+		getdate(rec.attendance_date).strftime("%Y-%m-%d")
+		for rec in attendance_records
+		if rec.status == "On Leave"
+	}
 
-			status = attendance_map.get(date_str, "")
+	for day in range(1, days_in_month + 1):
+		date = getdate(f"{year}-{month:02d}-{day:02d}")
+		date_str = date.strftime("%Y-%m-%d")
+
+		# Only show data up to yesterday; today and future dates are blank
+		if date > yesterday:
+			row[f"day_{day}"] = ""
+			continue
+
+		status = attendance_map.get(date_str, "")
+
+		# Restore "On Leave" distinction
+		if status == "Absent" and date_str in on_leave_dates:
+			status = "On Leave"
+
+		if status == "Present":
+			display = "P"
+			row["total_present"] += 1
+		elif status == "Absent":
+			display = "A"
+			row["total_absent"] += 1
+		elif status == "On Leave":
+			display = "L"
+			row["total_leave"] += 1
+		elif status == "Half Day":
+			display = "HD"
+			row["total_half_day"] += 1
+		elif status == "Work From Home":
+			display = "WFH"
+			row["total_present"] += 1
+		elif status == "Holiday":
+			display = "H"
+			row["total_holiday"] += 1
+		elif status == "No Record":
+			display = "-"
+			row["total_no_record"] += 1
+		else:
+			display = status[:1] if status else ""
+			if status:
+				row["total_present"] += 1
 
-			# Restore "On Leave" distinction
-			if status == "Absent" and date_str in on_leave_dates:
-				status = "On Leave"
+		row[f"day_{day}"] = display
 
-			if status == "Present":
-				display = "P"
-				row["total_present"] += 1
-			elif status == "Absent":
-				display = "A"
-				row["total_absent"] += 1
-			elif status == "On Leave":
-				display = "L"
-				row["total_leave"] += 1
-			elif status == "Half Day":
-				display = "HD"
-				row["total_half_day"] += 1
-			elif status == "Work From Home":
-				display = "WFH"
-				row["total_present"] += 1
-			elif status == "Holiday":
-				display = "H"
-				row["total_holiday"] += 1
-			elif status == "No Record":
-				display = "-"
-				row["total_no_record"] += 1
-			else:
-				display = status[:1] if status else ""
-				if status:
-					row["total_present"] += 1
-
-			row[f"day_{day}"] = display
-
-		data.append(row)
-
-	return data
+	return row
 
 
 def get_chart(data):
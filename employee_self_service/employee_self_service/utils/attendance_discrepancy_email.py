@@ -10,9 +10,13 @@ from frappe.utils import getdate, add_days, today, format_datetime
 from employee_self_service.employee_self_service.report.attendance_discrepancy_report.attendance_discrepancy_report import (
 	execute as run_discrepancy_report,
 )
+from employee_self_service.employee_self_service.utils.instrumentation import instrumented
+from employee_self_service.employee_self_service.utils.job_router import routed
 
 
 @frappe.whitelist()
+@routed("bulk")
+@instrumented("job")
 def send_attendance_discrepancy_email(date=None):
 	try:
 		"""Build the Attendance Discrepancy Report for the given date (default: yesterday)
@@ -1,5 +1,7 @@
 import frappe
 from frappe.utils import today, now_datetime, get_datetime, add_days
+from employee_self_service.employee_self_service.utils.instrumentation import instrumented
+from employee_self_service.employee_self_service.utils.job_router import routed
 
 
 def auto_checkout_site_employees():
@@ -76,6 +78,8 @@ def auto_checkout_site_employees():
 		frappe.log_error(title="Auto Checkout Error",message=frappe.get_traceback())
 
 @frappe.whitelist()
+@routed("bulk")
+@instrumented("job")
 def auto_checkout_driver():
 	# Runs at midnight, so check previous day's records
 	yesterday = add_days(today(), -1)
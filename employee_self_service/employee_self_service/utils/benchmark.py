@@ -0,0 +1,468 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026, Nesscale Solutions Private Limited and contributors
+# For license information, please see license.txt
+"""
+Benchmarks for the attendance, payroll and mobile hot paths.
+
+``run`` builds a synthetic fixture on the current site and times each
+case. The fixture has ``employees`` employees in teams of ten under one
+manager, ``days`` days of IN/OUT check-ins ending yesterday, approved
+leaves, a holiday list, an ESS Location, pending OTPL Leaves for the
+manager and ERP Sync Queue rows. Each case reports wall time and query
+count (median of ``repeat`` runs; nightly jobs run once). The results are
+written to ``sites/<site>/benchmarks/<timestamp>-<label>.json``. Compare
+two runs with ``compare``::
+
+	bench --site dev execute employee_self_service.employee_self_service.utils.benchmark.run \\
+		--kwargs "{'employees': 500, 'days': 30, 'label': 'before'}"
+	bench --site dev execute employee_self_service.employee_self_service.utils.benchmark.compare \\
+		--kwargs "{'baseline': '<file>', 'current': '<file>'}"
+
+Only runs with ``allow_tests`` or ``developer_mode`` set. The fixture is
+deleted afterwards (``keep=True`` leaves it for inspection). The nightly
+attendance job works on every active employee of the site and commits, so
+its case is skipped (and listed under ``skipped``) when the site has
+active employees outside the fixture. During the sync-queue case jobs are
+collected instead of enqueued, so the dispatcher is timed without sending
+anything to the fixture's ERP.
+"""
+
+from __future__ import unicode_literals
+
+import json
+import os
+import statistics
+import time
+from contextlib import contextmanager
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, cint, flt, get_first_day, get_last_day, getdate, now_datetime, nowdate
+
+from employee_self_service.employee_self_service.utils.instrumentation import sql_counter
+
+PREFIX = "ESS-BENCH"
+TEAM_SIZE = 10
+SYNC_QUEUE_ROWS = 100
+DEFAULT_REPEAT = 5
+
+
+def run(employees=200, days=30, repeat=DEFAULT_REPEAT, label=None, keep=False):
+	"""Build the fixture, time every case and save the results. Returns
+	the path of the results file."""
+	if not (frappe.conf.get("allow_tests") or frappe.conf.get("developer_mode")):
+		frappe.throw(_("Benchmarks only run on sites with allow_tests or developer_mode set"))
+
+	employees, days, repeat = cint(employees), cint(days), max(cint(repeat), 1)
+	teardown()
+	started = time.perf_counter()
+	fixture = build_fixture(employees, days)
+	frappe.db.commit()
+	results = {
+		"label": label or "",
+		"site": frappe.local.site,
+		"timestamp": str(now_datetime()),
+		"app_version": frappe.get_module("employee_self_service").__version__,
+		"frappe_version": frappe.__version__,
+		"params": {"employees": employees, "days": days, "repeat": repeat},
+		"fixture_seconds": flt(time.perf_counter() - started, 2),
+		"cases": {},
+		"skipped": {},
+	}
+	try:
+		for name, fn, runs in get_cases(fixture, repeat):
+			if isinstance(fn, str):
+				results["skipped"][name] = fn
+				continue
+			results["cases"][name] = time_case(fn, runs)
+			frappe.db.commit()
+	finally:
+		if not keep:
+			teardown()
+			frappe.db.commit()
+	return save_results(results)
+
+
+def get_cases(fixture, repeat):
+	"""``[(name, fn, runs)]``; ``fn`` takes no arguments, or is the reason
+	the case is skipped."""
+	from employee_self_service.employee_self_service.doctype.otpl_payroll.otpl_payroll import calculate_payroll
+	from employee_self_service.employee_self_service.utils.erp_sync import process_pending_sync_queue
+	from employee_self_service.employee_self_service.utils.job_router import run_job
+	from employee_self_service.mobile.v1.approvals import leave_approval, otpl_approval
+	from employee_self_service.mobile.v1.ess import get_dashboard
+
+	payroll_doc = {
+		"company": fixture.company,
+		"location": fixture.location,
+		"from_date": str(get_first_day(fixture.to_date)),
+		"to_date": str(get_last_day(fixture.to_date)),
+	}
+	as_manager = lambda fn: lambda: _as_mobile_user(fixture.manager_user, fn)
+
+	process_daily_attendance = lambda: run_job(
+		"employee_self_service.employee_self_service.utils.daily_attendance.process_daily_attendance"
+	)
+	if _has_other_active_employees():
+		# It would write (and commit) real Attendance that teardown leaves.
+		process_daily_attendance = "site has active employees outside the fixture"
+
+	return [
+		("process_daily_attendance", process_daily_attendance, 1),
+		("calculate_payroll", lambda: calculate_payroll(payroll_doc), 1),
+		("get_dashboard", as_manager(get_dashboard), repeat),
+		("get_leave_approval_list", as_manager(leave_approval.get_leave_approval_list), repeat),
+		("get_otpl_leave_approval_list", as_manager(otpl_approval.get_otpl_leave_approval_list), repeat),
+		("get_otpl_expense_approval_list", as_manager(otpl_approval.get_otpl_expense_approval_list), repeat),
+		("get_employee_checkin_approval_list", as_manager(otpl_approval.get_employee_checkin_approval_list), repeat),
+		("get_travel_approval_list", as_manager(otpl_approval.get_travel_approval_list), repeat),
+		("get_pending_approval_counts", as_manager(otpl_approval.get_pending_approval_counts), repeat),
+		("process_pending_sync_queue", lambda: _collect_jobs(process_pending_sync_queue), repeat),
+	]
+
+
+def time_case(fn, runs):
+	"""Median wall time and query count of ``runs`` calls of ``fn``."""
+	walls, queries, sql_ms, errors = [], [], [], 0
+	for _i in range(runs):
+		with count_queries() as counter:
+			start = time.perf_counter()
+			try:
+				fn()
+			except Exception:
+				errors += 1
+				frappe.db.rollback()
+				frappe.log_error(title="ESS benchmark case failed", message=frappe.get_traceback())
+			walls.append((time.perf_counter() - start) * 1000)
+		queries.append(counter["count"])
+		sql_ms.append(counter["ms"])
+	return {
+		"runs": runs,
+		"errors": errors,
+		"wall_ms": flt(statistics.median(walls), 1),
+		"min_ms": flt(min(walls), 1),
+		"max_ms": flt(max(walls), 1),
+		"queries": int(statistics.median(queries)),
+		"sql_ms": flt(statistics.median(sql_ms), 1),
+	}
+
+
+@contextmanager
+def count_queries():
+	"""Count and time every ``frappe.db.sql`` call inside the block."""
+	counter = {"count": 0, "ms": 0.0}
+	with sql_counter() as frame:
+		try:
+			yield counter
+		finally:
+			counter["count"] = frame.sql_count
+			counter["ms"] = frame.sql_time * 1000
+
+
+def save_results(results):
+	folder = frappe.get_site_path("benchmarks")
+	frappe.create_folder(folder)
+	filename = "{0}{1}.json".format(
+		now_datetime().strftime("%Y%m%d-%H%M%S"),
+		"-" + frappe.scrub(results["label"]) if results["label"] else "",
+	)
+	path = os.path.join(folder, filename)
+	with open(path, "w") as f:
+		f.write(json.dumps(results, indent=1, default=str))
+	return path
+
+
+def compare(baseline, current=None):
+	"""Per-case change between two results files (``current`` defaults to
+	the newest one). Positive ``wall_pct`` means slower."""
+	current = current or _latest_results()
+	with open(baseline) as f:
+		before = json.load(f)["cases"]
+	with open(current) as f:
+		after = json.load(f)["cases"]
+
+	rows = []
+	for name in after:
+		a, b = before.get(name), after[name]
+		rows.append({
+			"case": name,
+			"wall_ms": b["wall_ms"],
+			"baseline_wall_ms": a and a["wall_ms"],
+			"wall_pct": flt((b["wall_ms"] - a["wall_ms"]) * 100 / a["wall_ms"], 1) if a and a["wall_ms"] else None,
+			"queries": b["queries"],
+			"baseline_queries": a and a["queries"],
+		})
+	return rows
+
+
+def build_fixture(employees, days):
+	company = frappe.defaults.get_global_default("company") or frappe.db.get_value("Company", {}, "name")
+	if not company:
+		frappe.throw(_("Benchmarks need at least one Company"))
+	to_date = add_days(getdate(nowdate()), -1)
+	from_date = add_days(to_date, -(days - 1))
+	fixture = frappe._dict(company=company, from_date=from_date, to_date=to_date)
+
+	fixture.location = _make_location()
+	fixture.holiday_list = _make_holiday_list(from_date, to_date)
+	fixture.leave_type = _make_leave_type()
+	fixture.sync_settings = _make_sync_settings()
+
+	names = ["{0}-EMP-{1:05d}".format(PREFIX, i) for i in range(employees)]
+	fixture.manager_user = _make_user(names[0])
+	for i, name in enumerate(names):
+		leader = names[(i // TEAM_SIZE) * TEAM_SIZE]
+		frappe.get_doc({
+			"doctype": "Employee",
+			"name": name,
+			"first_name": "Bench {0}".format(i),
+			"employee_name": "Bench {0}".format(i),
+			"gender": "Male",
+			"date_of_birth": "1990-01-01",
+			"date_of_joining": add_days(from_date, -365),
+			"company": company,
+			"status": "Active",
+			"location": fixture.location,
+			"holiday_list": fixture.holiday_list,
+			"reports_to": None if i == 0 else (names[0] if leader == name else leader),
+			"is_team_leader": 1 if leader == name else 0,
+			"user_id": fixture.manager_user if i == 0 else None,
+			"staff_type": "Staff",
+		}).db_insert()
+
+	_make_checkins(names, from_date, to_date)
+	_make_leaves(names, fixture)
+	_make_pending_otpl_leaves(names, fixture)
+	_make_sync_queue(fixture)
+	_sync_derived_tables(names)
+	return fixture
+
+
+def teardown():
+	"""Delete everything the fixture created, and what the cases derived
+	from it (attendance, occupancy, hierarchy and directory rows)."""
+	pattern = PREFIX + "-%"
+	for doctype, field in (
+		("Attendance", "employee"),
+		("Employee Checkin", "employee"),
+		("Leave Occupancy", "employee"),
+		("Leave Application", "employee"),
+		("OTPL Leave", "employee"),
+		("People Directory", "employee"),
+		("Reporting Hierarchy", "descendant"),
+		("Employee", "name"),
+		("Holiday", "parent"),
+		("Holiday List", "name"),
+		("ESS Location", "name"),
+		("Leave Type", "name"),
+		("ERP Sync Queue", "erp_sync_settings"),
+		("ERP Sync Settings", "name"),
+	):
+		frappe.db.sql("DELETE FROM `tab{0}` WHERE `{1}` LIKE %s".format(doctype, field), pattern)
+	for user in frappe.get_all("User", filters={"name": ["like", PREFIX.lower() + "-%"]}, pluck="name"):
+		frappe.delete_doc("User", user, ignore_permissions=True, force=True)
+
+
+def _has_other_active_employees():
+	return bool(frappe.db.sql(
+		"SELECT 1 FROM `tabEmployee` WHERE status = 'Active' AND name NOT LIKE %s LIMIT 1",
+		PREFIX + "-%",
+	))
+
+
+def _make_location():
+	name = "{0}-Location".format(PREFIX)
+	frappe.get_doc({
+		"doctype": "ESS Location",
+		"location": name,
+		"latitude": "28.6139",
+		"longitude": "77.2090",
+		"radius": "500",
+		"shift_start_time": "09:30:00",
+		"shift_end_time": "18:30:00",
+		"late_arrival_threshold": "09:45:00",
+		"early_exit_threshold": "18:15:00",
+		"half_day_arrival_time": "11:30:00",
+		"half_day_departure_time": "15:30:00",
+	}).insert(ignore_permissions=True)
+	return name
+
+
+def _make_holiday_list(from_date, to_date):
+	name = "{0}-Holidays".format(PREFIX)
+	holidays, date = [], getdate(from_date)
+	while date <= getdate(to_date):
+		if date.weekday() == 6:
+			holidays.append({"holiday_date": date, "description": "Sunday", "weekly_off": 1})
+		date = add_days(date, 1)
+	frappe.get_doc({
+		"doctype": "Holiday List",
+		"holiday_list_name": name,
+		"from_date": get_first_day(from_date),
+		"to_date": get_last_day(to_date),
+		"holidays": holidays,
+	}).insert(ignore_permissions=True)
+	return name
+
+
+def _make_leave_type():
+	name = "{0}-Leave".format(PREFIX)
+	frappe.get_doc({"doctype": "Leave Type", "leave_type_name": name}).insert(ignore_permissions=True)
+	return name
+
+
+def _make_sync_settings():
+	doc = frappe.get_doc({
+		"doctype": "ERP Sync Settings",
+		"enabled": 0,
+		"erp_name": PREFIX,
+		"erp_url": "https://benchmark.invalid",
+		"api_key": PREFIX,
+		"api_secret": PREFIX,
+	})
+	doc.name = "{0}-ERP".format(PREFIX)
+	doc.db_insert()
+	return doc.name
+
+
+def _make_user(employee):
+	email = "{0}@example.com".format(employee.lower())
+	user = frappe.get_doc({
+		"doctype": "User",
+		"email": email,
+		"first_name": employee,
+		"send_welcome_email": 0,
+		"roles": [{"role": "Employee"}],
+	})
+	user.flags.no_welcome_mail = True
+	user.insert(ignore_permissions=True)
+	return user.name
+
+
+def _make_checkins(names, from_date, to_date):
+	date = getdate(from_date)
+	while date <= getdate(to_date):
+		if date.weekday() != 6:
+			for i, name in enumerate(names):
+				# A few late arrivals and early exits so every rule branch runs.
+				in_minute, out_minute = (45 if i % 7 == 0 else 20), (0 if i % 11 == 0 else 40)
+				for log_type, time_str in (("IN", "09:{0:02d}:00".format(in_minute)),
+						("OUT", "18:{0:02d}:00".format(out_minute))):
+					frappe.get_doc({
+						"doctype": "Employee Checkin",
+						"name": frappe.generate_hash(length=10),
+						"employee": name,
+						"employee_name": name,
+						"log_type": log_type,
+						"time": "{0} {1}".format(date, time_str),
+						"location": "28.6139,77.2090",
+					}).db_insert()
+		date = add_days(date, 1)
+
+
+def _make_leaves(names, fixture):
+	"""A two-day approved leave for every fifth employee, mid-period."""
+	from employee_self_service.employee_self_service.utils.leave_occupancy import sync_leave_application
+
+	start = add_days(fixture.from_date, cint((getdate(fixture.to_date) - getdate(fixture.from_date)).days / 2))
+	for i, name in enumerate(names[1::5]):
+		doc = frappe.get_doc({
+			"doctype": "Leave Application",
+			"name": "{0}-LA-{1:05d}".format(PREFIX, i),
+			"employee": name,
+			"employee_name": name,
+			"leave_type": fixture.leave_type,
+			"from_date": start,
+			"to_date": add_days(start, 1),
+			"total_leave_days": 2,
+			"company": fixture.company,
+			"status": "Approved",
+			"docstatus": 1,
+			"posting_date": start,
+		})
+		doc.db_insert()
+		sync_leave_application(doc, "on_submit")
+
+
+def _make_pending_otpl_leaves(names, fixture):
+	for i, name in enumerate(names[1::3]):
+		frappe.get_doc({
+			"doctype": "OTPL Leave",
+			"name": "{0}-OL-{1:05d}".format(PREFIX, i),
+			"employee": name,
+			"employee_name": name,
+			"from_date": add_days(nowdate(), 7),
+			"to_date": add_days(nowdate(), 8),
+			"total_no_of_days": 2,
+			"status": "Pending",
+			"approver": fixture.manager_user,
+			"reason": "Benchmark",
+		}).db_insert()
+
+
+def _make_sync_queue(fixture):
+	for i in range(SYNC_QUEUE_ROWS):
+		doc = frappe.get_doc({
+			"doctype": "ERP Sync Queue",
+			"erp_sync_settings": fixture.sync_settings,
+			"doctype_name": "Employee Checkin",
+			"document_name": "{0}-{1}".format(PREFIX, i),
+			"sync_action": "Create/Update",
+			"status": "Pending",
+			"retry_count": 0,
+			"max_retries": 3,
+			"sync_data": "{}",
+		})
+		doc.name = "{0}-SQ-{1:05d}".format(PREFIX, i)
+		doc.db_insert()
+
+
+def _sync_derived_tables(names):
+	"""Rows the Employee hooks would have written (inserts above skip them)."""
+	from employee_self_service.employee_self_service.utils import people_directory
+	from employee_self_service.employee_self_service.utils.reporting_hierarchy import move_node
+
+	for employee, reports_to in frappe.get_all(
+		"Employee", filters={"name": ["in", names]}, fields=["name", "reports_to"],
+		order_by="name asc", as_list=True,
+	):
+		move_node(employee, "Employee", reports_to, "Employee" if reports_to else None)
+	people_directory._refresh_source(
+		people_directory.LOCAL_SOURCE, lambda since: [people_directory.get_directory_changes(since)]
+	)
+
+
+def _as_mobile_user(user, fn):
+	"""Call a mobile endpoint as ``user`` over a GET request, as
+	``ess_validate`` expects."""
+	previous_user, previous_request = frappe.session.user, getattr(frappe.local, "request", None)
+	frappe.set_user(user)
+	frappe.local.request = frappe._dict(method="GET")
+	try:
+		return fn()
+	finally:
+		frappe.local.request = previous_request
+		frappe.set_user(previous_user)
+
+
+def _collect_jobs(fn):
+	"""Run ``fn`` with ``frappe.enqueue`` collecting jobs instead of
+	queueing them, then release their dedupe keys."""
+	jobs, original = [], frappe.enqueue
+	frappe.enqueue = lambda *args, **kwargs: jobs.append(kwargs)
+	try:
+		fn()
+	finally:
+		frappe.enqueue = original
+		for job in jobs:
+			if job.get("dedupe_key"):
+				frappe.cache().delete_value(job["dedupe_key"])
+	return jobs
+
+
+def _latest_results():
+	folder = frappe.get_site_path("benchmarks")
+	files = sorted(f for f in os.listdir(folder) if f.endswith(".json"))
+	if not files:
+		frappe.throw(_("No benchmark results in {0}").format(folder))
+	return os.path.join(folder, files[-1])
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026, Nesscale Solutions Private Limited and contributors
+# For license information, please see license.txt
+"""
+Field-level change detection for doc-event hooks.
+
+Every Employee save runs the whole ``on_update`` hook list, even when the
+edit touched nothing a hook cares about. Hooks wrapped with
+``on_change_of(*fields)`` compare the saved doc against
+``get_doc_before_save()`` and return early unless one of their declared
+fields actually changed.
+
+New documents, saves without a before-save snapshot, and docs with
+``doc.flags.force_hooks`` set always run the hook.
+"""
+
+from __future__ import unicode_literals
+
+from functools import wraps
+
+from frappe.utils import cstr
+
+
+def changed_fields(doc, fields):
+	"""Return the subset of ``fields`` whose value differs from the
+	pre-save version of ``doc``. ``None`` when there is no snapshot (a new
+	doc or a direct ``db_update``), meaning "treat everything as changed".
+	"""
+	before = doc.get_doc_before_save()
+	if not before:
+		return None
+	return [f for f in fields if _normalize(doc.get(f)) != _normalize(before.get(f))]
+
+
+def _normalize(value):
+	# 0/"0"/None/"" all come back from forms and the DB for "empty"; none of
+	# them should count as an edit of each other.
+	if value in (None, "", 0, "0"):
+		return ""
+	return cstr(value)
+
+
+def has_changed(doc, fields):
+	if doc.flags.force_hooks:
+		return True
+	changed = changed_fields(doc, fields)
+	return changed is None or bool(changed)
+
+
+def on_change_of(*fields):
+	"""Run the wrapped ``(doc, method)`` hook only when one of ``fields``
+	changed in this save. The field list is kept on the hook as
+	``watched_fields`` so it can be inspected (and reused by callers).
+	"""
+	def decorator(fn):
+		@wraps(fn)
+		def wrapper(doc, method=None):
+			if not has_changed(doc, fields):
+				return
+			return fn(doc, method)
+
+		wrapper.watched_fields = fields
+		return wrapper
+
+	return decorator
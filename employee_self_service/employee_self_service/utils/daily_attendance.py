@@ -6,9 +6,14 @@ from __future__ import unicode_literals
 import frappe
 from frappe.utils import getdate, get_datetime, add_days, get_first_day, time_diff_in_hours
 from datetime import datetime, timedelta
+from employee_self_service.employee_self_service.utils.instrumentation import instrumented
+from employee_self_service.employee_self_service.utils.job_router import routed
+from employee_self_service.employee_self_service.utils.leave_occupancy import is_on_leave
 
 
 @frappe.whitelist()
+@routed("bulk")
+@instrumented("job")
 def process_daily_attendance():
 	"""
 	Scheduled job to process attendance for all employees.
@@ -124,17 +129,7 @@ def process_employee_attendance(employee, location, date, no_check_in=0, staff_t
 		remove_obsolete_half_day_leave_application(employee, date)
 
 	# Check if leave application exists for this day
-	existing_leave = frappe.db.exists(
-		"Leave Application",
-		{
-			"employee": employee,
-			"from_date": ["<=", date],
-			"to_date": [">=", date],
-			"docstatus": 1
-		}
-	)
-
-	if existing_leave:
+	if is_on_leave(employee, date, status=None):
 		# Leave application exists for this day, skip
 		return "Skipped"
 
@@ -1,9 +1,12 @@
 import frappe
 import json
-import requests
 from frappe import _
-from frappe.utils import add_months, get_last_day, nowdate, getdate, get_datetime, format_datetime,flt
+from frappe.utils import add_months, get_last_day, nowdate, getdate, get_datetime, flt
+from employee_self_service.employee_self_service.utils.change_detection import on_change_of
+from employee_self_service.employee_self_service.utils.team_view import get_team_view
+from employee_self_service.employee_self_service.utils.instrumentation import instrumented
 
+@instrumented("hook")
 def validate_employee(doc, method):
     """
     Validate and update basic_salary based on advance_to_be_deducted.
@@ -47,6 +50,8 @@ def validate_employee(doc, method):
         doc.is_team_leader = 1
     
 
+@instrumented("hook")
+@on_change_of("temp_tl", "user_id")
 def assign_team_leader_role_on_temp_tl(doc, method):
     """Assign or remove 'TEAM LEADER' role on the linked user based on temp_tl."""
     if not doc.user_id:
@@ -90,176 +95,11 @@ def get_ess_information(employee):
     - external_reports_to: details of the employee's external manager (from remote ERP)
     - reportees: list of internal employees who report to this employee
     - external_reportees: list of employees from remote ERP who report to this employee
-    """
-    today = nowdate()
-
-    def get_checkin_time(emp):
-        """Return the time of the first IN check-in of today for the given employee."""
-        result = frappe.db.sql(
-            """
-            SELECT time FROM `tabEmployee Checkin`
-            WHERE employee = %s
-              AND log_type = 'IN'
-              AND DATE(time) = %s
-            ORDER BY time ASC
-            LIMIT 1
-            """,
-            (emp, today),
-            as_dict=True
-        )
-        if result and result[0].get("time"):
-            return format_datetime(result[0]["time"], "HH:mm:ss")
-        return ""
-
-    def get_device_registered(emp):
-        """Return Yes/No based on whether this employee has a registered device."""
-        return "Yes" if frappe.db.exists("Employee Device Registration", {"employee": emp}) else "No"
-
-    def build_employee_row(emp):
-        if not emp:
-            return None
-        data = frappe.db.get_value(
-            "Employee", emp,
-            ["employee_name", "designation", "reports_to"],
-            as_dict=True
-        )
-        if not data:
-            return None
-        return {
-            "employee": emp,
-            "employee_name": data.employee_name or "",
-            "designation": data.designation or "",
-            "checkin_time": get_checkin_time(emp),
-            "device_registered": get_device_registered(emp),
-        }
-
-    def call_remote_erp(api_method, params):
-        """Call a remote ERP API using ERP Sync Settings. Tries all enabled settings."""
-        sync_settings = frappe.get_all(
-            "ERP Sync Settings",
-            filters={"enabled": 1},
-            fields=["name"]
-        )
-        for s in sync_settings:
-            try:
-                settings = frappe.get_doc("ERP Sync Settings", s.name)
-                url = "{0}/api/method/employee_self_service.employee_self_service.utils.erp_sync.{1}".format(
-                    settings.erp_url, api_method
-                )
-                headers = {
-                    "Authorization": "token {0}:{1}".format(
-                        settings.get_password("api_key"),
-                        settings.get_password("api_secret")
-                    ),
-                    "Content-Type": "application/json"
-                }
-                response = requests.get(url, params=params, headers=headers, timeout=15)
-                if response.status_code == 200:
-                    data = response.json()
-                    msg = data.get("message", {})
-                    if msg.get("success"):
-                        return msg.get("data", {})
-            except Exception:
-                frappe.log_error(
-                    message=frappe.get_traceback(),
-                    title="ESS Info: Error calling remote ERP {0}".format(s.name)
-                )
-        return None
-
-    # Self
-    self_info = build_employee_row(employee)
-
-    # Get external reporting fields
-    emp_data = frappe.db.get_value(
-        "Employee", employee,
-        ["reports_to", "external_reporting_manager", "external_report_to"],
-        as_dict=True
-    )
 
-    # Internal Manager
-    manager_info = build_employee_row(emp_data.reports_to) if emp_data and emp_data.reports_to else None
-
-    # External Manager (fetch from remote ERP via ERP Sync Settings)
-    external_manager_info = None
-    if emp_data and emp_data.external_reporting_manager and emp_data.external_report_to:
-        remote_data = call_remote_erp(
-            "get_external_employee_ess_details",
-            {"employee": emp_data.external_report_to}
-        )
-        if remote_data and emp_data.external_report_to in remote_data:
-            ext = remote_data[emp_data.external_report_to]
-            external_manager_info = {
-                "employee": ext.get("employee", ""),
-                "employee_name": ext.get("employee_name", ""),
-                "designation": ext.get("designation", ""),
-                "checkin_time": ext.get("checkin_time", ""),
-                "device_registered": ext.get("device_registered", "N/A"),
-                "is_external": True,
-            }
-        else:
-            # Fallback to local Employee Pull data
-            pull_data = frappe.db.get_value(
-                "Employee Pull", {"employee": emp_data.external_report_to},
-                ["employee", "employee_name", "company"],
-                as_dict=True
-            )
-            if pull_data:
-                external_manager_info = {
-                    "employee": pull_data.employee or "",
-                    "employee_name": pull_data.employee_name or "",
-                    "designation": pull_data.company or "External",
-                    "checkin_time": "",
-                    "device_registered": "N/A",
-                    "is_external": True,
-                }
-
-    # Internal Reportees (employees whose reports_to = this employee)
-    reportees_list = frappe.db.get_all(
-        "Employee",
-        filters={"reports_to": employee, "status": "Active"},
-        fields=["name"],
-        order_by="employee_name asc"
-    )
-    reportees = [r for r in (build_employee_row(e.name) for e in reportees_list) if r]
-
-    # External Reportees - employees on remote ERP who report to this employee
-    external_reportees = []
-    remote_reportees = call_remote_erp(
-        "get_external_reportees",
-        {"employee": employee}
-    )
-    if remote_reportees:
-        for rep in remote_reportees:
-            external_reportees.append({
-                "employee": rep.get("employee", ""),
-                "employee_name": rep.get("employee_name", ""),
-                "designation": rep.get("designation", ""),
-                "checkin_time": rep.get("checkin_time", ""),
-                "device_registered": rep.get("device_registered", "N/A"),
-                "is_external": True,
-                "is_external_reportee": True,
-            })
-
-    # Also include local employees with external_report_to = this employee
-    local_ext_reportees_list = frappe.db.get_all(
-        "Employee",
-        filters={"external_report_to": employee, "status": "Active"},
-        fields=["name"],
-        order_by="employee_name asc"
-    )
-    for e in local_ext_reportees_list:
-        row = build_employee_row(e.name)
-        if row:
-            row["is_external_reportee"] = True
-            external_reportees.append(row)
-
-    return {
-        "self": self_info,
-        "reports_to": manager_info,
-        "external_reports_to": external_manager_info,
-        "reportees": reportees,
-        "external_reportees": external_reportees,
-    }
+    Built by the team view service (grouped queries, concurrent remote
+    calls, short-lived cache) - see utils.team_view.
+    """
+    return get_team_view(employee)
 
 
 @frappe.whitelist()
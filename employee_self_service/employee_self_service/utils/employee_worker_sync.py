@@ -4,8 +4,24 @@
 
 import frappe
 from frappe import _
+from frappe.utils import now_datetime
 
+from employee_self_service.employee_self_service.utils.change_detection import on_change_of
+from employee_self_service.employee_self_service.utils.instrumentation import instrumented
 
+
+# Manager fields copied onto every Worker reporting to them.
+WORKER_CASCADE_FIELDS = (
+	"business_vertical",
+	"sales_order",
+	"external_sales_order",
+	"external_order",
+	"external_business_vertical",
+	"external_so",
+)
+
+
+@instrumented("hook")
 def sync_worker_fields_before_save(doc, method=None):
 	"""
 	Hook for Employee doctype validate (before save)
@@ -37,6 +53,8 @@ def sync_worker_fields_before_save(doc, method=None):
 			frappe.throw(_("Reports to or External Reports to is mandatory."))
 
 
+@instrumented("hook")
+@on_change_of("is_team_leader", *WORKER_CASCADE_FIELDS)
 def update_worker_fields_from_manager(doc, method=None):
 	"""
 	Hook for Employee doctype on_update
@@ -135,115 +153,106 @@ def _update_workers_under_team_leader(team_leader_doc):
 	"""
 	When a team leader's information changes, update all workers reporting to them.
 	"""
-	# Find all workers reporting to this team leader
-	workers = frappe.get_all(
-		"Employee",
-		filters={
-			"reports_to": team_leader_doc.name,
-			"staff_type": "Worker",
-			"is_team_leader": 0,
-			"status": "Active"
-		},
-		fields=["name"]
-	)
-
-	if not workers:
-		return
-
-	# Prepare manager data
-	manager_data = {
-		"business_vertical": team_leader_doc.get("business_vertical"),
-		"sales_order": team_leader_doc.get("sales_order"),
-		"external_sales_order": team_leader_doc.get("external_sales_order"),
-		"external_order": team_leader_doc.get("external_order"),
-		"external_business_vertical": team_leader_doc.get("external_business_vertical"),
-		"external_so": team_leader_doc.get("external_so")
-	}
+	if team_leader_doc.get("external_sales_order") == 1:
+		values = {
+			"external_sales_order": 1,
+			"external_order": team_leader_doc.get("external_order"),
+			"external_business_vertical": team_leader_doc.get("external_business_vertical"),
+			"external_so": team_leader_doc.get("external_so"),
+			"business_vertical": None,
+			"sales_order": None,
+		}
+	else:
+		values = {
+			"external_sales_order": 0,
+			"business_vertical": team_leader_doc.get("business_vertical"),
+			"sales_order": team_leader_doc.get("sales_order"),
+			"external_order": None,
+			"external_business_vertical": None,
+			"external_so": None,
+		}
+
+	updated = bulk_update_workers({"reports_to": team_leader_doc.name}, values)
+	if updated:
+		frappe.msgprint(
+			_("Updated {0} worker(s) with your changed information").format(updated),
+			alert=True,
+			indicator="green"
+		)
+
+
+def bulk_update_workers(manager_filter, values):
+	"""
+	Cascade manager fields onto every active Worker matching ``manager_filter``
+	in a single UPDATE instead of a get_doc + save per worker.
 
-	# Update each worker
-	for worker in workers:
-		worker_doc = frappe.get_doc("Employee", worker.name)
-
-		if manager_data.get("external_sales_order") == 1:
-			worker_doc.external_sales_order = 1
-			worker_doc.external_order = manager_data.get("external_order")
-			worker_doc.external_business_vertical = manager_data.get("external_business_vertical")
-			worker_doc.external_so = manager_data.get("external_so")
-			worker_doc.business_vertical = None
-			worker_doc.sales_order = None
-		else:
-			worker_doc.external_sales_order = 0
-			worker_doc.business_vertical = manager_data.get("business_vertical")
-			worker_doc.sales_order = manager_data.get("sales_order")
-			worker_doc.external_order = None
-			worker_doc.external_business_vertical = None
-			worker_doc.external_so = None
-
-		# Save without triggering hooks to avoid recursion
-		worker_doc.flags.ignore_validate_update_after_submit = True
-		worker_doc.save(ignore_permissions=True)
-
-	frappe.msgprint(
-		_("Updated {0} worker(s) with your changed information").format(len(workers)),
-		alert=True,
-		indicator="green"
+	Re-saving each worker only re-ran ``sync_worker_fields_before_save``
+	(which derives exactly these values from the manager) plus on_update
+	hooks that ignore these fields, so writing the columns directly is
+	equivalent. Returns the number of workers updated.
+	"""
+	conditions = ["staff_type = 'Worker'", "is_team_leader = 0", "status = 'Active'"]
+	params = {"modified": now_datetime(), "modified_by": frappe.session.user}
+	for i, (field, value) in enumerate(manager_filter.items()):
+		conditions.append("`{0}` = %(f{1})s".format(field, i))
+		params["f{0}".format(i)] = value
+
+	assignments = []
+	for i, (field, value) in enumerate(values.items()):
+		assignments.append("`{0}` = %(v{1})s".format(field, i))
+		params["v{0}".format(i)] = value
+
+	frappe.db.sql(
+		"""
+		UPDATE `tabEmployee`
+		SET {assignments}, modified = %(modified)s, modified_by = %(modified_by)s
+		WHERE {conditions}
+		""".format(assignments=", ".join(assignments), conditions=" AND ".join(conditions)),
+		params,
 	)
+	return frappe.db.sql("SELECT ROW_COUNT()")[0][0]
 
 
+@instrumented("hook")
 def update_workers_from_employee_pull(doc, method=None):
 	"""
 	Hook for Employee Pull doctype on_update
 	When an Employee Pull record is updated, find all workers who reference it
 	as their external reporting manager and update them.
 	"""
-	# Find all workers who have this Employee Pull as their external reporting manager
-	workers = frappe.get_all(
-		"Employee",
-		filters={
-			"external_report_to": doc.name,
-			"external_reporting_manager": 1,
-			"staff_type": "Worker",
-			"is_team_leader": 0,
-			"status": "Active"
-		},
-		fields=["name"]
+	updated = bulk_update_workers(
+		{"external_report_to": doc.name, "external_reporting_manager": 1},
+		get_worker_values_from_employee_pull(doc),
 	)
-
-	if not workers:
-		return
-
-	# Prepare Employee Pull data
-	employee_pull_data = {
-		"sales_order": doc.get("sales_order"),
-		"business_line": doc.get("business_line"),
-		"company": doc.get("company")
+	if updated:
+		frappe.msgprint(
+			_("Updated {0} worker(s) referencing this Employee Pull record").format(updated),
+			alert=True,
+			indicator="green"
+		)
+
+
+def get_worker_values_from_employee_pull(pull):
+	"""Worker field values derived from an Employee Pull (external manager)."""
+	sales_order = pull.get("sales_order")
+	values = {
+		"external_order": sales_order + "-" + pull.get("company") if sales_order else None
 	}
-
-	# Update each worker
-	for worker in workers:
-		worker_doc = frappe.get_doc("Employee", worker.name)
-
-		worker_doc.external_order = employee_pull_data.get("sales_order") + "-" + employee_pull_data.get("company") if employee_pull_data.get("sales_order") else None
-		if worker_doc.external_order and frappe.db.exists("Sales Order Pull", worker_doc.external_order):
-			worker_doc.external_sales_order = 1
-			worker_doc.external_business_vertical = employee_pull_data.get("business_line")
-			worker_doc.external_so = employee_pull_data.get("sales_order") if employee_pull_data.get("sales_order") else None
-			worker_doc.business_vertical = None
-			worker_doc.sales_order = None
-		if frappe.db.exists("Sales Order", employee_pull_data.get("sales_order")):
-			worker_doc.external_sales_order = 0
-			worker_doc.business_vertical = employee_pull_data.get("business_line")
-			worker_doc.sales_order = employee_pull_data.get("sales_order") if employee_pull_data.get("sales_order") else None
-			worker_doc.external_order = None
-			worker_doc.external_business_vertical = None
-			worker_doc.external_so = None
-
-		# Save without triggering hooks to avoid recursion
-		worker_doc.flags.ignore_validate_update_after_submit = True
-		worker_doc.save(ignore_permissions=True)
-
-	frappe.msgprint(
-		_("Updated {0} worker(s) referencing this Employee Pull record").format(len(workers)),
-		alert=True,
-		indicator="green"
-	)
+	if values["external_order"] and frappe.db.exists("Sales Order Pull", values["external_order"]):
+		values.update({
+			"external_sales_order": 1,
+			"external_business_vertical": pull.get("business_line"),
+			"external_so": sales_order,
+			"business_vertical": None,
+			"sales_order": None,
+		})
+	if sales_order and frappe.db.exists("Sales Order", sales_order):
+		values.update({
+			"external_sales_order": 0,
+			"business_vertical": pull.get("business_line"),
+			"sales_order": sales_order,
+			"external_order": None,
+			"external_business_vertical": None,
+			"external_so": None,
+		})
+	return values
@@ -7,7 +7,38 @@ import frappe
 import json
 import requests
 from frappe import _
-from frappe.utils import now, get_datetime, today
+from frappe.utils import cint, cstr, now, get_datetime, today
+
+from employee_self_service.employee_self_service.utils.change_detection import on_change_of
+from employee_self_service.employee_self_service.utils.team_view import get_employee_rows
+from employee_self_service.employee_self_service.utils.instrumentation import instrumented
+from employee_self_service.employee_self_service.utils.job_router import enqueue_job
+from employee_self_service.employee_self_service.utils import leave_occupancy
+
+
+# Initial pull: rows requested per remote page / written per upsert batch.
+PULL_PAGE_SIZE = 500
+UPSERT_BATCH_SIZE = 200
+
+# Remote ESS detail/reportee responses are cached this long (seconds) so
+# repeated cross-ERP dashboard loads don't re-query the database.
+EXTERNAL_ESS_CACHE_TTL = 30
+
+# Employee fields that feed the Employee Pull payload (see
+# ``_build_employee_sync_payload``) or decide whether it is synced at all.
+EMPLOYEE_SYNC_FIELDS = (
+	"employee_name",
+	"company",
+	"staff_type",
+	"is_team_leader",
+	"reports_to",
+	"external_report_to",
+	"sales_order",
+	"business_vertical",
+	"external_sales_order",
+	"external_so",
+	"external_business_vertical",
+)
 
 
 def get_employee_leave_status(employee):
@@ -20,20 +51,7 @@ def get_employee_leave_status(employee):
 	if not employee:
 		return "Available"
 	try:
-		today_date = today()
-		exists = frappe.db.sql(
-			"""
-			SELECT name
-			FROM `tabLeave Application`
-			WHERE employee = %s
-				AND status = 'Approved'
-				AND from_date <= %s
-				AND to_date >= %s
-			LIMIT 1
-			""",
-			(employee, today_date, today_date),
-		)
-		return "On Leave" if exists else "Available"
+		return "On Leave" if leave_occupancy.is_on_leave(employee, today()) else "Available"
 	except Exception:
 		frappe.log_error(
 			message=frappe.get_traceback(),
@@ -42,6 +60,14 @@ def get_employee_leave_status(employee):
 		return "Available"
 
 
+def get_employees_on_leave(employees):
+	"""Set-based ``get_employee_leave_status``: the subset of ``employees``
+	with an Approved Leave Application covering today."""
+	if not employees:
+		return set()
+	return set(leave_occupancy.get_employees_on_leave(today(), employees=employees))
+
+
 # ==================== WHITELISTED APIs FOR RECEIVING SYNC DATA ====================
 
 @frappe.whitelist()
@@ -437,14 +463,17 @@ def receive_expense_status_update(data, source_site=None):
 
 
 @frappe.whitelist()
-def get_employees_for_sync(filters=None):
+def get_employees_for_sync(filters=None, limit_start=0, limit_page_length=None):
 	"""
 	API endpoint to get all team leader employees for initial pull
 	Uses metadata to dynamically get all fields
+
+	Pass ``limit_page_length`` to page through the list (ordered by name);
+	the response then carries ``has_more``.
 	"""
 	try:
 		field_names = ["name", "employee_name", "cell_number", "company","sales_order","business_vertical","external_sales_order","external_order","external_business_vertical","external_so","is_team_leader","reports_to","external_report_to"]
-		
+		limit_start, limit_page_length = cint(limit_start), cint(limit_page_length)
 
 		# Get all team leader or manager employees from Employee doctype
 		employees = frappe.db.sql("""
@@ -452,8 +481,15 @@ def get_employees_for_sync(filters=None):
 			FROM `tabEmployee`
 			WHERE status = 'Active'
 			AND (is_team_leader = 1 OR staff_type = 'Manager' OR staff_type = 'Director' OR staff_type = 'Partner')
-		""".format(fields=", ".join(field_names)), as_dict=True)
-		
+			ORDER BY name
+			{limit}
+		""".format(
+			fields=", ".join(field_names),
+			limit="LIMIT {0}, {1}".format(limit_start, limit_page_length) if limit_page_length else "",
+		), as_dict=True)
+
+		on_leave = get_employees_on_leave([emp.name for emp in employees])
+
 		# Transform to Employee Pull format
 		employee_data = []
 		for emp in employees:
@@ -467,10 +503,13 @@ def get_employees_for_sync(filters=None):
 				"is_team_leader": emp.get("is_team_leader", 0),
 				"reports_to": emp.get("reports_to"),
 				"external_reports_to": emp.get("external_report_to"),
-				"leave_status": get_employee_leave_status(emp.get("name"))
+				"leave_status": "On Leave" if emp.get("name") in on_leave else "Available"
 			})
-		
-		return {"success": True, "data": employee_data}
+
+		response = {"success": True, "data": employee_data}
+		if limit_page_length:
+			response["has_more"] = len(employees) == limit_page_length
+		return response
 		
 	except Exception as e:
 		frappe.log_error(
@@ -481,21 +520,49 @@ def get_employees_for_sync(filters=None):
 
 
 @frappe.whitelist()
-def get_sales_orders_for_sync(filters=None):
+def get_directory_for_sync(modified_since=None, limit_start=0, limit_page_length=None):
+	"""
+	API endpoint for the People Directory refresh of another ERP: every
+	employee (any status) modified at or after ``modified_since``.
+	"""
+	from employee_self_service.employee_self_service.utils.people_directory import get_directory_changes
+
+	try:
+		rows = get_directory_changes(modified_since, limit_start, limit_page_length)
+		response = {"success": True, "data": rows}
+		if cint(limit_page_length):
+			response["has_more"] = len(rows) == cint(limit_page_length)
+		return response
+
+	except Exception as e:
+		frappe.log_error(
+			message=frappe.get_traceback(),
+			title="Error getting directory for sync"
+		)
+		return {"success": False, "message": str(e)}
+
+
+@frappe.whitelist()
+def get_sales_orders_for_sync(filters=None, limit_start=0, limit_page_length=None):
 	"""
 	API endpoint to get all sales orders for initial pull
 	Uses metadata to dynamically get all fields
+
+	Pass ``limit_page_length`` to page through the list (ordered by name);
+	the response then carries ``has_more``.
 	"""
 	try:
 		field_names = ["name", "company","business_line"]
-		
+		limit_start, limit_page_length = cint(limit_start), cint(limit_page_length)
 		
 		# Get all Sales Order records
 		sales_orders = frappe.get_all(
 			"Sales Order",
 			filters={},  # Only submitted sales orders
 			fields=field_names,
-			limit_page_length=None
+			order_by="name asc",
+			limit_start=limit_start,
+			limit_page_length=limit_page_length or None
 		)
 		
 		# Transform to Sales Order Pull format
@@ -506,8 +573,11 @@ def get_sales_orders_for_sync(filters=None):
 				"business_line": so.get("business_line"),
 				"company": so.get("company")
 			})
-		
-		return {"success": True, "data": sales_order_data}
+
+		response = {"success": True, "data": sales_order_data}
+		if limit_page_length:
+			response["has_more"] = len(sales_orders) == limit_page_length
+		return response
 		
 	except Exception as e:
 		frappe.log_error(
@@ -550,6 +620,17 @@ def initial_pull_from_remote_erp(erp_sync_settings):
 			results["employees_pulled"] = emp_result.get("count", 0)
 			if emp_result.get("error"):
 				results["errors"].append(emp_result.get("error"))
+
+		# Bulk upserts skip the Employee Pull on_update hook, so cascade to
+		# workers here - once per manager whose data actually changed.
+		results["workers_updated"] = _cascade_employee_pulls_to_workers(
+			emp_result.get("changed", []) if settings.sync_employee else [],
+			so_result.get("changed", []) if settings.sync_sales_order_pull else []
+		)
+		# ... and rebuild the reporting hierarchy the hook would have kept.
+		if settings.sync_employee and emp_result.get("changed"):
+			from employee_self_service.employee_self_service.utils.reporting_hierarchy import rebuild_hierarchy
+			rebuild_hierarchy()
 		
 		# Update last pull time
 		settings.last_pull_time = now()
@@ -569,79 +650,31 @@ def initial_pull_from_remote_erp(erp_sync_settings):
 def pull_employees_from_remote(settings):
 	"""Pull all employees from remote ERP"""
 	try:
-		url = "{0}/api/method/employee_self_service.employee_self_service.utils.erp_sync.get_employees_for_sync".format(
-			settings.erp_url
-		)
-		
-		headers = {
-			"Authorization": "token {0}:{1}".format(
-				settings.get_password("api_key"),
-				settings.get_password("api_secret")
-			),
-			"Content-Type": "application/json"
-		}
-		
-		response = requests.get(url, headers=headers, timeout=60)
-		
-		if response.status_code == 200:
-			data = response.json()
-			if data.get("message", {}).get("success"):
-				employees = data.get("message", {}).get("data", [])
-				count = 0
-				
-				for emp in employees:
-					try:
-						# Check if already exists by employee and company
-						existing = frappe.db.get_value(
-							"Employee Pull",
-							{"employee": emp.get("employee"), "company": emp.get("company")},
-							"name"
-						)
-						
-						if existing:
-							# Update existing record
-							doc = frappe.get_doc("Employee Pull", existing)
-							doc.employee_name = emp.get("employee_name")
-							doc.mobile_no = emp.get("mobile_no")
-							doc.sales_order = emp.get("sales_order")
-							doc.business_line = emp.get("business_line")
-							doc.is_team_leader = emp.get("is_team_leader", 0)
-							doc.reports_to = emp.get("reports_to")
-							doc.external_reports_to = emp.get("external_reports_to")
-							doc.leave_status = emp.get("leave_status")
-							doc.flags.ignore_sync = True
-							doc.save(ignore_permissions=True)
-						else:
-							# Create new record
-							doc = frappe.get_doc({
-								"doctype": "Employee Pull",
-								"employee": emp.get("employee"),
-								"employee_name": emp.get("employee_name"),
-								"mobile_no": emp.get("mobile_no"),
-								"sales_order": emp.get("sales_order"),
-								"business_line": emp.get("business_line"),
-								"company": emp.get("company"),
-								"is_team_leader": emp.get("is_team_leader", 0),
-								"reports_to": emp.get("reports_to"),
-								"external_reports_to": emp.get("external_reports_to"),
-								"leave_status": emp.get("leave_status")
-							})
-							doc.flags.ignore_sync = True
-							doc.insert(ignore_permissions=True)
-						count += 1
-					except Exception as e:
-						frappe.log_error(
-							message="Error creating Employee Pull: {0}".format(str(e)),
-							title="Employee Pull Creation Error"
-						)
-				
-				frappe.db.commit()
-				return {"count": count}
-			else:
-				return {"count": 0, "error": data.get("message", {}).get("message")}
-		else:
-			return {"count": 0, "error": "HTTP {0}".format(response.status_code)}
-			
+		count, changed = 0, []
+		for employees in _fetch_remote_pages(settings, "get_employees_for_sync"):
+			rows = []
+			for emp in employees:
+				rows.append({
+					"name": "{0}-{1}".format(emp.get("employee"), emp.get("company")),
+					"employee": emp.get("employee"),
+					"employee_name": emp.get("employee_name"),
+					"mobile_no": emp.get("mobile_no"),
+					"sales_order": emp.get("sales_order"),
+					"business_line": emp.get("business_line"),
+					"company": emp.get("company"),
+					"is_team_leader": cint(emp.get("is_team_leader", 0)),
+					"reports_to": emp.get("reports_to"),
+					"external_reports_to": emp.get("external_reports_to"),
+					"leave_status": emp.get("leave_status")
+				})
+			count += len(rows)
+			changed.extend(_bulk_upsert("Employee Pull", rows))
+
+		frappe.db.commit()
+		return {"count": count, "changed": changed}
+
+	except RemotePullError as e:
+		return {"count": 0, "error": str(e)}
 	except Exception as e:
 		frappe.log_error(
 			message=frappe.get_traceback(),
@@ -653,65 +686,22 @@ def pull_employees_from_remote(settings):
 def pull_sales_orders_from_remote(settings):
 	"""Pull all sales orders from remote ERP"""
 	try:
-		url = "{0}/api/method/employee_self_service.employee_self_service.utils.erp_sync.get_sales_orders_for_sync".format(
-			settings.erp_url
-		)
-		
-		headers = {
-			"Authorization": "token {0}:{1}".format(
-				settings.get_password("api_key"),
-				settings.get_password("api_secret")
-			),
-			"Content-Type": "application/json"
-		}
-		
-		response = requests.get(url, headers=headers, timeout=60)
-		
-		if response.status_code == 200:
-			data = response.json()
-			if data.get("message", {}).get("success"):
-				sales_orders = data.get("message", {}).get("data", [])
-				count = 0
-				
-				for so in sales_orders:
-					try:
-						# Check if already exists by sales_order and company
-						existing = frappe.db.get_value(
-							"Sales Order Pull",
-							{"sales_order": so.get("sales_order"), "company": so.get("company")},
-							"name"
-						)
-						
-						if existing:
-							# Update existing record
-							doc = frappe.get_doc("Sales Order Pull", existing)
-							doc.business_line = so.get("business_line")
-							doc.flags.ignore_sync = True
-							doc.save(ignore_permissions=True)
-						else:
-							# Create new record
-							doc = frappe.get_doc({
-								"doctype": "Sales Order Pull",
-								"sales_order": so.get("sales_order"),
-								"business_line": so.get("business_line"),
-								"company": so.get("company")
-							})
-							doc.flags.ignore_sync = True
-							doc.insert(ignore_permissions=True)
-						count += 1
-					except Exception as e:
-						frappe.log_error(
-							message="Error creating Sales Order Pull: {0}".format(str(e)),
-							title="Sales Order Pull Creation Error"
-						)
-				
-				frappe.db.commit()
-				return {"count": count}
-			else:
-				return {"count": 0, "error": data.get("message", {}).get("message")}
-		else:
-			return {"count": 0, "error": "HTTP {0}".format(response.status_code)}
-			
+		count, changed = 0, []
+		for sales_orders in _fetch_remote_pages(settings, "get_sales_orders_for_sync"):
+			rows = [{
+				"name": "{0}-{1}".format(so.get("sales_order"), so.get("company")),
+				"sales_order": so.get("sales_order"),
+				"business_line": so.get("business_line"),
+				"company": so.get("company")
+			} for so in sales_orders]
+			count += len(rows)
+			changed.extend(_bulk_upsert("Sales Order Pull", rows))
+
+		frappe.db.commit()
+		return {"count": count, "changed": changed}
+
+	except RemotePullError as e:
+		return {"count": 0, "error": str(e)}
 	except Exception as e:
 		frappe.log_error(
 			message=frappe.get_traceback(),
@@ -720,6 +710,139 @@ def pull_sales_orders_from_remote(settings):
 		return {"count": 0, "error": str(e)}
 
 
+class RemotePullError(Exception):
+	pass
+
+
+def _fetch_remote_pages(settings, method, params=None):
+	"""Yield the remote list of ``method`` one page at a time. ``params``
+	are sent with every page request.
+
+	Remotes that predate paging ignore the limit arguments and return the
+	whole list without ``has_more``; that is treated as the only page.
+	"""
+	url = "{0}/api/method/employee_self_service.employee_self_service.utils.erp_sync.{1}".format(
+		settings.erp_url, method
+	)
+	headers = {
+		"Authorization": "token {0}:{1}".format(
+			settings.get_password("api_key"),
+			settings.get_password("api_secret")
+		),
+		"Content-Type": "application/json"
+	}
+
+	limit_start = 0
+	while True:
+		response = requests.get(
+			url,
+			headers=headers,
+			params=dict(params or {}, limit_start=limit_start, limit_page_length=PULL_PAGE_SIZE),
+			timeout=60
+		)
+		if response.status_code != 200:
+			raise RemotePullError("HTTP {0}".format(response.status_code))
+
+		message = response.json().get("message", {})
+		if not message.get("success"):
+			raise RemotePullError(message.get("message"))
+
+		rows = message.get("data", [])
+		if rows:
+			yield rows
+		if not message.get("has_more"):
+			return
+		limit_start += PULL_PAGE_SIZE
+
+
+def _bulk_upsert(doctype, rows):
+	"""Insert or update ``rows`` (dicts keyed by column, including ``name``)
+	in batches, skipping rows identical to what is already stored.
+
+	Existing rows are diffed in one query per batch; only new/changed rows
+	are written, with a multi-row INSERT ... ON DUPLICATE KEY UPDATE.
+	Controllers and doc hooks are not run. Returns the changed rows.
+	"""
+	changed = []
+	for i in range(0, len(rows), UPSERT_BATCH_SIZE):
+		batch = rows[i:i + UPSERT_BATCH_SIZE]
+		fields = [f for f in batch[0] if f != "name"]
+
+		existing = {
+			r.name: r
+			for r in frappe.db.sql(
+				"SELECT name, {fields} FROM `tab{doctype}` WHERE name IN %(names)s".format(
+					fields=", ".join("`{0}`".format(f) for f in fields), doctype=doctype
+				),
+				{"names": tuple(r["name"] for r in batch)},
+				as_dict=True,
+			)
+		}
+		to_write = [
+			r for r in batch
+			if r["name"] not in existing
+			or any(cstr(r.get(f)) != cstr(existing[r["name"]].get(f)) for f in fields)
+		]
+		if not to_write:
+			continue
+
+		now_dt, user = now(), frappe.session.user
+		values = []
+		for r in to_write:
+			values.extend([r["name"], now_dt, now_dt, user, user])
+			values.extend([r.get(f) for f in fields])
+
+		frappe.db.sql(
+			"""
+			INSERT INTO `tab{doctype}` (name, creation, modified, owner, modified_by, {columns})
+			VALUES {rows}
+			ON DUPLICATE KEY UPDATE {updates}, modified = VALUES(modified), modified_by = VALUES(modified_by)
+			""".format(
+				doctype=doctype,
+				columns=", ".join("`{0}`".format(f) for f in fields),
+				rows=", ".join(["(" + ", ".join(["%s"] * (len(fields) + 5)) + ")"] * len(to_write)),
+				updates=", ".join("`{0}` = VALUES(`{0}`)".format(f) for f in fields),
+			),
+			tuple(values),
+		)
+		changed.extend(to_write)
+	return changed
+
+
+def _cascade_employee_pulls_to_workers(changed_pulls, changed_sales_order_pulls):
+	"""Run the Employee Pull -> worker cascade once per affected manager.
+
+	A manager is affected when their Employee Pull changed, or when the
+	Sales Order Pull their workers' ``external_order`` points at changed.
+	"""
+	from employee_self_service.employee_self_service.utils.employee_worker_sync import (
+		bulk_update_workers,
+		get_worker_values_from_employee_pull,
+	)
+
+	pulls = {p["name"]: p for p in changed_pulls}
+	so_names = [so["name"] for so in changed_sales_order_pulls]
+	if so_names:
+		for p in frappe.db.sql(
+			"""
+			SELECT name, sales_order, business_line, company
+			FROM `tabEmployee Pull`
+			WHERE CONCAT(sales_order, '-', company) IN %(so_names)s
+			""",
+			{"so_names": tuple(so_names)},
+			as_dict=True,
+		):
+			pulls.setdefault(p.name, p)
+
+	workers_updated = 0
+	for name, pull in pulls.items():
+		workers_updated += bulk_update_workers(
+			{"external_report_to": name, "external_reporting_manager": 1},
+			get_worker_values_from_employee_pull(pull),
+		)
+	return workers_updated
+
+
 # ==================== SYNC QUEUE FUNCTIONS ====================
 
 def queue_sync_request(doctype_name, document_name, sync_action="Create/Update"):
@@ -769,13 +892,10 @@ def queue_sync_request(doctype_name, document_name, sync_action="Create/Update")
 				frappe.db.commit()
 				
 				# Enqueue the sync job
-				frappe.enqueue(
+				enqueue_job(
 					"employee_self_service.employee_self_service.utils.erp_sync.process_sync_queue_item",
-					queue="default",
-					timeout=300,
 					queue_name=queue_doc.name,
-					is_async=True,
-					now=False
+					dedupe_key="erp_sync:" + queue_doc.name,
 				)
 	except Exception as e:
 		frappe.log_error(
@@ -970,13 +1090,10 @@ def handle_sync_error(queue_name, error_message):
 			frappe.db.commit()
 			
 			# Enqueue retry with delay
-			frappe.enqueue(
+			enqueue_job(
 				"employee_self_service.employee_self_service.utils.erp_sync.process_sync_queue_item",
-				queue="default",
-				timeout=300,
 				queue_name=queue_doc.name,
-				is_async=True,
-				now=False
+				dedupe_key="erp_sync:" + queue_doc.name,
 			)
 		else:
 			# Max retries reached
@@ -1008,19 +1125,17 @@ def retry_sync_queue_item(queue_name):
 		frappe.db.commit()
 		
 		# Enqueue the sync job
-		frappe.enqueue(
+		enqueue_job(
 			"employee_self_service.employee_self_service.utils.erp_sync.process_sync_queue_item",
-			queue="default",
-			timeout=300,
 			queue_name=queue_doc.name,
-			is_async=True,
-			now=False
+			dedupe_key="erp_sync:" + queue_doc.name,
 		)
 		
 		return True
 	return False
 
 
+@instrumented("job")
 def process_pending_sync_queue():
 	"""
 	Process all pending sync queue items
@@ -1039,13 +1154,10 @@ def process_pending_sync_queue():
 		
 		for item in pending_items:
 			# Enqueue each item
-			frappe.enqueue(
+			enqueue_job(
 				"employee_self_service.employee_self_service.utils.erp_sync.process_sync_queue_item",
-				queue="default",
-				timeout=300,
 				queue_name=item.name,
-				is_async=True,
-				now=False
+				dedupe_key="erp_sync:" + item.name,
 			)
 		
 		if pending_items:
@@ -1092,16 +1204,14 @@ def _queue_employee_sync(emp_doc, sync_settings_list):
 		queue_doc.insert(ignore_permissions=True)
 		frappe.db.commit()
 
-		frappe.enqueue(
+		enqueue_job(
 			"employee_self_service.employee_self_service.utils.erp_sync.process_sync_queue_item_employee",
-			queue="default",
-			timeout=300,
 			queue_name=queue_doc.name,
-			is_async=True,
-			now=True
 		)
 
 
+@instrumented("hook")
+@on_change_of(*EMPLOYEE_SYNC_FIELDS)
 def sync_employee_to_remote(doc, method=None):
 	"""
 	Hook for Employee doctype on_update
@@ -1150,6 +1260,7 @@ def sync_employee_to_remote(doc, method=None):
 		)
 
 
+@instrumented("hook")
 def sync_sales_order_to_remote(doc, method=None):
 	"""
 	Hook for Sales Order doctype on_update
@@ -1189,14 +1300,10 @@ def sync_sales_order_to_remote(doc, method=None):
 			queue_doc.insert(ignore_permissions=True)
 			frappe.db.commit()
 			
-			# Enqueue the sync job - immediate execution
-			frappe.enqueue(
+			# Sync class: the save no longer waits on the remote
+			enqueue_job(
 				"employee_self_service.employee_self_service.utils.erp_sync.process_sync_queue_item_sales_order",
-				queue="default",
-				timeout=300,
 				queue_name=queue_doc.name,
-				is_async=True,
-				now=True  # Execute immediately
 			)
 			
 	except Exception as e:
@@ -1376,14 +1483,11 @@ def push_leave_to_remote_erp(leave_doc):
 			# row being visible. We intentionally do NOT call frappe.db.commit()
 			# here: doing so would commit the caller's transaction mid-save (e.g.
 			# the OTPL Leave status change) before the rest of on_update has run.
-			frappe.enqueue(
+			enqueue_job(
 				"employee_self_service.employee_self_service.utils.erp_sync.process_leave_sync_queue",
-				queue="default",
-				timeout=300,
 				queue_name=queue_doc.name,
-				is_async=True,
-				now=False,
-				enqueue_after_commit=True
+				dedupe_key="erp_sync:" + queue_doc.name,
+				enqueue_after_commit=True,
 			)
 
 	except Exception as e:
@@ -1455,13 +1559,10 @@ def push_expense_to_remote_erp(expense_doc):
 			queue_doc.insert(ignore_permissions=True)
 			
 			# Enqueue the sync job
-			frappe.enqueue(
+			enqueue_job(
 				"employee_self_service.employee_self_service.utils.erp_sync.process_expense_sync_queue",
-				queue="default",
-				timeout=300,
 				queue_name=queue_doc.name,
-				is_async=True,
-				now=False
+				dedupe_key="erp_sync:" + queue_doc.name,
 			)
 		
 		frappe.db.commit()
@@ -1768,13 +1869,10 @@ def push_travel_to_remote_erp(travel_doc):
 			queue_doc.insert(ignore_permissions=True)
 
 			# Enqueue the sync job
-			frappe.enqueue(
+			enqueue_job(
 				"employee_self_service.employee_self_service.utils.erp_sync.process_travel_sync_queue",
-				queue="default",
-				timeout=300,
 				queue_name=queue_doc.name,
-				is_async=True,
-				now=False
+				dedupe_key="erp_sync:" + queue_doc.name,
 			)
 
 		frappe.db.commit()
@@ -2014,8 +2112,6 @@ def get_external_employee_ess_details(employee):
 		dict with success flag and employee data keyed by employee ID
 	"""
 	try:
-		from frappe.utils import nowdate, format_datetime
-
 		if isinstance(employee, str):
 			try:
 				employee_list = json.loads(employee)
@@ -2023,49 +2119,14 @@ def get_external_employee_ess_details(employee):
 				employee_list = [employee]
 		else:
 			employee_list = employee
+		if not isinstance(employee_list, list):
+			employee_list = [employee_list]
 
-		today = nowdate()
-		result = {}
-
-		for emp in employee_list:
-			if not frappe.db.exists("Employee", emp):
-				continue
-
-			data = frappe.db.get_value(
-				"Employee", emp,
-				["employee_name", "designation", "company"],
-				as_dict=True
-			)
-			if not data:
-				continue
-
-			# Check-in time
-			checkin = frappe.db.sql(
-				"""
-				SELECT time FROM `tabEmployee Checkin`
-				WHERE employee = %s AND log_type = 'IN' AND DATE(time) = %s
-				ORDER BY time ASC LIMIT 1
-				""",
-				(emp, today),
-				as_dict=True
-			)
-			checkin_time = ""
-			if checkin and checkin[0].get("time"):
-				checkin_time = format_datetime(checkin[0]["time"], "HH:mm:ss")
-
-			# Device registration
-			device_registered = "Yes" if frappe.db.exists(
-				"Employee Device Registration", {"employee": emp}
-			) else "No"
-
-			result[emp] = {
-				"employee": emp,
-				"employee_name": data.employee_name or "",
-				"designation": data.designation or "",
-				"company": data.company or "",
-				"checkin_time": checkin_time,
-				"device_registered": device_registered,
-			}
+		cache_key = "ess_external_details:{0}".format(",".join(sorted(cstr(e) for e in employee_list)))
+		result = frappe.cache().get_value(cache_key)
+		if result is None:
+			result = get_employee_rows(employee_list, extra_fields=["company"])
+			frappe.cache().set_value(cache_key, result, expires_in_sec=EXTERNAL_ESS_CACHE_TTL)
 
 		return {"success": True, "data": result}
 
@@ -2089,43 +2150,18 @@ def get_external_reportees(employee):
 		dict with success flag and list of reportee details
 	"""
 	try:
-		from frappe.utils import nowdate, format_datetime
-
-		today = nowdate()
-		reportees = frappe.db.get_all(
-			"Employee",
-			filters={"reports_to": employee, "status": "Active"},
-			fields=["name", "employee_name", "designation", "company"],
-			order_by="employee_name asc"
-		)
-
-		result = []
-		for emp in reportees:
-			checkin = frappe.db.sql(
-				"""
-				SELECT time FROM `tabEmployee Checkin`
-				WHERE employee = %s AND log_type = 'IN' AND DATE(time) = %s
-				ORDER BY time ASC LIMIT 1
-				""",
-				(emp.name, today),
-				as_dict=True
+		cache_key = "ess_external_reportees:{0}".format(employee)
+		result = frappe.cache().get_value(cache_key)
+		if result is None:
+			reportees = frappe.get_all(
+				"Employee",
+				filters={"reports_to": employee, "status": "Active"},
+				pluck="name",
+				order_by="employee_name asc"
 			)
-			checkin_time = ""
-			if checkin and checkin[0].get("time"):
-				checkin_time = format_datetime(checkin[0]["time"], "HH:mm:ss")
-
-			device_registered = "Yes" if frappe.db.exists(
-				"Employee Device Registration", {"employee": emp.name}
-			) else "No"
-
-			result.append({
-				"employee": emp.name,
-				"employee_name": emp.employee_name or "",
-				"designation": emp.designation or "",
-				"company": emp.company or "",
-				"checkin_time": checkin_time,
-				"device_registered": device_registered,
-			})
+			rows = get_employee_rows(reportees, extra_fields=["company"])
+			result = [rows[r] for r in reportees if r in rows]
+			frappe.cache().set_value(cache_key, result, expires_in_sec=EXTERNAL_ESS_CACHE_TTL)
 
 		return {"success": True, "data": result}
 
@@ -2140,6 +2176,7 @@ def get_external_reportees(employee):
 
 # ==================== EMPLOYEE LEAVE STATUS CRON ====================
 
+@instrumented("job")
 def sync_employee_leave_status_to_remote():
 	"""
 	Scheduled job: Push current leave_status (from Leave Application), reports_to
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026, Nesscale Solutions Private Limited and contributors
+# For license information, please see license.txt
+"""
+Streaming exports
+=================
+
+Finance downloads OTPL Payroll sheets and the Monthly Attendance Summary
+grid into spreadsheets. The generic report/XLSX path builds every cell as
+a Python object before writing, so a 20k x 60 sheet balloons the worker.
+
+Here rows are read with chunked, keyset-paged queries and written in a
+single forward pass straight to a private file (CSV, XLSX in openpyxl
+write-only mode, or Parquet row groups when ``pyarrow`` is installed).
+The caller is then redirected to the file, which Frappe serves from disk.
+"""
+
+from __future__ import unicode_literals
+
+import csv
+import hashlib
+import os
+from calendar import monthrange
+
+import frappe
+from frappe import _
+from frappe.model import no_value_fields
+from frappe.utils import cint, cstr, flt, nowdate
+
+EXPORT_FORMATS = ("csv", "xlsx", "parquet")
+EXPORT_CHUNK_SIZE = 1000
+
+_NUMERIC_TYPES = ("Float", "Currency", "Percent")
+_INT_TYPES = ("Int", "Check")
+
+
+# -----------------------------------------------------------------------------
+# Whitelisted entry points
+# -----------------------------------------------------------------------------
+@frappe.whitelist()
+def export_payroll(name, file_format="csv"):
+	"""Download the employee rows of an OTPL Payroll sheet."""
+	file_format = _validate_format(file_format)
+	frappe.has_permission("OTPL Payroll", "read", doc=name, throw=True)
+
+	columns = _payroll_columns()
+	chunks = _iter_payroll_chunks(name, [c["fieldname"] for c in columns])
+	file_url = _write_export(
+		"{0}.{1}".format(frappe.scrub(name), file_format),
+		file_format, columns, chunks,
+		attached_to=("OTPL Payroll", name),
+	)
+	_redirect(file_url)
+
+
+@frappe.whitelist()
+def export_monthly_attendance_summary(filters, file_format="csv"):
+	"""Download the Monthly Attendance Summary grid for ``filters``."""
+	from employee_self_service.employee_self_service.report.monthly_attendance_summary.monthly_attendance_summary import (
+		get_columns,
+		iter_data,
+	)
+
+	file_format = _validate_format(file_format)
+	if not frappe.get_doc("Report", "Monthly Attendance Summary").is_permitted():
+		frappe.throw(_("Not permitted"), frappe.PermissionError)
+
+	filters = frappe._dict(frappe.parse_json(filters) if isinstance(filters, str) else filters)
+	year, month = cint(filters.get("year")), cint(filters.get("month"))
+	if not year or not month:
+		frappe.throw(_("Year and Month are required"))
+	days_in_month = monthrange(year, month)[1]
+
+	columns = get_columns(year, month, days_in_month)
+	fieldnames = [c["fieldname"] for c in columns]
+	rows = iter_data(filters, year, month, days_in_month, chunk_size=EXPORT_CHUNK_SIZE)
+	chunks = _chunk_dicts(rows, fieldnames, EXPORT_CHUNK_SIZE)
+
+	file_url = _write_export(
+		"monthly-attendance-{0}-{1:02d}.{2}".format(year, month, file_format),
+		file_format, columns, chunks,
+	)
+	_redirect(file_url)
+
+
+# -----------------------------------------------------------------------------
+# Row sources
+# -----------------------------------------------------------------------------
+def _payroll_columns():
+	meta = frappe.get_meta("OTPL Payroll Detail")
+	return [
+		{"label": _(df.label), "fieldname": df.fieldname, "fieldtype": df.fieldtype}
+		for df in meta.fields
+		if df.fieldtype not in no_value_fields and not df.hidden
+	]
+
+
+def _iter_payroll_chunks(name, fieldnames):
+	"""Yield lists of row-lists, paging on ``idx`` instead of OFFSET."""
+	last_idx = 0
+	select = ", ".join("`{0}`".format(f) for f in fieldnames)
+	while True:
+		rows = frappe.db.sql(
+			"""
+			SELECT idx, {select}
+			FROM `tabOTPL Payroll Detail`
+			WHERE parent = %(parent)s
+			  AND parenttype = 'OTPL Payroll'
+			  AND idx > %(last_idx)s
+			ORDER BY idx
+			LIMIT %(limit)s
+			""".format(select=select),
+			{"parent": name, "last_idx": last_idx, "limit": EXPORT_CHUNK_SIZE},
+			as_list=True,
+		)
+		if not rows:
+			return
+		last_idx = rows[-1][0]
+		yield [r[1:] for r in rows]
+		if len(rows) < EXPORT_CHUNK_SIZE:
+			return
+
+
+def _chunk_dicts(rows, fieldnames, size):
+	chunk = []
+	for row in rows:
+		chunk.append([row.get(f) for f in fieldnames])
+		if len(chunk) >= size:
+			yield chunk
+			chunk = []
+	if chunk:
+		yield chunk
+
+
+# -----------------------------------------------------------------------------
+# Writers (single forward pass, one chunk in memory at a time)
+# -----------------------------------------------------------------------------
+def _write_csv(path, columns, chunks):
+	with open(path, "w", newline="", encoding="utf-8") as f:
+		writer = csv.writer(f)
+		writer.writerow([c["label"] for c in columns])
+		for chunk in chunks:
+			writer.writerows(chunk)
+
+
+def _write_xlsx(path, columns, chunks):
+	from openpyxl import Workbook
+
+	wb = Workbook(write_only=True)
+	ws = wb.create_sheet("Sheet1")
+	ws.append([c["label"] for c in columns])
+	for chunk in chunks:
+		for row in chunk:
+			ws.append(row)
+	wb.save(path)
+
+
+def _write_parquet(path, columns, chunks):
+	try:
+		import pyarrow as pa
+		import pyarrow.parquet as pq
+	except ImportError:
+		frappe.throw(_("Parquet export needs the pyarrow package on this bench. Use CSV or XLSX instead."))
+
+	types = []
+	for c in columns:
+		if c["fieldtype"] in _NUMERIC_TYPES:
+			types.append((pa.float64(), flt))
+		elif c["fieldtype"] in _INT_TYPES:
+			types.append((pa.int64(), cint))
+		else:
+			types.append((pa.string(), cstr))
+	schema = pa.schema([(c["fieldname"], t[0]) for c, t in zip(columns, types)])
+
+	with pq.ParquetWriter(path, schema) as writer:
+		for chunk in chunks:
+			arrays = [
+				pa.array([cast(v) if v is not None else None for v in col], type=pa_type)
+				for col, (pa_type, cast) in zip(zip(*chunk), types)
+			]
+			writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+
+
+_WRITERS = {"csv": _write_csv, "xlsx": _write_xlsx, "parquet": _write_parquet}
+
+
+# -----------------------------------------------------------------------------
+# Helpers
+# -----------------------------------------------------------------------------
+def _validate_format(file_format):
+	file_format = cstr(file_format or "csv").lower()
+	if file_format not in EXPORT_FORMATS:
+		frappe.throw(_("Unsupported export format {0}").format(file_format))
+	return file_format
+
+
+def _write_export(file_name, file_format, columns, chunks, attached_to=None):
+	"""Write ``chunks`` to a private File and return its URL."""
+	file_name = "{0}-{1}-{2}".format(nowdate(), frappe.generate_hash(length=6), file_name)
+	path = frappe.get_site_path("private", "files", file_name)
+	try:
+		_WRITERS[file_format](path, columns, chunks)
+	except Exception:
+		if os.path.exists(path):
+			os.remove(path)
+		raise
+
+	file_doc = frappe.get_doc({
+		"doctype": "File",
+		"file_name": file_name,
+		"file_url": "/private/files/" + file_name,
+		"is_private": 1,
+		"file_size": os.path.getsize(path),
+		# Pre-computed so File.validate doesn't read the whole export back.
+		"content_hash": _content_hash(path),
+		"attached_to_doctype": attached_to[0] if attached_to else None,
+		"attached_to_name": attached_to[1] if attached_to else None,
+	})
+	file_doc.insert(ignore_permissions=True)
+	return file_doc.file_url
+
+
+def _content_hash(path):
+	md5 = hashlib.md5()
+	with open(path, "rb") as f:
+		for block in iter(lambda: f.read(1 << 20), b""):
+			md5.update(block)
+	return md5.hexdigest()
+
+
+def _redirect(file_url):
+	frappe.local.response["type"] = "redirect"
+	frappe.local.response["location"] = file_url
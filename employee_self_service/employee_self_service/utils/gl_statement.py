@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026, Nesscale Solutions Private Limited and contributors
+# For license information, please see license.txt
+"""
+Party statements straight from GL Entry.
+
+The mobile statement used to run the full General Ledger report, which
+loads every account, groups, computes per-account openings and formats
+rows only for ``get_transactions`` to pick three kinds of row back out.
+Here a statement is:
+
+* an opening balance: cached monthly totals for closed months plus one
+  aggregate over the open stretch up to ``from_date``, plus the period's
+  ``is_opening`` entries (the report counts those as opening too);
+* the period's other entries, read in pages off the
+  ``(party_type, party, posting_date)`` index with a running balance;
+* a total row (the period's debit, credit and net, as the report shows it).
+
+Callers check access to the parties themselves; nothing here applies
+user permissions, so the cached month totals can be shared.
+
+A month is closed once the current month has started. Its totals are
+cached per party and company. Back-dated entries are rare, but the GL Entry
+``on_submit`` hook (which also covers cancellation reversals) drops a
+party's cached months when an entry is posted into one of them.
+"""
+
+from __future__ import unicode_literals
+
+import frappe
+from frappe.utils import flt, get_first_day, getdate, nowdate
+
+GL_INDEX = ["party_type", "party", "posting_date"]
+PAGE_SIZE = 500
+OPENING_CACHE_TTL = 7 * 24 * 60 * 60  # seconds
+NOT_OPENING = "IFNULL(is_opening, 'No') != 'Yes'"
+
+
+def get_statement(company, party_type, parties, from_date, to_date, start=0, page_length=None):
+	"""``{opening, entries, total}`` for ``parties`` of ``party_type``.
+
+	``opening`` and ``total`` are ``{debit, credit, balance}``; each entry
+	has ``posting_date``, ``voucher_type``, ``voucher_no``, ``party_type``,
+	``party``, ``debit``, ``credit`` and the running ``balance``. With
+	``page_length`` only that page of entries is returned (balances still
+	run from the opening)."""
+	parties = _as_list(parties)
+	if not parties:
+		zero = {"debit": 0.0, "credit": 0.0, "balance": 0.0}
+		return {"opening": zero, "entries": [], "total": dict(zero)}
+	from_date, to_date = getdate(from_date), getdate(to_date)
+	opening = get_opening_balance(company, party_type, parties, from_date, to_date)
+
+	debit, credit = _sum_range(company, party_type, parties, from_date, to_date, is_opening="No")
+	total = {"debit": debit, "credit": credit, "balance": debit - credit}
+
+	entries = list(iter_entries(
+		company, party_type, parties, from_date, to_date,
+		opening_balance=opening["balance"], start=start, limit=page_length,
+	))
+	return {"opening": opening, "entries": entries, "total": total}
+
+
+def get_opening_balance(company, party_type, parties, from_date, to_date=None):
+	"""``{debit, credit, balance}`` of everything posted before ``from_date``
+	and, with ``to_date``, the ``is_opening`` entries up to it."""
+	from_date = getdate(from_date)
+	boundary = min(get_first_day(from_date), get_first_day(nowdate()))
+
+	debit = credit = 0.0
+	for party in _as_list(parties):
+		for month, (month_debit, month_credit) in _get_closed_months(company, party_type, party).items():
+			if month < str(boundary):
+				debit += month_debit
+				credit += month_credit
+
+	if boundary < from_date:
+		open_debit, open_credit = _sum_range(company, party_type, parties, boundary, from_date, inclusive=False)
+		debit += open_debit
+		credit += open_credit
+
+	if to_date:
+		period_debit, period_credit = _sum_range(
+			company, party_type, parties, from_date, to_date, is_opening="Yes"
+		)
+		debit += period_debit
+		credit += period_credit
+	return {"debit": debit, "credit": credit, "balance": debit - credit}
+
+
+def iter_entries(company, party_type, parties, from_date, to_date, opening_balance=0, start=0, limit=None):
+	"""Yield the period's entries (``is_opening`` ones excluded) in posting
+	order, ``PAGE_SIZE`` rows per query, each with its running ``balance``."""
+	parties = _as_list(parties)
+	start = int(start or 0)
+	balance = flt(opening_balance)
+	if start:
+		balance += _sum_first_rows(company, party_type, parties, from_date, to_date, start)
+
+	remaining = int(limit) if limit else None
+	while remaining is None or remaining > 0:
+		page_length = min(PAGE_SIZE, remaining) if remaining is not None else PAGE_SIZE
+		rows = frappe.db.sql(
+			"""
+			SELECT posting_date, voucher_type, voucher_no, party_type, party,
+				debit, credit
+			FROM `tabGL Entry`
+			WHERE {conditions} AND posting_date BETWEEN %(from_date)s AND %(to_date)s
+				AND {not_opening}
+			ORDER BY posting_date, creation, name
+			LIMIT %(start)s, %(page_length)s
+			""".format(conditions=_party_conditions(), not_opening=NOT_OPENING),
+			_params(company, party_type, parties, from_date=getdate(from_date), to_date=getdate(to_date),
+				start=start, page_length=page_length),
+			as_dict=True,
+		)
+		for row in rows:
+			balance += flt(row.debit) - flt(row.credit)
+			row.balance = balance
+			yield row
+		if len(rows) < page_length:
+			break
+		start += page_length
+		if remaining is not None:
+			remaining -= page_length
+
+
+def clear_closed_months(doc, method=None):
+	"""GL Entry on_submit hook: forget cached months a back-dated (or
+	reversing) entry falls into."""
+	if not doc.get("party_type") or not doc.get("party"):
+		return
+	key = _opening_key(doc.company, doc.party_type, doc.party)
+	cached = frappe.cache().get_value(key)
+	if not cached:
+		return
+	if str(getdate(doc.posting_date)) < cached["until"]:
+		frappe.cache().delete_value(key)
+
+
+def _get_closed_months(company, party_type, party):
+	"""``{"YYYY-MM-01": (debit, credit)}`` for every month of ``party``
+	before the current one, cached until a back-dated entry lands in one."""
+	key = _opening_key(company, party_type, party)
+	current_month = str(get_first_day(nowdate()))
+	cached = frappe.cache().get_value(key)
+	if cached is not None and cached.get("until") == current_month:
+		return cached["months"]
+
+	months = {
+		str(month): (flt(debit), flt(credit))
+		for month, debit, credit in frappe.db.sql(
+			"""
+			SELECT DATE_FORMAT(posting_date, '%%Y-%%m-01') AS month, SUM(debit), SUM(credit)
+			FROM `tabGL Entry`
+			WHERE {conditions} AND posting_date < %(until)s
+			GROUP BY month
+			""".format(conditions=_party_conditions()),
+			_params(company, party_type, [party], until=current_month),
+		)
+	}
+	frappe.cache().set_value(key, {"until": current_month, "months": months}, expires_in_sec=OPENING_CACHE_TTL)
+	return months
+
+
+def _sum_range(company, party_type, parties, from_date, to_date, inclusive=True, is_opening=None):
+	"""Debit and credit totals over the range; ``is_opening`` ("Yes" / "No")
+	limits them to, or excludes, opening entries."""
+	opening_condition = ""
+	if is_opening:
+		opening_condition = "AND " + (NOT_OPENING if is_opening == "No" else "is_opening = 'Yes'")
+	debit, credit = frappe.db.sql(
+		"""
+		SELECT SUM(debit), SUM(credit)
+		FROM `tabGL Entry`
+		WHERE {conditions} AND posting_date >= %(from_date)s AND posting_date {op} %(to_date)s
+			{opening_condition}
+		""".format(
+			conditions=_party_conditions(), op="<=" if inclusive else "<",
+			opening_condition=opening_condition,
+		),
+		_params(company, party_type, parties, from_date=getdate(from_date), to_date=getdate(to_date)),
+	)[0]
+	return flt(debit), flt(credit)
+
+
+def _sum_first_rows(company, party_type, parties, from_date, to_date, count):
+	"""Net of the first ``count`` entries of the period, for the balance a
+	later page starts from."""
+	return flt(frappe.db.sql(
+		"""
+		SELECT SUM(debit - credit) FROM (
+			SELECT debit, credit
+			FROM `tabGL Entry`
+			WHERE {conditions} AND posting_date BETWEEN %(from_date)s AND %(to_date)s
+				AND {not_opening}
+			ORDER BY posting_date, creation, name
+			LIMIT %(count)s
+		) first_rows
+		""".format(conditions=_party_conditions(), not_opening=NOT_OPENING),
+		_params(company, party_type, parties, from_date=getdate(from_date), to_date=getdate(to_date),
+			count=int(count)),
+	)[0][0])
+
+
+def _party_conditions():
+	return (
+		"party_type = %(party_type)s AND party IN %(parties)s"
+		" AND company = %(company)s AND is_cancelled = 0"
+	)
+
+
+def _params(company, party_type, parties, **extra):
+	params = {"company": company, "party_type": party_type, "parties": tuple(parties)}
+	params.update(extra)
+	return params
+
+
+def _as_list(parties):
+	if isinstance(parties, (list, tuple, set)):
+		return [p for p in parties if p]
+	return [parties] if parties else []
+
+
+def _opening_key(company, party_type, party):
+	return "ess_gl_months:{0}:{1}:{2}".format(company, frappe.scrub(party_type), party)
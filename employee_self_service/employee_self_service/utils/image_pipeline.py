@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026, Nesscale Solutions Private Limited and contributors
+# For license information, please see license.txt
+"""
+Image ingestion for check-in and work-progress photos.
+
+``frappe.handler.upload_file`` reads the whole multipart body into memory,
+stores the full-resolution phone photo and the callers then re-save the
+parent document. Here instead:
+
+1. the upload is copied to disk in fixed-size chunks while its content
+   hash is computed, and an identical photo already on disk is reused;
+2. the File row is inserted with that hash (no second read of the file)
+   and the parent field is set with ``db_set`` - no parent re-save;
+3. a background job downscales / re-encodes the photo according to
+   Employee Self Service Settings, builds the list-view thumbnail and
+   drops the original unless ``keep_original_images`` is set.
+"""
+
+from __future__ import unicode_literals
+
+import hashlib
+import os
+
+import frappe
+from frappe import _
+from frappe.utils import cint
+
+from employee_self_service.employee_self_service.utils.job_router import enqueue_job
+
+CHUNK_SIZE = 64 * 1024
+THUMBNAIL_SIZE = (300, 300)
+
+
+def attach_uploaded_image(doctype, name, fieldname, replace_existing=True, is_private=None):
+	"""Store ``frappe.request.files["file"]`` as the image of
+	``doctype``/``name``.``fieldname`` and return the File doc.
+	``is_private`` defaults to the request's ``is_private`` flag, as
+	``frappe.handler.upload_file`` read it."""
+	upload = frappe.request.files.get("file")
+	if not upload:
+		frappe.throw(_("No file provided"))
+	if is_private is None:
+		is_private = frappe.form_dict.get("is_private")
+	return _attach(
+		doctype, name, fieldname, upload.filename, _iter_stream(upload.stream),
+		replace_existing, cint(is_private),
+	)
+
+
+def attach_image_content(doctype, name, fieldname, content, file_name, replace_existing=True, is_private=0):
+	"""Same as ``attach_uploaded_image`` for bytes already in hand (e.g. a
+	base64 image from the offline check-in sync)."""
+	chunks = (content[i:i + CHUNK_SIZE] for i in range(0, len(content), CHUNK_SIZE))
+	return _attach(doctype, name, fieldname, file_name, chunks, replace_existing, cint(is_private))
+
+
+def process_image(file_name):
+	"""Background job: downscale + re-encode one uploaded image, build its
+	thumbnail, and point every File (and parent field) using it at the
+	result.
+
+	``content_hash`` is left as the hash of the upload, so a retried upload
+	of the same photo still dedupes onto the processed copy.
+	"""
+	from PIL import Image, ImageOps
+
+	file_doc = frappe.get_doc("File", file_name)
+	settings = frappe.get_cached_doc("Employee Self Service Settings")
+	max_dimension = cint(settings.get("image_max_dimension"))
+	quality = min(max(cint(settings.get("image_quality")) or 80, 1), 95)
+
+	if max_dimension:
+		src_path = file_doc.get_full_path()
+		with Image.open(src_path) as img:
+			img = ImageOps.exif_transpose(img)
+			if max(img.size) > max_dimension:
+				img.thumbnail((max_dimension, max_dimension))
+			out_name = "{0}-web.jpg".format(os.path.splitext(file_doc.file_name)[0])
+			out_path = _files_path(out_name, file_doc.is_private)
+			img.convert("RGB").save(out_path, "JPEG", quality=quality, optimize=True)
+
+		old_url, new_url = file_doc.file_url, _file_url(out_name, file_doc.is_private)
+		for f in frappe.get_all(
+			"File",
+			filters={"file_url": old_url},
+			fields=["name", "attached_to_doctype", "attached_to_name", "attached_to_field"],
+		):
+			frappe.db.set_value("File", f.name, {
+				"file_name": out_name,
+				"file_url": new_url,
+				"file_size": os.path.getsize(out_path),
+			}, update_modified=False)
+			if f.attached_to_field:
+				frappe.db.set_value(
+					f.attached_to_doctype, f.attached_to_name,
+					f.attached_to_field, new_url, update_modified=False
+				)
+		if not settings.get("keep_original_images") and os.path.exists(src_path):
+			os.remove(src_path)
+		file_doc.reload()
+
+	thumbnail_url = file_doc.make_thumbnail(
+		set_as_thumbnail=True, width=THUMBNAIL_SIZE[0], height=THUMBNAIL_SIZE[1]
+	)
+	if thumbnail_url:
+		frappe.db.sql(
+			"UPDATE `tabFile` SET thumbnail_url = %s WHERE file_url = %s",
+			(thumbnail_url, file_doc.file_url),
+		)
+
+
+def _attach(doctype, name, fieldname, original_name, chunks, replace_existing, is_private=0):
+	old_url = frappe.db.get_value(doctype, name, fieldname) if replace_existing else None
+
+	file_name = _unique_file_name(original_name)
+	path = _files_path(file_name, is_private)
+	content_hash, size = _write_chunks(path, chunks)
+
+	# Same photo uploaded again (a retried punch): reuse the processed copy.
+	duplicate = frappe.db.get_value(
+		"File", {"content_hash": content_hash, "is_private": is_private}, ["file_name", "file_url"], as_dict=True
+	)
+	if duplicate:
+		os.remove(path)
+		file_name, file_url = duplicate.file_name, duplicate.file_url
+	else:
+		file_url = _file_url(file_name, is_private)
+
+	file_doc = frappe.get_doc({
+		"doctype": "File",
+		"file_name": file_name,
+		"file_url": file_url,
+		"is_private": is_private,
+		"file_size": size,
+		"content_hash": content_hash,
+		"attached_to_doctype": doctype,
+		"attached_to_name": name,
+		"attached_to_field": fieldname,
+	})
+	# A retried upload of the same photo for the same record is fine here.
+	file_doc.flags.ignore_duplicate_entry_error = True
+	file_doc.insert(ignore_permissions=True)
+
+	frappe.db.set_value(doctype, name, fieldname, file_doc.file_url)
+
+	if old_url and old_url != file_doc.file_url:
+		old_file = frappe.db.get_value(
+			"File", {"file_url": old_url, "attached_to_doctype": doctype, "attached_to_name": name}, "name"
+		)
+		if old_file:
+			frappe.delete_doc("File", old_file, ignore_permissions=True)
+
+	if not duplicate:
+		enqueue_job(
+			"employee_self_service.employee_self_service.utils.image_pipeline.process_image",
+			dedupe_key="process_image:" + file_doc.name,
+			file_name=file_doc.name,
+			enqueue_after_commit=True,
+		)
+	return file_doc
+
+
+def _iter_stream(stream):
+	while True:
+		chunk = stream.read(CHUNK_SIZE)
+		if not chunk:
+			return
+		yield chunk
+
+
+def _write_chunks(path, chunks):
+	md5, size = hashlib.md5(), 0
+	with open(path, "wb") as f:
+		for chunk in chunks:
+			md5.update(chunk)
+			size += len(chunk)
+			f.write(chunk)
+	return md5.hexdigest(), size
+
+
+def _unique_file_name(original_name):
+	stem, ext = os.path.splitext(os.path.basename(original_name or "image.jpg"))
+	return "{0}-{1}{2}".format(frappe.scrub(stem)[:60] or "image", frappe.generate_hash(length=8), ext.lower() or ".jpg")
+
+
+def _files_path(file_name, is_private=0):
+	if cint(is_private):
+		return frappe.get_site_path("private", "files", file_name)
+	return frappe.get_site_path("public", "files", file_name)
+
+
+def _file_url(file_name, is_private=0):
+	return ("/private/files/" if cint(is_private) else "/files/") + file_name
+
@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026, Nesscale Solutions Private Limited and contributors
+# For license information, please see license.txt
+"""
+Lightweight latency instrumentation for mobile endpoints, doc-event hooks
+and scheduler jobs.
+
+``measure(kind, name)`` (used by ``api_utils.ess_validate`` and the
+``instrumented`` decorator) records per call:
+
+* wall time, into a fixed-bucket histogram;
+* outbound HTTP time spent in ``requests``;
+* SQL query count and time - only for a sampled fraction of calls
+  (``ess_metrics_sql_sample_rate`` in site config, default 0.1), since it
+  wraps ``frappe.db.sql`` for the duration of the call.
+
+Each call ends with one pipelined Redis round trip of HINCRBY's into
+``ess_metrics:<kind>:<name>``. Set ``ess_metrics_disabled: 1`` in site
+config to switch it off. ``get_stats`` serves the numbers to the
+ESS Performance desk page.
+"""
+
+from __future__ import unicode_literals
+
+import inspect
+import random
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+import frappe
+from frappe.utils import cint, flt
+
+BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+DEFAULT_SQL_SAMPLE_RATE = 0.1
+
+_http_timer_installed = False
+
+
+class _Frame(object):
+	__slots__ = ("sample_sql", "sql_count", "sql_time", "http_time")
+
+	def __init__(self, sample_sql):
+		self.sample_sql = sample_sql
+		self.sql_count = 0
+		self.sql_time = 0.0
+		self.http_time = 0.0
+
+
+def instrumented(kind):
+	"""Decorator for hooks (``kind="hook"``) and scheduler jobs
+	(``kind="job"``).
+
+	Whitelisted functions must keep ``@frappe.whitelist()`` outermost:
+	Frappe checks the whitelist against the exact function object."""
+	def decorator(fn):
+		name = "{0}.{1}".format(fn.__module__, fn.__name__)
+
+		@wraps(fn)
+		def wrapper(*args, **kwargs):
+			with measure(kind, name):
+				return fn(*args, **kwargs)
+
+		# ``frappe.call`` filters request arguments by the callable's
+		# signature; report ``fn``'s rather than ``*args, **kwargs``.
+		wrapper.__signature__ = inspect.signature(fn)
+		return wrapper
+
+	return decorator
+
+
+@contextmanager
+def measure(kind, name):
+	if frappe.conf.get("ess_metrics_disabled"):
+		yield
+		return
+
+	_install_http_timer()
+	frames = _get_frames()
+	sample_rate = flt(frappe.conf.get("ess_metrics_sql_sample_rate", DEFAULT_SQL_SAMPLE_RATE))
+	frame = _Frame(sample_sql=random.random() < sample_rate)
+	frames.append(frame)
+	wrapped_sql = frame.sample_sql and _wrap_db_sql()
+
+	failed = False
+	start = time.perf_counter()
+	try:
+		yield
+	except Exception:
+		failed = True
+		raise
+	finally:
+		wall = time.perf_counter() - start
+		frames.pop()
+		if wrapped_sql:
+			_unwrap_db_sql()
+		_record(kind, name, wall, frame, failed)
+
+
+@contextmanager
+def sql_counter():
+	"""Count and time ``frappe.db.sql`` inside the block without recording
+	anything. Yields a frame; read ``sql_count`` / ``sql_time`` (seconds)
+	after the block."""
+	frames = _get_frames()
+	frame = _Frame(sample_sql=True)
+	frames.append(frame)
+	wrapped_sql = _wrap_db_sql()
+	try:
+		yield frame
+	finally:
+		frames.remove(frame)
+		if wrapped_sql:
+			_unwrap_db_sql()
+
+
+@frappe.whitelist()
+def get_stats(kind=None):
+	"""Aggregated timings per instrumented name, slowest p95 first."""
+	frappe.only_for("System Manager")
+	cache = frappe.cache()
+	stats = []
+	for key in cache.smembers(_index_key()):
+		key = frappe.safe_decode(key)
+		row_kind, _, name = key.partition(":")
+		if kind and row_kind != kind:
+			continue
+		data = {frappe.safe_decode(k): flt(frappe.safe_decode(v)) for k, v in cache.hgetall(_metric_key(key)).items()}
+		count = cint(data.get("count"))
+		if not count:
+			continue
+		sql_samples = cint(data.get("sql_samples"))
+		stats.append({
+			"kind": row_kind,
+			"name": name,
+			"count": count,
+			"errors": cint(data.get("errors")),
+			"avg_ms": flt(data.get("wall_ms") / count, 1),
+			"max_ms": flt(data.get("max_ms"), 1),
+			"p50_ms": _percentile(data, count, 0.5),
+			"p95_ms": _percentile(data, count, 0.95),
+			"p99_ms": _percentile(data, count, 0.99),
+			"avg_http_ms": flt(data.get("http_ms", 0) / count, 1),
+			"sql_samples": sql_samples,
+			"avg_queries": flt(data.get("sql_count", 0) / sql_samples, 1) if sql_samples else None,
+			"avg_sql_ms": flt(data.get("sql_ms", 0) / sql_samples, 1) if sql_samples else None,
+		})
+	stats.sort(key=lambda r: r["p95_ms"] or 0, reverse=True)
+	return stats
+
+
+@frappe.whitelist()
+def reset_stats():
+	frappe.only_for("System Manager")
+	cache = frappe.cache()
+	keys = [frappe.safe_decode(k) for k in cache.smembers(_index_key())]
+	if keys:
+		cache.delete(*[_metric_key(k) for k in keys])
+	cache.delete(_index_key())
+
+
+def _record(kind, name, wall, frame, failed):
+	wall_ms = wall * 1000
+	bucket = next((b for b in BUCKETS_MS if wall_ms <= b), "inf")
+	member = "{0}:{1}".format(kind, name)
+	key = _metric_key(member)
+	try:
+		cache = frappe.cache()
+		pipe = cache.pipeline(transaction=False)
+		pipe.sadd(_index_key(), member)
+		pipe.hincrby(key, "count", 1)
+		pipe.hincrby(key, "b{0}".format(bucket), 1)
+		pipe.hincrbyfloat(key, "wall_ms", wall_ms)
+		if frame.http_time:
+			pipe.hincrbyfloat(key, "http_ms", frame.http_time * 1000)
+		if frame.sample_sql:
+			pipe.hincrby(key, "sql_samples", 1)
+			pipe.hincrby(key, "sql_count", frame.sql_count)
+			pipe.hincrbyfloat(key, "sql_ms", frame.sql_time * 1000)
+		if failed:
+			pipe.hincrby(key, "errors", 1)
+		pipe.execute()
+		if wall_ms > flt(frappe.safe_decode(cache.hget(key, "max_ms") or 0)):
+			cache.hset(key, "max_ms", wall_ms)
+	except Exception:
+		# Metrics must never break the call they measure.
+		pass
+
+
+def _percentile(data, count, p):
+	target = count * p
+	seen = 0
+	for b in BUCKETS_MS:
+		seen += cint(data.get("b{0}".format(b)))
+		if seen >= target:
+			return b
+	return flt(data.get("max_ms"), 1)
+
+
+def _get_frames():
+	if not hasattr(frappe.local, "ess_metric_frames"):
+		frappe.local.ess_metric_frames = []
+	return frappe.local.ess_metric_frames
+
+
+def _wrap_db_sql():
+	"""Count and time ``frappe.db.sql`` for every sampled frame on the stack.
+	Only the outermost sampled frame installs the wrapper."""
+	db = frappe.db
+	if not db or "sql" in db.__dict__:
+		return False
+	original = db.sql
+
+	def sql(*args, **kwargs):
+		start = time.perf_counter()
+		try:
+			return original(*args, **kwargs)
+		finally:
+			elapsed = time.perf_counter() - start
+			for frame in _get_frames():
+				if frame.sample_sql:
+					frame.sql_count += 1
+					frame.sql_time += elapsed
+
+	db.sql = sql
+	return True
+
+
+def _unwrap_db_sql():
+	db = frappe.db
+	if db and "sql" in db.__dict__:
+		del db.sql
+
+
+def _install_http_timer():
+	"""Time ``requests`` calls made while any frame is open. Patched once
+	per process; outside a measured call it costs one attribute lookup."""
+	global _http_timer_installed
+	if _http_timer_installed:
+		return
+	import requests
+
+	original = requests.Session.request
+
+	def request(self, *args, **kwargs):
+		frames = getattr(frappe.local, "ess_metric_frames", None)
+		if not frames:
+			return original(self, *args, **kwargs)
+		start = time.perf_counter()
+		try:
+			return original(self, *args, **kwargs)
+		finally:
+			elapsed = time.perf_counter() - start
+			for frame in frames:
+				frame.http_time += elapsed
+
+	requests.Session.request = request
+	_http_timer_installed = True
+
+
+def _index_key():
+	return frappe.cache().make_key("ess_metrics:index")
+
+
+def _metric_key(member):
+	return frappe.cache().make_key("ess_metrics:{0}".format(member))
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026, Nesscale Solutions Private Limited and contributors
+# For license information, please see license.txt
+"""
+Item catalogue with price-list rates for the order screens.
+
+A page of items and their rate on one price list comes from a single
+query (Item joined to its latest Item Price), instead of one Item Price
+lookup per item. Pages are cached under a catalogue version that the
+Item / Item Price hooks bump after commit, so an edit shows up within
+moments while repeated app opens hit Redis. Item user permissions are
+applied in the query, and pages are cached per set of them.
+
+``since`` returns only items whose Item row or price changed after that
+timestamp; the response's ``next_since`` is what the app passes next
+time. Deleted items are not reported by a delta, so the app should still
+do a full load now and then (e.g. on login).
+"""
+
+from __future__ import unicode_literals
+
+import hashlib
+
+import frappe
+from frappe.desk.reportview import build_match_conditions
+from frappe.utils import cint, cstr, get_datetime, now
+
+from employee_self_service.employee_self_service.utils.job_router import enqueue_job
+
+CATALOGUE_CACHE_TTL = 6 * 60 * 60  # seconds; versioned, so safe to keep long
+MAX_PAGE_LENGTH = 500
+
+
+def get_catalogue(price_list, start=0, page_length=0, search=None, since=None):
+	"""``{"items": [...], "version": int, "next_since": str}``. Each item
+	has ``name``, ``item_name``, ``item_code``, ``image``, ``rate`` and
+	``modified``. ``page_length=0`` returns every match."""
+	start = cint(start)
+	page_length = min(cint(page_length), MAX_PAGE_LENGTH) if cint(page_length) else 0
+	search = cstr(search).strip()
+	since = cstr(since).strip()
+
+	# Users with the same Item user permissions share cached pages.
+	match_conditions = build_match_conditions("Item")
+	version = get_catalogue_version()
+	cache_key = "ess_item_catalogue:{0}:{1}:{2}:{3}:{4}:{5}:{6}".format(
+		version, price_list, start, page_length, search, since,
+		hashlib.md5(match_conditions.encode()).hexdigest() if match_conditions else "",
+	)
+	result = frappe.cache().get_value(cache_key)
+	if result is None:
+		# Taken before the query so a change committed meanwhile is not skipped.
+		next_since = now()
+		result = {
+			"items": _query_catalogue(price_list, start, page_length, search, since, match_conditions),
+			"version": version,
+			"next_since": next_since,
+		}
+		frappe.cache().set_value(cache_key, result, expires_in_sec=CATALOGUE_CACHE_TTL)
+	return result
+
+
+def get_item_rates(item_codes, price_list):
+	"""``{item_code: price_list_rate}`` for many items in one query (the
+	most recently modified Item Price wins)."""
+	if not item_codes:
+		return {}
+	return dict(frappe.db.sql(
+		"""
+		SELECT ip.item_code, ip.price_list_rate
+		FROM `tabItem Price` ip
+		WHERE ip.price_list = %(price_list)s
+			AND ip.item_code IN %(item_codes)s
+		ORDER BY ip.modified ASC
+		""",
+		{"price_list": price_list, "item_codes": tuple(item_codes)},
+	))
+
+
+def get_catalogue_version():
+	return cint(frappe.cache().get(_version_key()))
+
+
+def bump_catalogue_version(doc=None, method=None):
+	"""Item / Item Price hook: invalidate every cached catalogue page once
+	the change is committed. Bumping inside the transaction would let a
+	concurrent reader cache the old rows under the new version."""
+	enqueue_job(
+		"employee_self_service.employee_self_service.utils.item_catalogue.incr_catalogue_version",
+		job_class="interactive",
+		enqueue_after_commit=True,
+	)
+
+
+def incr_catalogue_version():
+	frappe.cache().incr(_version_key())
+
+
+def _query_catalogue(price_list, start, page_length, search, since, match_conditions=None):
+	conditions = []
+	params = {"price_list": price_list, "start": start, "page_length": page_length}
+	if search:
+		conditions.append("(`tabItem`.item_code LIKE %(search)s OR `tabItem`.item_name LIKE %(search)s)")
+		params["search"] = "%{0}%".format(search)
+	if since:
+		conditions.append("(`tabItem`.modified > %(since)s OR p.modified > %(since)s)")
+		params["since"] = get_datetime(since)
+	if match_conditions:
+		# User permissions, as frappe.get_list("Item") applied them.
+		conditions.append("({0})".format(match_conditions))
+
+	# Latest Item Price per item on this price list.
+	return frappe.db.sql(
+		"""
+		SELECT
+			`tabItem`.name, `tabItem`.item_name, `tabItem`.item_code, `tabItem`.image,
+			IFNULL(p.price_list_rate, 0) AS rate,
+			GREATEST(`tabItem`.modified, IFNULL(p.modified, `tabItem`.modified)) AS modified
+		FROM `tabItem`
+		LEFT JOIN `tabItem Price` p
+			ON p.name = (
+				SELECT ip.name FROM `tabItem Price` ip
+				WHERE ip.item_code = `tabItem`.name AND ip.price_list = %(price_list)s
+				ORDER BY ip.modified DESC
+				LIMIT 1
+			)
+		{where}
+		ORDER BY `tabItem`.item_name, `tabItem`.name
+		{limit}
+		""".format(
+			where="WHERE " + " AND ".join(conditions) if conditions else "",
+			limit="LIMIT %(start)s, %(page_length)s" if page_length else "",
+		),
+		params,
+		as_dict=True,
+	)
+
+
+def _version_key():
+	return frappe.cache().make_key("ess_item_catalogue_version")
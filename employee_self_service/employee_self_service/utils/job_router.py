@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026, Nesscale Solutions Private Limited and contributors
+# For license information, please see license.txt
+"""
+Background job routing by latency class.
+
+Every job used to go to the ``default`` queue, so a long nightly
+attendance run could hold up ERP sync items and user-visible
+notifications queued behind it. Jobs now go through ``enqueue_job``. It
+puts each job on the queue of its class:
+
+* ``interactive`` - a user is waiting for the result (push notifications,
+  image processing);
+* ``sync`` - ERP Sync Queue items, which should clear within minutes;
+* ``bulk`` - nightly and maintenance jobs that may run for a long time.
+
+A class uses its own queue (``ess_interactive`` / ``ess_sync`` /
+``ess_bulk``) once that queue is declared under ``workers`` in
+common_site_config; until then it falls back to ``short`` / ``default`` /
+``long``. ``get_worker_config`` returns the ``workers`` entry and the
+Procfile lines for the recommended worker counts.
+
+A ``dedupe_key`` keeps one pending job per key: enqueuing again while
+that job is still waiting does nothing. The key is released when the job
+starts, so a change arriving mid-run is picked up by the next job.
+
+Scheduler entry points decorated with ``@routed("bulk")`` only enqueue
+themselves when the scheduler calls them; the work runs on the bulk queue.
+"""
+
+from __future__ import unicode_literals
+
+import inspect
+from functools import wraps
+
+import frappe
+
+JOB_CLASSES = {
+	"interactive": {"queue": "ess_interactive", "fallback": "short", "timeout": 300, "workers": 2},
+	"sync": {"queue": "ess_sync", "fallback": "default", "timeout": 300, "workers": 2},
+	"bulk": {"queue": "ess_bulk", "fallback": "long", "timeout": 3600, "workers": 1},
+}
+DEFAULT_CLASS = "sync"
+
+JOB_ROUTES = {
+	"employee_self_service.send_notification.send_notification": "interactive",
+	"employee_self_service.employee_self_service.utils.image_pipeline.process_image": "interactive",
+	"employee_self_service.employee_self_service.doctype.ess_broadcast.ess_broadcast.send_broadcast_push": "interactive",
+	"employee_self_service.employee_self_service.utils.item_catalogue.incr_catalogue_version": "interactive",
+	"employee_self_service.employee_self_service.utils.erp_sync.process_sync_queue_item": "sync",
+	"employee_self_service.employee_self_service.utils.erp_sync.process_sync_queue_item_employee": "sync",
+	"employee_self_service.employee_self_service.utils.erp_sync.process_sync_queue_item_sales_order": "sync",
+	"employee_self_service.employee_self_service.utils.erp_sync.process_leave_sync_queue": "sync",
+	"employee_self_service.employee_self_service.utils.erp_sync.process_expense_sync_queue": "sync",
+	"employee_self_service.employee_self_service.utils.erp_sync.process_travel_sync_queue": "sync",
+	"employee_self_service.employee_self_service.utils.retention.run_retention": "bulk",
+	"employee_self_service.employee_self_service.utils.rerun_attendance.rerun_attendance_for_period": "bulk",
+	"employee_self_service.employee_self_service.utils.reporting_hierarchy.refresh_hierarchy": "bulk",
+}
+# Not routed: OTPL Payroll ``calculate_payroll`` runs inside the form's
+# request because the form waits for the computed rows to fill its table;
+# it reads with grouped queries and writes nothing, so it does not hold
+# the queues up.
+
+
+def enqueue_job(method, job_class=None, dedupe_key=None, timeout=None, now=False,
+	enqueue_after_commit=False, **kwargs):
+	"""``frappe.enqueue`` onto the queue of ``method``'s class (from
+	``JOB_ROUTES`` unless ``job_class`` is given). Returns ``False`` when a
+	job with the same ``dedupe_key`` is already pending."""
+	if not isinstance(method, str):
+		method = "{0}.{1}".format(method.__module__, method.__name__)
+	if now:
+		# Tests and callers that need the result; no queue involved.
+		return frappe.call(method, **kwargs)
+
+	job_class = job_class or JOB_ROUTES.get(method, DEFAULT_CLASS)
+	config = JOB_CLASSES[job_class]
+	if dedupe_key:
+		dedupe_key = "ess_pending_job:{0}".format(dedupe_key)
+		# SET NX: only the first caller gets to enqueue. Expires with the
+		# job's timeout in case the job is lost before it starts.
+		cache = frappe.cache()
+		if not cache.set(cache.make_key(dedupe_key), 1, nx=True, ex=config["timeout"] * 2):
+			return False
+
+	frappe.enqueue(
+		"employee_self_service.employee_self_service.utils.job_router.run_job",
+		queue=get_queue(job_class),
+		timeout=timeout or config["timeout"],
+		job_name=method,
+		enqueue_after_commit=enqueue_after_commit,
+		job_method=method,
+		dedupe_key=dedupe_key,
+		**kwargs
+	)
+	return True
+
+
+def run_job(job_method, dedupe_key=None, **kwargs):
+	"""Worker side of ``enqueue_job``."""
+	if dedupe_key:
+		frappe.cache().delete_value(dedupe_key)
+	frappe.flags.ess_routed_job = job_method
+	try:
+		return frappe.get_attr(job_method)(**kwargs)
+	finally:
+		frappe.flags.ess_routed_job = None
+
+
+def routed(job_class):
+	"""Decorator for scheduler entry points: called by the scheduler (or
+	anyone else, with keyword arguments only), the job is enqueued on
+	``job_class``'s queue - once, while pending - instead of running.
+	A whitelisted entry point keeps ``@frappe.whitelist()`` above this."""
+	def decorator(fn):
+		name = "{0}.{1}".format(fn.__module__, fn.__name__)
+
+		@wraps(fn)
+		def wrapper(*args, **kwargs):
+			if args or frappe.flags.ess_routed_job == name or frappe.flags.in_test:
+				return fn(*args, **kwargs)
+			dedupe_key = name + "".join(":{0}={1}".format(k, kwargs[k]) for k in sorted(kwargs))
+			enqueue_job(name, job_class=job_class, dedupe_key=dedupe_key, **kwargs)
+
+		# See ``instrumented``: ``frappe.call`` reads the signature.
+		wrapper.__signature__ = inspect.signature(fn)
+		return wrapper
+
+	return decorator
+
+
+def get_queue(job_class):
+	"""The class's own queue when a worker serves it, else its fallback."""
+	config = JOB_CLASSES[job_class]
+	if config["queue"] in (frappe.get_conf().get("workers") or {}):
+		return config["queue"]
+	return config["fallback"]
+
+
+def get_worker_config():
+	"""Recommended ``workers`` entry for common_site_config and the Procfile
+	lines that start them (``bench execute`` this and paste)."""
+	return {
+		"workers": {
+			config["queue"]: {"timeout": config["timeout"]}
+			for config in JOB_CLASSES.values()
+		},
+		"procfile": [
+			"ess_{0}_{1}: bench worker --queue {2}".format(job_class, i + 1, config["queue"])
+			for job_class, config in sorted(JOB_CLASSES.items())
+			for i in range(config["workers"])
+		],
+	}
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026, Nesscale Solutions Private Limited and contributors
+# For license information, please see license.txt
+"""
+Leave balances computed from one read of the leave ledger.
+
+ERPNext's ``get_leave_balance_on`` / ``get_leaves_for_period`` run several
+queries per (employee, leave type), so the leave-type picker, the leave
+balance report and the payroll CL column cost dozens of queries per
+screen (or per employee). ``LeaveLedger.load`` instead reads every
+``Leave Ledger Entry`` the requested employees can need in two queries,
+and the balance maths below mirrors ERPNext's in memory.
+
+Only a Leave Application ledger entry that is clipped by the requested
+period (or is a half day on a clipped range) goes back to ERPNext's
+``get_number_of_leave_days``; an entry inside the period already carries
+its day count in ``leaves``.
+"""
+
+from __future__ import unicode_literals
+
+from collections import defaultdict
+
+import frappe
+from frappe.utils import add_days, date_diff, flt, getdate, nowdate
+
+
+def get_leave_balances(employees, leave_type, date, consider_all_leaves_in_the_allocation_period=False):
+	"""Bulk ``get_leave_balance_on``: ``{employee: balance}`` for
+	``leave_type`` as of ``date``. Employees without an allocation get 0."""
+	employees = [e for e in set(employees or []) if e]
+	if not employees:
+		return {}
+	ledger = LeaveLedger.load(employees, date, leave_types=[leave_type])
+	return {
+		emp: flt(ledger.balance_on(
+			emp, leave_type, date,
+			consider_all_leaves_in_the_allocation_period=consider_all_leaves_in_the_allocation_period,
+		))
+		for emp in employees
+	}
+
+
+class LeaveLedger(object):
+	def __init__(self, entries):
+		self.entries = defaultdict(list)
+		for e in entries:
+			self.entries[(e.employee, e.leave_type)].append(e)
+
+	@classmethod
+	def load(cls, employees, from_date, leave_types=None):
+		"""Ledger entries for ``employees`` that any balance on or after
+		``from_date`` depends on: everything from the start of the earliest
+		allocation running on ``from_date`` onwards."""
+		employees = tuple(set(employees))
+		if not employees:
+			return cls([])
+		from_date = getdate(from_date)
+		conditions = ""
+		params = {"employees": employees, "from_date": from_date}
+		if leave_types:
+			conditions = "AND leave_type IN %(leave_types)s"
+			params["leave_types"] = tuple(leave_types)
+
+		since = frappe.db.sql(
+			"""
+			SELECT MIN(from_date)
+			FROM `tabLeave Ledger Entry`
+			WHERE employee IN %(employees)s
+				AND docstatus=1
+				AND transaction_type='Leave Allocation'
+				AND from_date <= %(from_date)s AND to_date >= %(from_date)s
+				{0}
+			""".format(conditions),
+			params,
+		)[0][0]
+		params["since"] = min(getdate(since), from_date) if since else from_date
+
+		entries = frappe.db.sql(
+			"""
+			SELECT
+				employee, leave_type, from_date, to_date, leaves, transaction_name,
+				transaction_type, holiday_list, is_carry_forward, is_expired, is_lwp
+			FROM `tabLeave Ledger Entry`
+			WHERE employee IN %(employees)s
+				AND docstatus=1
+				AND to_date >= %(since)s
+				{0}
+			""".format(conditions),
+			params,
+			as_dict=True,
+		)
+		return cls(entries)
+
+	def leave_types(self, employee):
+		return sorted({lt for emp, lt in self.entries if emp == employee})
+
+	def balance_on(self, employee, leave_type, date, to_date=None,
+		consider_all_leaves_in_the_allocation_period=False):
+		"""In-memory ``get_leave_balance_on``."""
+		entries = self.entries.get((employee, leave_type), [])
+		date = getdate(date)
+		to_date = getdate(to_date or nowdate())
+
+		allocation = _allocation_on(entries, date)
+		end_date = allocation.to_date if consider_all_leaves_in_the_allocation_period else date
+		expiry = _carry_forward_expiry(entries, date, to_date)
+		leaves_taken = self.leaves_for_period(employee, leave_type, allocation.from_date, end_date)
+		return _remaining_leaves(allocation, leaves_taken, date, expiry)
+
+	def leaves_for_period(self, employee, leave_type, from_date, to_date, do_not_skip_expired_leaves=False):
+		"""In-memory ``get_leaves_for_period`` (deducted leaves, negative)."""
+		if not from_date or not to_date:
+			return 0
+		from_date, to_date = getdate(from_date), getdate(to_date)
+		entries = self.entries.get((employee, leave_type), [])
+		allocation_end = {
+			e.transaction_name: e.to_date for e in entries
+			if e.transaction_type == "Leave Allocation" and not e.is_expired
+		}
+
+		leave_days = 0
+		for e in _overlapping(entries, from_date, to_date):
+			if not (e.leaves < 0 or e.is_expired):
+				continue
+			inclusive = e.from_date >= from_date and e.to_date <= to_date
+
+			if inclusive and e.transaction_type == "Leave Encashment":
+				leave_days += e.leaves
+
+			elif inclusive and e.transaction_type == "Leave Allocation" and e.is_expired:
+				# ERPNext's skip_expiry_leaves: a non carry-forward allocation
+				# expiring exactly on to_date is still usable that day.
+				skip = not e.is_carry_forward and allocation_end.get(e.transaction_name) == to_date
+				if do_not_skip_expired_leaves or not skip:
+					leave_days += e.leaves
+
+			elif e.transaction_type == "Leave Application":
+				if inclusive:
+					leave_days += e.leaves
+				else:
+					leave_days += _clipped_leave_days(employee, leave_type, e, from_date, to_date) * -1
+
+		return leave_days
+
+	def leave_details(self, employee, leave_type, from_date, to_date):
+		"""Opening / allocated / taken / expired / closing for one leave type
+		over ``from_date``..``to_date`` (the Employee Leave Balance report)."""
+		from_date, to_date = getdate(from_date), getdate(to_date)
+		entries = _overlapping(self.entries.get((employee, leave_type), []), from_date, to_date)
+
+		# Leaves Deducted consist of both expired and leaves taken
+		leaves_deducted = self.leaves_for_period(employee, leave_type, from_date, to_date) * -1
+		expired_within_period = sum(e.leaves for e in entries if e.is_expired) * -1
+		leaves_taken = leaves_deducted - expired_within_period
+
+		opening = self.balance_on(employee, leave_type, add_days(from_date, -1))
+
+		today = getdate(nowdate())
+		new_allocation = sum(e.leaves for e in entries if e.leaves > 0 and e.from_date >= from_date)
+		expired_allocation = sum(e.leaves for e in entries if e.leaves > 0 and e.to_date < today)
+
+		# removing leaves taken from expired_allocation
+		expired_leaves = max(expired_allocation - leaves_taken, 0)
+		closing = max(opening + new_allocation - (leaves_taken + expired_leaves), 0)
+		return dict(
+			leaves_allocated=flt(new_allocation),
+			leaves_expired=flt(expired_leaves),
+			opening_balance=flt(opening),
+			leaves_taken=flt(leaves_taken),
+			closing_balance=flt(closing),
+		)
+
+
+def _overlapping(entries, from_date, to_date):
+	return [
+		e for e in entries
+		if from_date <= e.from_date <= to_date
+		or from_date <= e.to_date <= to_date
+		or (e.from_date < from_date and e.to_date > to_date)
+	]
+
+
+def _allocation_on(entries, date):
+	"""ERPNext's ``get_leave_allocation_records`` for one leave type."""
+	allocation = frappe._dict()
+	cf_leaves = new_leaves = 0
+	for e in entries:
+		if (e.transaction_type != "Leave Allocation" or e.is_expired or e.is_lwp
+			or not (e.from_date <= date <= e.to_date)):
+			continue
+		if e.is_carry_forward:
+			cf_leaves += e.leaves
+		else:
+			new_leaves += e.leaves
+		allocation.from_date = min(allocation.from_date or e.from_date, e.from_date)
+		allocation.to_date = max(allocation.to_date or e.to_date, e.to_date)
+
+	if allocation:
+		allocation.update({
+			"total_leaves_allocated": flt(cf_leaves) + flt(new_leaves),
+			"unused_leaves": cf_leaves,
+			"new_leaves_allocated": new_leaves,
+		})
+	return allocation
+
+
+def _carry_forward_expiry(entries, from_date, to_date):
+	for e in entries:
+		if (e.transaction_type == "Leave Allocation" and e.is_carry_forward
+			and from_date <= e.to_date <= to_date):
+			return e.to_date
+
+
+def _remaining_leaves(allocation, leaves_taken, date, expiry):
+	"""ERPNext's ``get_remaining_leaves``."""
+	def _cap(remaining_leaves, end_date):
+		if remaining_leaves > 0:
+			remaining_days = date_diff(end_date, date) + 1
+			remaining_leaves = min(remaining_days, remaining_leaves)
+		return remaining_leaves
+
+	total_leaves = flt(allocation.total_leaves_allocated) + flt(leaves_taken)
+
+	if expiry and allocation.unused_leaves:
+		remaining_leaves = _cap(flt(allocation.unused_leaves) + flt(leaves_taken), expiry)
+		total_leaves = flt(allocation.new_leaves_allocated) + flt(remaining_leaves)
+
+	return _cap(total_leaves, allocation.to_date)
+
+
+def _clipped_leave_days(employee, leave_type, entry, from_date, to_date):
+	from erpnext.hr.doctype.leave_application.leave_application import get_number_of_leave_days
+
+	half_day, half_day_date = 0, None
+	if entry.leaves % 1:
+		half_day = 1
+		half_day_date = frappe.db.get_value("Leave Application", entry.transaction_name, "half_day_date")
+
+	return get_number_of_leave_days(
+		employee, leave_type,
+		max(entry.from_date, from_date), min(entry.to_date, to_date),
+		half_day, half_day_date, holiday_list=entry.holiday_list,
+	)
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026, Nesscale Solutions Private Limited and contributors
+# For license information, please see license.txt
+"""
+Per-day leave occupancy.
+
+"Is this employee on leave on this date?" used to be a range-overlap scan
+of Leave Application (``from_date <= d AND to_date >= d``), which no index
+serves well and which every attendance run, the people-on-leave screen and
+the ERP sync asked once per employee. Leave Occupancy keeps one row per
+employee, date and submitted Leave Application instead, so the question is
+an equality lookup on the indexed ``(date, employee)`` columns.
+
+Rows are rewritten from the Leave Application by its submit / cancel /
+update-after-submit / trash hooks. Every submitted application gets rows,
+whatever its status, so callers filter on ``status`` exactly as they used
+to on the Leave Application. ``rebuild`` backfills the table.
+
+Only Leave Applications are materialized. OTPL half-day and short leaves
+never create one, and payroll needs their half-day period and per-record
+short-leave count, which a per-day row cannot carry. So payroll
+(``_fetch_approved_leaves``) still reads OTPL Leave, once per run, off the
+``(employee, approved_from_date)`` index. The Monthly Attendance Summary
+reads only Attendance.
+"""
+
+from __future__ import unicode_literals
+
+import frappe
+from frappe.utils import add_days, cint, getdate, now
+
+from employee_self_service.employee_self_service.utils.instrumentation import instrumented
+
+REBUILD_BATCH_SIZE = 500
+LEAVE_APPLICATION_FIELDS = [
+	"name", "employee", "employee_name", "leave_type", "from_date", "to_date",
+	"half_day", "half_day_date", "status", "docstatus",
+]
+ROW_COLUMNS = (
+	"name", "creation", "modified", "owner", "modified_by",
+	"employee", "employee_name", "date", "leave_type", "half_day", "status", "leave_application",
+)
+
+
+@instrumented("hook")
+def sync_leave_application(doc, method=None):
+	"""Leave Application hook: replace the application's occupancy rows."""
+	frappe.db.sql("DELETE FROM `tabLeave Occupancy` WHERE leave_application = %s", doc.name)
+	if doc.docstatus == 1 and method != "on_trash":
+		_insert_rows(_occupancy_rows(doc))
+
+
+def rebuild(from_date=None):
+	"""Rebuild the table from submitted Leave Applications (all of them, or
+	those still running on/after ``from_date``). Returns the rows written."""
+	filters = {"docstatus": 1}
+	if from_date:
+		filters["to_date"] = [">=", getdate(from_date)]
+		frappe.db.sql("DELETE FROM `tabLeave Occupancy` WHERE date >= %s", getdate(from_date))
+	else:
+		frappe.db.sql("DELETE FROM `tabLeave Occupancy`")
+
+	written, start = 0, 0
+	while True:
+		applications = frappe.get_all(
+			"Leave Application",
+			filters=filters,
+			fields=LEAVE_APPLICATION_FIELDS,
+			order_by="name asc",
+			limit_start=start,
+			limit_page_length=REBUILD_BATCH_SIZE,
+		)
+		if not applications:
+			break
+		rows = [r for a in applications for r in _occupancy_rows(a) if not from_date or r["date"] >= getdate(from_date)]
+		_insert_rows(rows)
+		written += len(rows)
+		start += REBUILD_BATCH_SIZE
+	return written
+
+
+def get_employees_on_leave(date, employees=None, status="Approved"):
+	"""``{employee: row}`` for everyone on leave on ``date``; each row has
+	``employee``, ``employee_name``, ``leave_type``, ``half_day`` and
+	``leave_application``. ``status=None`` counts any submitted application."""
+	conditions = ""
+	params = {"date": getdate(date)}
+	if employees is not None:
+		if not employees:
+			return {}
+		conditions += " AND employee IN %(employees)s"
+		params["employees"] = tuple(employees)
+	if status:
+		conditions += " AND status = %(status)s"
+		params["status"] = status
+
+	rows = frappe.db.sql(
+		"""
+		SELECT employee, employee_name, leave_type, half_day, leave_application
+		FROM `tabLeave Occupancy`
+		WHERE date = %(date)s {0}
+		ORDER BY employee_name ASC, creation DESC
+		""".format(conditions),
+		params,
+		as_dict=True,
+	)
+	result = {}
+	for row in rows:
+		result.setdefault(row.employee, row)
+	return result
+
+
+def get_leave_application(employee, date, status=None):
+	"""Name of the (most recently synced) submitted Leave Application that
+	covers ``employee`` on ``date``, or ``None``."""
+	conditions = "AND status = %(status)s" if status else ""
+	rows = frappe.db.sql(
+		"""
+		SELECT leave_application
+		FROM `tabLeave Occupancy`
+		WHERE date = %(date)s AND employee = %(employee)s {0}
+		ORDER BY creation DESC
+		LIMIT 1
+		""".format(conditions),
+		{"date": getdate(date), "employee": employee, "status": status},
+	)
+	return rows[0][0] if rows else None
+
+
+def is_on_leave(employee, date, status="Approved"):
+	return bool(get_leave_application(employee, date, status=status))
+
+
+def _occupancy_rows(application):
+	from_date, to_date = getdate(application.from_date), getdate(application.to_date)
+	half_day_date = getdate(application.half_day_date) if application.half_day_date else None
+	rows, date = [], from_date
+	while date <= to_date:
+		half_day = cint(application.half_day) and (
+			date == half_day_date or (not half_day_date and from_date == to_date)
+		)
+		rows.append({
+			"employee": application.employee,
+			"employee_name": application.employee_name,
+			"date": date,
+			"leave_type": application.leave_type,
+			"half_day": 1 if half_day else 0,
+			"status": application.status,
+			"leave_application": application.name,
+		})
+		date = add_days(date, 1)
+	return rows
+
+
+def _insert_rows(rows):
+	if not rows:
+		return
+	timestamp, user = now(), frappe.session.user
+	values = [
+		[frappe.generate_hash(length=10), timestamp, timestamp, user, user]
+		+ [row[c] for c in ROW_COLUMNS[5:]]
+		for row in rows
+	]
+	frappe.db.sql(
+		"""
+		INSERT INTO `tabLeave Occupancy` ({columns})
+		VALUES {rows}
+		""".format(
+			columns=", ".join("`{0}`".format(c) for c in ROW_COLUMNS),
+			rows=", ".join(["(" + ", ".join(["%s"] * len(ROW_COLUMNS)) + ")"] * len(values)),
+		),
+		tuple(v for row in values for v in row),
+	)
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026, Nesscale Solutions Private Limited and contributors
+# For license information, please see license.txt
+"""
+Append-only GPS track storage for Employee Location.
+
+A ping used to load the day's Employee Location with its whole child
+table, append the new points and ``save()`` it - rewriting and
+re-validating every point of the day, so a day of one-minute pings cost
+O(n^2). ``append_points`` instead inserts just the new Employee Location
+Details rows with one multi-row INSERT, so a ping costs the same at 08:00
+and at 20:00.
+
+The map is no longer rebuilt per ping. A ping queues a rebuild of the
+day's map at most once every ``LIVE_REFRESH_INTERVAL`` seconds, so the
+Employee Location form still shows today's route. ``compact_tracks`` runs
+nightly and, for each finished day, builds the GeoJSON LineString
+(``location_map``) and a Douglas-Peucker simplified, Google-encoded
+polyline (``track_polyline``) for the map views.
+"""
+
+from __future__ import unicode_literals
+
+import json
+
+import frappe
+from frappe.utils import add_days, cint, cstr, flt, getdate, now, nowdate
+
+from employee_self_service.employee_self_service.utils.instrumentation import instrumented
+from employee_self_service.employee_self_service.utils.job_router import enqueue_job, routed
+
+# ~5 m at the equator; plenty for a city-scale route preview.
+SIMPLIFY_TOLERANCE = 0.00005
+POINT_COLUMNS = ("latitude", "longitude", "time", "location_list", "location_point")
+LIVE_REFRESH_INTERVAL = 5 * 60  # seconds
+
+
+def append_points(employee, date, points):
+	"""Add ``points`` (dicts with latitude/longitude/time...) to
+	``employee``'s track for ``date``. Returns the Employee Location name."""
+	parent = frappe.db.get_value("Employee Location", {"employee": employee, "date": date}, "name")
+	if not parent:
+		doc = frappe.get_doc(dict(doctype="Employee Location", employee=employee, date=date))
+		doc.insert()
+		parent = doc.name
+
+	points = [p for p in points or [] if isinstance(p, dict)]
+	if not points:
+		return parent
+
+	# Concurrent pings for the same day take turns, so ``idx`` stays unique.
+	frappe.db.sql("SELECT name FROM `tabEmployee Location` WHERE name = %s FOR UPDATE", parent)
+	next_idx = cint(frappe.db.sql(
+		"""
+		SELECT MAX(idx) FROM `tabEmployee Location Details`
+		WHERE parent = %s AND parenttype = 'Employee Location' AND parentfield = 'location'
+		""",
+		parent,
+	)[0][0]) + 1
+
+	timestamp, user = now(), frappe.session.user
+	values = []
+	for offset, point in enumerate(points):
+		values.append(
+			[frappe.generate_hash(length=10), timestamp, timestamp, user, user,
+				parent, "Employee Location", "location", next_idx + offset]
+			+ [_column_value(point.get(c)) for c in POINT_COLUMNS]
+		)
+
+	frappe.db.sql(
+		"""
+		INSERT INTO `tabEmployee Location Details`
+			(name, creation, modified, owner, modified_by,
+			parent, parenttype, parentfield, idx, {columns})
+		VALUES {rows}
+		""".format(
+			columns=", ".join("`{0}`".format(c) for c in POINT_COLUMNS),
+			rows=", ".join(["(" + ", ".join(["%s"] * len(values[0])) + ")"] * len(values)),
+		),
+		tuple(v for row in values for v in row),
+	)
+	frappe.db.set_value("Employee Location", parent, "compacted", 0, update_modified=False)
+	_queue_live_refresh(parent)
+	return parent
+
+
+def _queue_live_refresh(parent):
+	cache = frappe.cache()
+	if cache.set(cache.make_key("ess_track_refresh:" + parent), 1, nx=True, ex=LIVE_REFRESH_INTERVAL):
+		enqueue_job(
+			"employee_self_service.employee_self_service.utils.location_track.compact_track",
+			job_class="interactive",
+			enqueue_after_commit=True,
+			name=parent,
+			final=False,
+		)
+
+
+@routed("bulk")
+@instrumented("job")
+def compact_tracks(date=None):
+	"""Nightly: build map geometry for every finished, not yet compacted day
+	(yesterday and anything older a previous run missed)."""
+	date = getdate(date) if date else add_days(nowdate(), -1)
+	for name in frappe.get_all(
+		"Employee Location",
+		filters={"date": ["<=", date], "compacted": 0},
+		pluck="name",
+	):
+		try:
+			compact_track(name)
+			frappe.db.commit()
+		except Exception:
+			frappe.db.rollback()
+			frappe.log_error(
+				title="Employee Location Compaction Error",
+				message=frappe.get_traceback(),
+			)
+
+
+@frappe.whitelist()
+def rebuild_track(name):
+	"""Form button: compact one (e.g. today's) track on demand."""
+	frappe.has_permission("Employee Location", "write", doc=name, throw=True)
+	compact_track(name)
+
+
+def compact_track(name, final=True):
+	"""Rebuild ``location_map`` and ``track_polyline`` of one Employee
+	Location from its stored points, without re-saving the document.
+	A live refresh (``final=False``) leaves the day for the nightly run,
+	since pings may still arrive."""
+	coordinates = [
+		[flt(lng), flt(lat)]
+		for lat, lng in frappe.db.sql(
+			"""
+			SELECT latitude, longitude FROM `tabEmployee Location Details`
+			WHERE parent = %s AND parenttype = 'Employee Location' AND parentfield = 'location'
+			ORDER BY idx
+			""",
+			name,
+		)
+		if cstr(lat).strip() and cstr(lng).strip()
+	]
+	location_map, polyline = build_track(coordinates)
+	values = {
+		"location_map": location_map,
+		"track_polyline": polyline,
+		"point_count": len(coordinates),
+	}
+	if final:
+		values["compacted"] = 1
+	frappe.db.set_value("Employee Location", name, values, update_modified=False)
+
+
+def build_track(coordinates):
+	"""``(geojson, encoded_polyline)`` for ``[lng, lat]`` pairs."""
+	if not coordinates:
+		return None, None
+	map_json = {
+		"type": "FeatureCollection",
+		"features": [
+			{
+				"type": "Feature",
+				"properties": {},
+				"geometry": {"type": "LineString", "coordinates": coordinates},
+			},
+			{
+				"type": "Feature",
+				"properties": {},
+				"geometry": {"type": "Point", "coordinates": coordinates[0]},
+			},
+		],
+	}
+	return json.dumps(map_json), encode_polyline(simplify(coordinates, SIMPLIFY_TOLERANCE))
+
+
+def simplify(points, tolerance):
+	"""Douglas-Peucker line simplification (iterative, planar)."""
+	if len(points) < 3:
+		return list(points)
+	keep = [False] * len(points)
+	keep[0] = keep[-1] = True
+	stack = [(0, len(points) - 1)]
+	while stack:
+		first, last = stack.pop()
+		max_dist, index = 0.0, None
+		for i in range(first + 1, last):
+			dist = _segment_distance(points[i], points[first], points[last])
+			if dist > max_dist:
+				max_dist, index = dist, i
+		if index is not None and max_dist > tolerance:
+			keep[index] = True
+			stack.append((first, index))
+			stack.append((index, last))
+	return [p for p, k in zip(points, keep) if k]
+
+
+def encode_polyline(coordinates):
+	"""Google encoded polyline (precision 5) of ``[lng, lat]`` pairs."""
+	out, prev_lat, prev_lng = [], 0, 0
+	for lng, lat in coordinates:
+		lat, lng = int(round(lat * 1e5)), int(round(lng * 1e5))
+		for value in (lat - prev_lat, lng - prev_lng):
+			value = ~(value << 1) if value < 0 else value << 1
+			while value >= 0x20:
+				out.append(chr((0x20 | (value & 0x1f)) + 63))
+				value >>= 5
+			out.append(chr(value + 63))
+		prev_lat, prev_lng = lat, lng
+	return "".join(out)
+
+
+def _segment_distance(p, a, b):
+	(x, y), (x1, y1), (x2, y2) = p, a, b
+	dx, dy = x2 - x1, y2 - y1
+	if not dx and not dy:
+		return ((x - x1) ** 2 + (y - y1) ** 2) ** 0.5
+	t = max(0.0, min(1.0, ((x - x1) * dx + (y - y1) * dy) / (dx * dx + dy * dy)))
+	return ((x - x1 - t * dx) ** 2 + (y - y1 - t * dy) ** 2) ** 0.5
+
+
+def _column_value(value):
+	if isinstance(value, (dict, list)):
+		return json.dumps(value)
+	return value
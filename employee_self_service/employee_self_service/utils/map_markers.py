@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026, Nesscale Solutions Private Limited and contributors
+# For license information, please see license.txt
+"""
+Check-in markers for the India map, and the public ``api.locations`` feed
+the map reads from each ERP.
+
+``api.locations`` is guest-accessible and used to rebuild every check-in
+of the day (with ``DATE(ec.time)``, so no index) plus an NTLE subquery on
+each hit; the map then called both ERPs one after the other. Now:
+
+* ``get_local_locations`` builds this site's feed with index-friendly
+  time ranges and caches it per date, so guests read Redis, not MariaDB.
+* ``get_markers`` merges every source - this site in-process, the others
+  over HTTP concurrently with a timeout - and caches the merged payload
+  under a version number.
+* ``refresh_map_markers`` runs every minute and rebuilds today's payload
+  ahead of readers. When markers changed it bumps the version, keeps the
+  delta, and publishes only the added/removed markers on the
+  ``ess_map_markers`` realtime event. Pollers pass their ``version`` to
+  get the same delta instead of the full payload.
+"""
+
+from __future__ import unicode_literals
+
+from concurrent.futures import ThreadPoolExecutor
+
+import frappe
+import requests
+from frappe.utils import add_days, cint, format_datetime, get_url, getdate, nowdate
+
+from employee_self_service.employee_self_service.utils.instrumentation import instrumented
+
+# (label, base URL) of every ERP shown on the map.
+MARKER_SOURCES = (
+	("Oberoi", "https://erp.oberoithermit.com"),
+	("Tranzrail", "https://erp.tranzrail.co.in"),
+)
+LOCATIONS_METHOD = "/api/method/employee_self_service.api.locations"
+REMOTE_TIMEOUT = 10  # seconds, per source
+TODAY_CACHE_TTL = 3 * 60  # seconds; the refresher rewrites it every minute
+PAST_CACHE_TTL = 30 * 60  # seconds; past days rarely change
+
+
+def get_local_locations(date=None):
+	"""This site's check-ins, active employees and NTLE count for ``date``
+	(the ``api.locations`` payload), cached per date."""
+	date = getdate(date or nowdate())
+	key = "ess_map_locations:{0}".format(date)
+	payload = frappe.cache().get_value(key)
+	if payload is None:
+		payload = build_local_locations(date)
+		frappe.cache().set_value(key, payload, expires_in_sec=_ttl(date))
+	return payload
+
+
+def build_local_locations(date):
+	params = {"day_start": getdate(date), "day_end": add_days(getdate(date), 1)}
+	checkins = frappe.db.sql(
+		"""
+		SELECT
+			ec.employee, ec.employee_name, ec.time, ec.location, ec.address,
+			ec.business_vertical, ec.sales_order, ec.log_type, emp.company
+		FROM `tabEmployee Checkin` ec
+		LEFT JOIN `tabEmployee` emp ON emp.name = ec.employee
+		WHERE ec.time >= %(day_start)s AND ec.time < %(day_end)s
+			AND ec.location IS NOT NULL
+			AND ec.location != ''
+			AND IFNULL(ec.rejected, 0) = 0
+		ORDER BY ec.time DESC
+		""",
+		params,
+		as_dict=True,
+	)
+	records = [
+		{
+			"employee": row.employee or "",
+			"employee_name": row.employee_name or "",
+			"location": row.location or "",
+			"time": format_datetime(row.time, "hh:mm a") if row.time else "",
+			"company": row.company or "",
+			"address": row.address or "",
+			"business_vertical": row.business_vertical or "",
+			"sales_order": row.sales_order or "",
+			"log_type": row.log_type or "",
+		}
+		for row in checkins
+	]
+
+	employee_list = [
+		{
+			"employee": emp.employee,
+			"employee_name": emp.employee_name or "",
+			"company": emp.company or "",
+		}
+		for emp in frappe.db.sql(
+			"""
+			SELECT name AS employee, employee_name, company
+			FROM `tabEmployee`
+			WHERE status = 'Active'
+			ORDER BY employee_name
+			""",
+			as_dict=True,
+		)
+	]
+
+	# Employees with an NTLE but no IN check-in that day.
+	ntle_count = frappe.db.sql(
+		"""
+		SELECT COUNT(DISTINCT ntle.employee)
+		FROM `tabNo Team Leader Error` ntle
+		WHERE ntle.datetime >= %(day_start)s AND ntle.datetime < %(day_end)s
+			AND NOT EXISTS (
+				SELECT 1 FROM `tabEmployee Checkin` ec
+				WHERE ec.employee = ntle.employee
+					AND ec.time >= %(day_start)s AND ec.time < %(day_end)s
+					AND ec.log_type = 'IN'
+			)
+		""",
+		params,
+	)[0][0] or 0
+
+	return {
+		"records": records,
+		"total_active_employees": len(employee_list),
+		"employee_list": employee_list,
+		"ntle_count": ntle_count,
+	}
+
+
+def get_markers(date=None, version=None):
+	"""The merged map payload for ``date``. With the caller's ``version``
+	one behind the current one, only ``{"version", "delta"}`` is returned."""
+	date = getdate(date or nowdate())
+	state = frappe.cache().get_value(_markers_key(date))
+	if state is None:
+		state = _store(date, _build_markers(date), previous=None)
+
+	if version is not None and cint(version) == state["version"] - 1 and state.get("delta"):
+		return {"version": state["version"], "delta": state["delta"]}
+	return dict(state["payload"], version=state["version"])
+
+
+@instrumented("job")
+def refresh_map_markers():
+	"""Scheduled every minute: rebuild today's feed and map payload, and
+	push the changed markers to open maps."""
+	date = getdate(nowdate())
+	frappe.cache().set_value(
+		"ess_map_locations:{0}".format(date),
+		build_local_locations(date),
+		expires_in_sec=TODAY_CACHE_TTL,
+	)
+	state = _store(date, _build_markers(date), previous=frappe.cache().get_value(_markers_key(date)))
+	if state.get("delta") and state.get("changed_now"):
+		frappe.publish_realtime(
+			"ess_map_markers",
+			{"date": str(date), "version": state["version"], "delta": state["delta"]},
+		)
+
+
+def _store(date, payload, previous):
+	version, delta, changed_now = 1, None, True
+	if previous:
+		delta = _diff(previous["payload"], payload)
+		changed_now = bool(delta)
+		if changed_now:
+			version = previous["version"] + 1
+		else:
+			version, delta = previous["version"], previous.get("delta")
+	state = {"payload": payload, "version": version, "delta": delta}
+	frappe.cache().set_value(_markers_key(date), state, expires_in_sec=_ttl(date))
+	state["changed_now"] = changed_now
+	return state
+
+
+def _diff(old, new):
+	old_markers = {_marker_key(m): m for m in old.get("markers", [])}
+	new_markers = {_marker_key(m): m for m in new.get("markers", [])}
+	added = [m for k, m in new_markers.items() if k not in old_markers]
+	removed = [m for k, m in old_markers.items() if k not in new_markers]
+	totals_changed = any(
+		old.get(f) != new.get(f)
+		for f in ("total_active_employees", "ntle_oberoi", "ntle_tranzrail")
+	)
+	if not added and not removed and not totals_changed:
+		return None
+	return {
+		"added": added,
+		"removed": removed,
+		"total_active_employees": new.get("total_active_employees"),
+		"ntle_oberoi": new.get("ntle_oberoi"),
+		"ntle_tranzrail": new.get("ntle_tranzrail"),
+	}
+
+
+def _build_markers(date):
+	"""Fetch every source (remote ones concurrently) and merge them."""
+	local_host = _host(get_url())
+	remote = [(label, url) for label, url in MARKER_SOURCES if _host(url) != local_host]
+
+	# Worker threads only do HTTP; no frappe.db / frappe.local access there.
+	def fetch(source):
+		label, url = source
+		try:
+			response = requests.get(url + LOCATIONS_METHOD, params={"date": str(date)}, timeout=REMOTE_TIMEOUT)
+			response.raise_for_status()
+			return label, response.json().get("message", {}), None
+		except Exception as e:
+			return label, None, "{0}: {1!r}".format(url, e)
+
+	results = []
+	with ThreadPoolExecutor(max_workers=max(len(remote), 1)) as pool:
+		futures = [pool.submit(fetch, source) for source in remote]
+		for label, url in MARKER_SOURCES:
+			if _host(url) == local_host:
+				results.append((label, get_local_locations(date), None))
+		results.extend(f.result() for f in futures)
+
+	payload = {
+		"markers": [],
+		"total_active_employees": 0,
+		"employee_list": [],
+		"ntle_oberoi": 0,
+		"ntle_tranzrail": 0,
+	}
+	for label, message, error in sorted(results, key=lambda r: [s[0] for s in MARKER_SOURCES].index(r[0])):
+		if error:
+			frappe.log_error(title="India Map - Failed to fetch from {0}".format(label), message=error)
+			continue
+		_merge_source(payload, label, message)
+
+	# The People Directory already holds every ERP's employees; prefer it
+	# over the per-server lists once it has been filled.
+	from employee_self_service.employee_self_service.utils.people_directory import get_active_people
+
+	directory = get_active_people()
+	if directory:
+		payload["employee_list"] = [
+			{
+				"employee": emp.employee,
+				"employee_name": emp.employee_name or "",
+				"company": emp.company or "",
+			}
+			for emp in directory
+		]
+		payload["total_active_employees"] = len(payload["employee_list"])
+	return payload
+
+
+def _merge_source(payload, label, message):
+	# Support old format (plain list) and new format (dict with metadata)
+	if isinstance(message, list):
+		records, emp_list = message, []
+	else:
+		message = message or {}
+		records = message.get("records", message.get("checkins", []))
+		emp_list = message.get("employee_list", [])
+		payload["total_active_employees"] += cint(message.get("total_active_employees"))
+		payload["ntle_oberoi" if label == "Oberoi" else "ntle_tranzrail"] = cint(message.get("ntle_count"))
+
+	for emp in emp_list:
+		payload["employee_list"].append({
+			"employee": emp.get("employee", ""),
+			"employee_name": emp.get("employee_name", ""),
+			"company": emp.get("company", label),
+		})
+
+	for record in records:
+		location = record.get("location", "")
+		if not location or "," not in location:
+			continue
+		parts = location.split(",")
+		try:
+			lat = float(parts[0].strip())
+			lng = float(parts[1].strip())
+		except (ValueError, IndexError):
+			continue
+		payload["markers"].append({
+			"latitude": lat,
+			"longitude": lng,
+			"employee": record.get("employee", ""),
+			"employee_name": record.get("employee_name", ""),
+			"time": record.get("time", ""),
+			"source": label,
+			"company": record.get("company", label),
+			"address": record.get("address", ""),
+			"business_vertical": record.get("business_vertical", ""),
+			"sales_order": record.get("sales_order", ""),
+			"log_type": record.get("log_type", ""),
+		})
+
+
+def _marker_key(marker):
+	return "{0}|{1}|{2}|{3}|{4},{5}".format(
+		marker.get("source"), marker.get("employee"), marker.get("time"),
+		marker.get("log_type"), marker.get("latitude"), marker.get("longitude"),
+	)
+
+
+def _host(url):
+	return url.split("://", 1)[-1].split("/", 1)[0].lower()
+
+
+def _markers_key(date):
+	return "ess_map_markers:{0}".format(date)
+
+
+def _ttl(date):
+	return TODAY_CACHE_TTL if getdate(date) >= getdate(nowdate()) else PAST_CACHE_TTL
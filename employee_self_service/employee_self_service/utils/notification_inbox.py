@@ -0,0 +1,343 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026, Nesscale Solutions Private Limited and contributors
+# For license information, please see license.txt
+"""
+Notification inbox: a user's ESS Notification Logs plus every ESS
+Broadcast.
+
+Pages are read with a keyset cursor on ``(creation, name)`` so they ride
+the ``(recipient, creation)`` index instead of OFFSET scans. Each user's
+unread count is kept as a Redis counter: it is built from one indexed
+COUNT on first use and afterwards adjusted by the ESS Notification Log
+hooks and ``mark_read``, so the "anything unread?" check on app start
+needs no query at all.
+
+An announcement to everyone is stored once, as an ESS Broadcast,
+instead of one log row (and one push request) per device. Its push goes
+out in the background, to the device tokens in batches or, with
+``push_broadcasts_to_topic`` set, to the site's broadcast topic. The inbox merges broadcasts created since the
+user was created into the personal items. Broadcast items are named
+``b:<broadcast>``. Reading one writes an ESS Broadcast Read marker for
+that user, so markers exist only for broadcasts a user has read. Unread
+broadcasts are a site-wide Redis count of broadcasts minus a per-user
+Redis count of broadcasts read or older than the user.
+"""
+
+from __future__ import unicode_literals
+
+from functools import partial
+
+import frappe
+from frappe.utils import cint, cstr, get_datetime
+
+INBOX_PAGE_LENGTH = 20
+INBOX_MAX_PAGE_LENGTH = 100
+
+INBOX_FIELDS = """
+	name, notification_name AS title, subject, message, creation, `read`,
+	document_type, reference_document, reference_name
+"""
+BROADCAST_PREFIX = "b:"
+# Personal names are integers; pad them so that they sort as text against
+# broadcast keys on equal ``creation``.
+SORT_KEY_WIDTH = 20
+# Unread counters expire, so any drift from a missed hook heals on rebuild.
+COUNTER_TTL = 6 * 60 * 60
+
+
+def get_inbox(user, cursor=None, page_length=INBOX_PAGE_LENGTH):
+	"""One page of ``user``'s notifications and broadcasts, newest first.
+
+	Returns ``(rows, next_cursor)``; ``next_cursor`` is ``None`` on the
+	last page.
+	"""
+	page_length = min(cint(page_length) or INBOX_PAGE_LENGTH, INBOX_MAX_PAGE_LENGTH)
+	personal_conditions = broadcast_conditions = ""
+	params = {"user": user, "since": _get_user_since(user), "limit": page_length + 1}
+	if cursor:
+		creation, sort_key = _parse_cursor(cursor)
+		personal_conditions = (
+			"AND (creation < %(creation)s OR (creation = %(creation)s"
+			" AND LPAD(name, {0}, '0') < %(sort_key)s))".format(SORT_KEY_WIDTH)
+		)
+		broadcast_conditions = (
+			"AND (b.creation < %(creation)s OR (b.creation = %(creation)s"
+			" AND CONCAT(%(prefix)s, b.name) < %(sort_key)s))"
+		)
+		params.update(creation=creation, sort_key=sort_key)
+	params["prefix"] = BROADCAST_PREFIX
+
+	# Each side is limited on its own index first; the merge sorts at most
+	# 2 * (page_length + 1) rows.
+	rows = frappe.db.sql(
+		"""
+		SELECT * FROM (
+			(
+				SELECT {fields}, 0 AS is_broadcast,
+					LPAD(name, {width}, '0') AS sort_key
+				FROM `tabESS Notification Log`
+				WHERE recipient = %(user)s
+					{personal_conditions}
+				ORDER BY creation DESC, name DESC
+				LIMIT %(limit)s
+			)
+			UNION ALL
+			(
+				SELECT CONCAT(%(prefix)s, b.name) AS name, b.subject AS title, b.subject,
+					b.message, b.creation, IF(r.name IS NULL, 0, 1) AS `read`,
+					b.document_type, b.reference_document, b.reference_name,
+					1 AS is_broadcast, CONCAT(%(prefix)s, b.name) AS sort_key
+				FROM `tabESS Broadcast` b
+				LEFT JOIN `tabESS Broadcast Read` r
+					ON r.broadcast = b.name AND r.user = %(user)s
+				WHERE b.creation >= %(since)s
+					{broadcast_conditions}
+				ORDER BY b.creation DESC, b.name DESC
+				LIMIT %(limit)s
+			)
+		) items
+		ORDER BY creation DESC, sort_key DESC
+		LIMIT %(limit)s
+		""".format(
+			fields=INBOX_FIELDS,
+			width=SORT_KEY_WIDTH,
+			personal_conditions=personal_conditions,
+			broadcast_conditions=broadcast_conditions,
+		),
+		params,
+		as_dict=True,
+	)
+
+	next_cursor = None
+	if len(rows) > page_length:
+		rows = rows[:page_length]
+		next_cursor = "{0}|{1}".format(rows[-1].creation, rows[-1].sort_key)
+	for row in rows:
+		row.pop("sort_key")
+		if not row.is_broadcast:
+			# UNION makes the column text; keep personal names numeric.
+			row.name = cint(row.name)
+	return rows, next_cursor
+
+
+def mark_read(user, names=None):
+	"""Mark ``names`` (or every unread notification and broadcast) of
+	``user`` as read. Returns the number of items that changed."""
+	personal = broadcasts = None
+	if names is not None:
+		personal = [cint(n) for n in names if not is_broadcast(n) and cint(n)]
+		broadcasts = [cstr(n)[len(BROADCAST_PREFIX):] for n in names if is_broadcast(n)]
+		if not personal and not broadcasts:
+			return 0
+
+	changed = 0
+	if personal is None or personal:
+		changed += _mark_personal_read(user, personal)
+	if broadcasts is None or broadcasts:
+		changed += _mark_broadcasts_read(user, broadcasts)
+	return changed
+
+
+def _mark_personal_read(user, names=None):
+	conditions = ""
+	params = {"user": user}
+	if names is not None:
+		conditions = "AND name IN %(names)s"
+		params["names"] = tuple(names)
+
+	frappe.db.sql(
+		"""
+		UPDATE `tabESS Notification Log`
+		SET `read` = 1, modified = NOW(), modified_by = %(user)s
+		WHERE recipient = %(user)s
+			AND `read` = 0
+			{0}
+		""".format(conditions),
+		params,
+	)
+	changed = frappe.db.sql("SELECT ROW_COUNT()")[0][0]
+
+	if names is None:
+		# Rebuilt from the table on the next read, after this commits.
+		_after_commit(frappe.cache().delete, _unread_key(user))
+	elif changed:
+		adjust_unread_count(user, -changed)
+	return changed
+
+
+def _mark_broadcasts_read(user, names=None):
+	"""Write read markers for ``names`` (or every visible broadcast) that
+	``user`` has not read yet, with one INSERT ... SELECT."""
+	conditions = ""
+	params = {"user": user, "since": _get_user_since(user)}
+	if names is not None:
+		conditions = "AND b.name IN %(names)s"
+		params["names"] = tuple(names)
+
+	frappe.db.sql(
+		"""
+		INSERT IGNORE INTO `tabESS Broadcast Read`
+			(name, creation, modified, owner, modified_by, docstatus, idx, broadcast, user)
+		SELECT CONCAT(b.name, '-', %(user)s), NOW(), NOW(), %(user)s, %(user)s, 0, 0, b.name, %(user)s
+		FROM `tabESS Broadcast` b
+		LEFT JOIN `tabESS Broadcast Read` r
+			ON r.broadcast = b.name AND r.user = %(user)s
+		WHERE b.creation >= %(since)s
+			AND r.name IS NULL
+			{0}
+		""".format(conditions),
+		params,
+	)
+	changed = frappe.db.sql("SELECT ROW_COUNT()")[0][0]
+	if changed:
+		_after_commit(_incr_counter, _broadcast_seen_key(user), changed)
+	return changed
+
+
+def get_unread_count(user):
+	return _get_personal_unread_count(user) + get_unread_broadcast_count(user)
+
+
+def _get_personal_unread_count(user):
+	cache = frappe.cache()
+	key = _unread_key(user)
+	count = cache.get(key)
+	if count is not None:
+		return cint(count)
+
+	count = frappe.db.sql(
+		"""
+		SELECT COUNT(*)
+		FROM `tabESS Notification Log`
+		WHERE recipient = %s AND `read` = 0
+		""",
+		user,
+	)[0][0]
+	# nx: don't clobber a counter a concurrent writer has just created.
+	cache.set(key, count, nx=True, ex=COUNTER_TTL)
+	return cint(cache.get(key))
+
+
+def adjust_unread_count(user, delta):
+	"""Move ``user``'s unread counter by ``delta`` once the transaction
+	commits. A missing counter is left missing - the next
+	``get_unread_count`` builds it from the table."""
+	if not user or not delta:
+		return
+	_after_commit(_incr_counter, _unread_key(user), delta)
+
+
+def get_unread_broadcast_count(user):
+	"""Broadcasts ``user`` has not read: all broadcasts minus those read or
+	created before the user. Both sides are Redis counters, built with
+	one indexed COUNT each when missing."""
+	total = _get_counter(
+		_broadcast_total_key(),
+		lambda: frappe.db.sql("SELECT COUNT(*) FROM `tabESS Broadcast`")[0][0],
+	)
+	seen = _get_counter(
+		_broadcast_seen_key(user),
+		lambda: frappe.db.sql(
+			"SELECT COUNT(*) FROM `tabESS Broadcast` WHERE creation < %s",
+			_get_user_since(user),
+		)[0][0] + frappe.db.sql(
+			"SELECT COUNT(*) FROM `tabESS Broadcast Read` WHERE user = %s",
+			user,
+		)[0][0],
+	)
+	return max(total - seen, 0)
+
+
+def on_broadcast_insert():
+	"""ESS Broadcast after_insert: count it for every user at once."""
+	_after_commit(_incr_counter, _broadcast_total_key(), 1)
+
+
+def on_broadcast_delete():
+	"""ESS Broadcast on_trash: a deleted broadcast may already be counted
+	as read or as older than some users, so start every counter over."""
+	frappe.cache().incr(_broadcast_generation_key())
+
+
+def get_broadcast_topic():
+	"""Push topic every device of this site subscribes to."""
+	return frappe.conf.get("ess_broadcast_topic") or "ess-broadcast-{0}".format(
+		frappe.scrub(frappe.local.site)
+	)
+
+
+def reset_unread_count(user):
+	"""Forget ``user``'s counter; it is rebuilt on the next read."""
+	frappe.cache().delete(_unread_key(user))
+
+
+def _get_counter(key, build):
+	cache = frappe.cache()
+	count = cache.get(key)
+	if count is None:
+		# nx: don't clobber a counter a concurrent writer has just created.
+		cache.set(key, cint(build()), nx=True, ex=COUNTER_TTL)
+		count = cache.get(key)
+	return cint(count)
+
+
+def _incr_counter(key, delta):
+	"""INCRBY an existing counter; ``key`` is already prefixed, so this
+	uses the raw ``get`` (``RedisWrapper.exists`` would prefix it again)."""
+	cache = frappe.cache()
+	if cache.get(key) is None:
+		return
+	value = cache.incrby(key, delta)
+	# ttl -1: the counter expired between GET and INCRBY and was recreated
+	# from zero, without an expiry. Drop it so the next read rebuilds it.
+	if value < 0 or cache.ttl(key) == -1:
+		cache.delete(key)
+
+
+def _after_commit(fn, *args):
+	"""Counters move only once the change is committed; a rolled-back
+	write leaves them alone."""
+	frappe.db.after_commit.add(partial(fn, *args))
+
+
+def _get_user_since(user):
+	"""Users see broadcasts created after they were."""
+	return frappe.get_cached_value("User", user, "creation") or get_datetime("2000-01-01")
+
+
+def is_broadcast(name):
+	return cstr(name).startswith(BROADCAST_PREFIX)
+
+
+def _broadcast_total_key():
+	return frappe.cache().make_key("ess_broadcasts:{0}:total".format(_broadcast_generation()))
+
+
+def _broadcast_seen_key(user):
+	return frappe.cache().make_key("ess_broadcasts:{0}:seen:{1}".format(_broadcast_generation(), user))
+
+
+def _broadcast_generation():
+	return cint(frappe.cache().get(_broadcast_generation_key()))
+
+
+def _broadcast_generation_key():
+	return frappe.cache().make_key("ess_broadcasts:generation")
+
+
+def _unread_key(user):
+	# Raw Redis integer (not a pickled set_value) so INCRBY works on it.
+	return frappe.cache().make_key("ess_unread_notifications:{0}".format(user))
+
+
+def _parse_cursor(cursor):
+	"""``(creation, sort_key)``; cursors issued before broadcasts carry a
+	bare integer name."""
+	creation, _, name = cstr(cursor).partition("|")
+	try:
+		creation = get_datetime(creation)
+	except Exception:
+		frappe.throw(frappe._("Invalid cursor"))
+	if not is_broadcast(name):
+		name = cstr(cint(name)).zfill(SORT_KEY_WIDTH)
+	return creation, name
@@ -3,8 +3,12 @@ import json
 import math
 import requests
 from frappe import _
+from employee_self_service.employee_self_service.utils.instrumentation import instrumented
+from employee_self_service.employee_self_service.utils.job_router import enqueue_job
+from employee_self_service.employee_self_service.utils.people_directory import get_person_name
 
 
+@instrumented("hook")
 def after_employee_checkin_insert(doc, method):
     # Validate Worker check-in/check-out with time adjustments
     from employee_self_service.employee_self_service.utils.worker_attendance import validate_worker_checkin
@@ -138,14 +142,10 @@ def sync_leader_location_to_remote(checkin_doc):
             queue_doc.insert(ignore_permissions=True)
             frappe.db.commit()
 
-            # Enqueue the sync job - immediate execution
-            frappe.enqueue(
+            # Sync class: the check-in request no longer waits on the remote
+            enqueue_job(
                 "employee_self_service.employee_self_service.utils.erp_sync.process_sync_queue_item",
-                queue="default",
-                timeout=300,
                 queue_name=queue_doc.name,
-                is_async=True,
-                now=True,  # Execute immediately
             )
 
     except Exception as e:
@@ -349,10 +349,10 @@ def fetch_employee_details(doc):
 
     if employee_details.external_reporting_manager:
         doc.reports_to = employee_details.external_report_to
-        doc.reports_to_name = frappe.db.get_value("Employee Pull", employee_details.external_report_to, "employee_name")
+        doc.reports_to_name = get_person_name(employee_details.external_report_to)
     else:
         doc.reports_to = employee_details.reports_to
-        doc.reports_to_name = frappe.db.get_value("Employee", employee_details.reports_to, "employee_name")
+        doc.reports_to_name = get_person_name(employee_details.reports_to)
     doc.team_leader = employee_details.is_team_leader
 
     doc.employee_location = employee_details.location
@@ -421,6 +421,7 @@ def get_address_from_lat_long(lat, lon):
 
     return None
 
+@instrumented("hook")
 def validate(doc,method):
     emp = frappe.db.get_value(
         "Employee",
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026, Nesscale Solutions Private Limited and contributors
+# For license information, please see license.txt
+"""
+People Directory: every employee of this site and of each connected ERP.
+
+Screens that show "who is this" for a manager, approver or leader used to
+ask Employee Pull (team leaders / managers only), Employee or a remote ERP
+one row at a time. The directory holds one row per employee across all
+ERPs, named ``<employee>-<company>`` like Employee Pull, so an
+``external_report_to`` value and a local Employee ID both resolve with one
+indexed lookup (``get_people``).
+
+``refresh_people_directory`` runs every 15 minutes. Each source (this
+site, and every ERP Sync Settings with employee sync on) is pulled
+incrementally: only employees modified since the newest ``source_modified``
+already stored for that source. A source is written in one transaction, so
+a failed pull leaves its watermark where it was and the next run retries.
+Employees deleted at the source are not removed; their ``status`` still
+tracks Left.
+"""
+
+from __future__ import unicode_literals
+
+import frappe
+from frappe.utils import cint, cstr, get_datetime
+
+from employee_self_service.employee_self_service.utils.instrumentation import instrumented
+
+LOCAL_SOURCE = ""
+DIRECTORY_FIELDS = (
+	"employee", "employee_name", "company", "designation", "department", "image",
+	"status", "cell_number", "is_team_leader", "reports_to", "external_reports_to",
+)
+
+
+def get_people(ids):
+	"""``{id: row}`` for ``ids`` that are directory names
+	(``<employee>-<company>``, i.e. Employee Pull names) or this site's
+	Employee IDs. IDs the directory does not have yet are read from
+	Employee / Employee Pull; IDs found nowhere are left out."""
+	ids = list({key for key in ids or [] if key})
+	if not ids:
+		return {}
+	rows = frappe.db.sql(
+		"""
+		SELECT name, source, {fields}
+		FROM `tabPeople Directory`
+		WHERE name IN %(ids)s
+			OR (employee IN %(ids)s AND source = %(local)s)
+		""".format(fields=", ".join("`{0}`".format(f) for f in DIRECTORY_FIELDS)),
+		{"ids": tuple(ids), "local": LOCAL_SOURCE},
+		as_dict=True,
+	)
+	people = {}
+	for row in rows:
+		if row.source == LOCAL_SOURCE and row.employee in ids:
+			people[row.employee] = row
+	for row in rows:
+		if row.name in ids:
+			people[row.name] = row
+
+	missing = [key for key in ids if key not in people]
+	if missing:
+		people.update(_get_people_from_source_doctypes(missing))
+	return people
+
+
+def get_person(key):
+	return get_people([key]).get(key) if key else None
+
+
+def get_person_name(key):
+	"""Display name for ``key``, falling back to the key itself."""
+	person = get_person(key)
+	return (person and person.employee_name) or key
+
+
+def get_active_people():
+	"""``[{employee, employee_name, company}]`` of every active employee
+	across all sources, by name."""
+	return frappe.db.sql(
+		"""
+		SELECT employee, employee_name, company
+		FROM `tabPeople Directory`
+		WHERE status = 'Active'
+		ORDER BY employee_name
+		""",
+		as_dict=True,
+	)
+
+
+def get_people_for_source(source, employees):
+	"""``{employee: row}`` for employee IDs of one ``source`` (an ERP URL as
+	stored in ``source_erp`` on the *Pull doctypes; empty for this site)."""
+	employees = list({e for e in employees or [] if e})
+	if not employees:
+		return {}
+	return {
+		row.employee: row
+		for row in frappe.db.sql(
+			"""
+			SELECT name, source, {fields}
+			FROM `tabPeople Directory`
+			WHERE employee IN %(employees)s AND source = %(source)s
+			""".format(fields=", ".join("`{0}`".format(f) for f in DIRECTORY_FIELDS)),
+			{"employees": tuple(employees), "source": source or LOCAL_SOURCE},
+			as_dict=True,
+		)
+	}
+
+
+def attach_people(rows, fields=("designation", "image"), employee_key="employee", source_key="source_erp"):
+	"""Copy directory ``fields`` onto each row of ``rows`` in place. A row's
+	employee belongs to its ``source_key`` ERP, or to this site when unset.
+	One query per distinct source."""
+	by_source = {}
+	for row in rows:
+		by_source.setdefault(row.get(source_key) or LOCAL_SOURCE, set()).add(row.get(employee_key))
+	people = {
+		source: get_people_for_source(source, employees)
+		for source, employees in by_source.items()
+	}
+	for row in rows:
+		person = people[row.get(source_key) or LOCAL_SOURCE].get(row.get(employee_key)) or {}
+		for field in fields:
+			row[field] = person.get(field)
+	return rows
+
+
+def get_directory_changes(modified_since=None, limit_start=0, limit_page_length=None):
+	"""This site's employees modified at or after ``modified_since``, in the
+	directory's row format. Ordered by name so paging stays stable while
+	employees are edited: an edit can only repeat a row, never skip one."""
+	conditions, params = "", {}
+	if modified_since:
+		conditions = "WHERE modified >= %(since)s"
+		params["since"] = get_datetime(modified_since)
+	limit_start, limit_page_length = cint(limit_start), cint(limit_page_length)
+	employees = frappe.db.sql(
+		"""
+		SELECT name, employee_name, company, designation, department, image, status,
+			cell_number, is_team_leader, reports_to, external_report_to, modified
+		FROM `tabEmployee`
+		{conditions}
+		ORDER BY name
+		{limit}
+		""".format(
+			conditions=conditions,
+			limit="LIMIT {0}, {1}".format(limit_start, limit_page_length) if limit_page_length else "",
+		),
+		params,
+		as_dict=True,
+	)
+	return [
+		{
+			"employee": emp.name,
+			"employee_name": emp.employee_name,
+			"company": emp.company,
+			"designation": emp.designation,
+			"department": emp.department,
+			"image": emp.image,
+			"status": emp.status,
+			"cell_number": emp.cell_number,
+			"is_team_leader": cint(emp.is_team_leader),
+			"reports_to": emp.reports_to,
+			"external_reports_to": emp.external_report_to,
+			"source_modified": str(emp.modified),
+		}
+		for emp in employees
+	]
+
+
+@instrumented("job")
+def refresh_people_directory():
+	"""Scheduled: pull changed employees from this site and every ERP."""
+	_refresh_source(LOCAL_SOURCE, lambda since: [get_directory_changes(since)])
+
+	from employee_self_service.employee_self_service.utils.erp_sync import _fetch_remote_pages
+
+	for settings in frappe.get_all(
+		"ERP Sync Settings", filters={"enabled": 1, "sync_employee": 1}, pluck="name"
+	):
+		settings = frappe.get_doc("ERP Sync Settings", settings)
+		_refresh_source(
+			settings.erp_url,
+			lambda since: _fetch_remote_pages(
+				settings, "get_directory_for_sync", params={"modified_since": since}
+			),
+		)
+
+
+def _refresh_source(source, fetch_pages):
+	"""Upsert ``source``'s changes since its watermark; all or nothing."""
+	from employee_self_service.employee_self_service.utils.erp_sync import _bulk_upsert
+
+	since = frappe.db.sql(
+		"SELECT MAX(source_modified) FROM `tabPeople Directory` WHERE source = %s",
+		source,
+	)[0][0]
+	try:
+		for page in fetch_pages(str(since) if since else None):
+			_bulk_upsert("People Directory", [_directory_row(source, r) for r in page])
+		frappe.db.commit()
+	except Exception:
+		frappe.db.rollback()
+		frappe.log_error(
+			title="People Directory refresh failed for {0}".format(source or "this site"),
+			message=frappe.get_traceback(),
+		)
+
+
+def _directory_row(source, row):
+	values = {f: row.get(f) for f in DIRECTORY_FIELDS}
+	values["is_team_leader"] = cint(values["is_team_leader"])
+	if source and cstr(values["image"]).startswith("/"):
+		# Remote file URLs are relative to the remote site.
+		values["image"] = source.rstrip("/") + values["image"]
+	values["name"] = "{0}-{1}".format(row.get("employee"), row.get("company"))
+	values["source"] = source
+	values["source_modified"] = row.get("source_modified")
+	return values
+
+
+def _get_people_from_source_doctypes(ids):
+	"""Directory misses (before the first refresh, employees added since the
+	last one, remotes without ``get_directory_for_sync``) read from Employee
+	and Employee Pull, as lookups did before the directory existed."""
+	people = {}
+	for emp in frappe.get_all(
+		"Employee",
+		filters={"name": ["in", ids]},
+		fields=[
+			"name", "employee_name", "company", "designation", "department", "image", "status",
+			"cell_number", "is_team_leader", "reports_to", "external_report_to",
+		],
+	):
+		people[emp.name] = frappe._dict({f: emp.get(f) for f in DIRECTORY_FIELDS})
+		people[emp.name].update({
+			"name": "{0}-{1}".format(emp.name, emp.company),
+			"source": LOCAL_SOURCE,
+			"employee": emp.name,
+			"external_reports_to": emp.external_report_to,
+		})
+
+	missing = [key for key in ids if key not in people]
+	if missing:
+		for pull in frappe.get_all(
+			"Employee Pull",
+			filters={"name": ["in", missing]},
+			fields=[
+				"name", "employee", "employee_name", "company", "mobile_no", "is_team_leader",
+				"reports_to", "external_reports_to",
+			],
+		):
+			people[pull.name] = frappe._dict({f: pull.get(f) for f in DIRECTORY_FIELDS})
+			people[pull.name].update({
+				"name": pull.name,
+				"source": None,
+				"cell_number": pull.mobile_no,
+			})
+	return people
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026, Nesscale Solutions Private Limited and contributors
+# For license information, please see license.txt
+"""
+Typeahead pickers for the payment and petty-expense screens.
+
+Parties are searched with a prefix match on ``name`` and the party's title
+column (both indexed, see the ``add_picker_indexes`` patch) and a row
+limit, through ``frappe.get_list`` so permissions still apply.
+
+Accounts and cost centers are small per company but asked for on every
+screen, so each company's leaf rows are cached and filtered in memory.
+The cache is shared by all users; the company and User Permissions are
+checked on each read. The Account / Cost Center hooks drop the company's
+cache on any change.
+"""
+
+from __future__ import unicode_literals
+
+import frappe
+from frappe import _
+from frappe.core.doctype.user_permission.user_permission import get_user_permissions
+from frappe.utils import cint, cstr
+
+PARTY_TITLE_FIELDS = {
+	"Customer": "customer_name",
+	"Employee": "employee_name",
+	"Shareholder": "title",
+	"Supplier": "supplier_name",
+}
+DEFAULT_PAGE_LENGTH = 20
+MAX_PAGE_LENGTH = 200
+TREE_CACHE_TTL = 60 * 60  # seconds
+
+
+def search_parties(party_type, txt=None, start=0, page_length=DEFAULT_PAGE_LENGTH):
+	"""``[{name, party_name}]`` of ``party_type`` whose ID or title starts
+	with ``txt``. ``page_length=0`` returns every match."""
+	title_field = PARTY_TITLE_FIELDS.get(party_type)
+	if not title_field:
+		frappe.throw(_("Invalid party type {0}").format(party_type))
+
+	txt = cstr(txt).strip()
+	or_filters = None
+	if txt:
+		or_filters = [
+			[party_type, "name", "like", "{0}%".format(txt)],
+			[party_type, title_field, "like", "{0}%".format(txt)],
+		]
+	return frappe.get_list(
+		party_type,
+		fields=["name", "{0} as party_name".format(title_field)],
+		or_filters=or_filters,
+		order_by="{0} asc".format(title_field),
+		limit_start=cint(start),
+		limit_page_length=_page_length(page_length),
+	)
+
+
+def search_accounts(company, txt=None, account_types=None, root_type=None,
+	start=0, page_length=DEFAULT_PAGE_LENGTH):
+	"""Leaf accounts of ``company``, optionally of ``account_types`` /
+	``root_type``, whose name or account name starts with ``txt``."""
+	rows = _get_company_tree("Account", company)
+	if account_types:
+		rows = [r for r in rows if r["account_type"] in account_types]
+	if root_type:
+		rows = [r for r in rows if r["root_type"] == root_type]
+	return _filter_page(rows, txt, ("name", "account_name"), start, page_length)
+
+
+def search_cost_centers(company, txt=None, start=0, page_length=DEFAULT_PAGE_LENGTH):
+	rows = _get_company_tree("Cost Center", company)
+	return _filter_page(rows, txt, ("name", "cost_center_name"), start, page_length)
+
+
+def clear_company_tree(doc, method=None):
+	"""Account / Cost Center hook."""
+	if doc.get("company"):
+		frappe.cache().delete_value(_tree_key(doc.doctype, doc.company))
+
+
+def _get_company_tree(doctype, company):
+	"""The company's cached leaf rows, cut down to what the user may see:
+	the cache is shared, so the company and the user's permissions on
+	``doctype`` are checked on every read (``frappe.get_list`` used to)."""
+	frappe.has_permission(doctype, "read", throw=True)
+	frappe.has_permission("Company", "read", doc=company, throw=True)
+	return _apply_user_permissions(doctype, _get_cached_tree(doctype, company))
+
+
+def _get_cached_tree(doctype, company):
+	key = _tree_key(doctype, company)
+	rows = frappe.cache().get_value(key)
+	if rows is None:
+		fields = ["name", "account_name", "account_type", "root_type", "parent_account"] \
+			if doctype == "Account" else ["name", "cost_center_name", "parent_cost_center"]
+		rows = frappe.get_all(
+			doctype,
+			filters={"company": company, "is_group": 0},
+			fields=fields,
+			order_by="lft asc",
+		)
+		rows = [dict(r) for r in rows]
+		frappe.cache().set_value(key, rows, expires_in_sec=TREE_CACHE_TTL)
+	return rows
+
+
+def _apply_user_permissions(doctype, rows):
+	allowed = {
+		p.get("doc")
+		for p in get_user_permissions().get(doctype) or []
+		if not p.get("applicable_for") or p.get("applicable_for") == doctype
+	}
+	if not allowed:
+		return rows
+	return [r for r in rows if r["name"] in allowed]
+
+
+def _filter_page(rows, txt, fields, start, page_length):
+	txt = cstr(txt).strip().lower()
+	if txt:
+		rows = [r for r in rows if any(cstr(r.get(f)).lower().startswith(txt) for f in fields)]
+	start = cint(start)
+	page_length = _page_length(page_length)
+	return rows[start:start + page_length] if page_length else rows[start:]
+
+
+def _page_length(page_length):
+	page_length = cint(page_length)
+	return min(page_length, MAX_PAGE_LENGTH) if page_length else 0
+
+
+def _tree_key(doctype, company):
+	return "ess_picker_tree:{0}:{1}".format(frappe.scrub(doctype), company)
@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026, Nesscale Solutions Private Limited and contributors
+# For license information, please see license.txt
+"""
+Reporting hierarchy as a closure table.
+
+Reporting Hierarchy holds one ``(ancestor, descendant, depth)`` row for
+every manager above every node, plus a depth-0 row per node. Nodes are
+Employees and Employee Pulls (external managers), linked the way the leave
+escalation walks them (see ``get_parent_node``):
+
+* Employee -> its Employee Pull when it has an external reporting manager,
+  else -> its ``reports_to`` Employee;
+* Employee Pull -> the Employee Pull of its ``reports_to`` remote employee,
+  else -> the local Employee named by its ``external_reports_to``.
+
+So a whole approver chain, a whole team, or "is X above Y" is one indexed
+query instead of one query per level. The Employee / Employee Pull
+``on_update`` hooks move a node (with its subtree) when its parent
+changes, and attach the nodes that were waiting for a manager synced
+after them. ``rebuild_hierarchy`` recomputes everything; it is run by the
+patch, after a bulk Employee Pull import (which skips hooks) and nightly
+by ``refresh_hierarchy``.
+"""
+
+from __future__ import unicode_literals
+
+import frappe
+from frappe.utils import cint, now
+
+from employee_self_service.employee_self_service.utils.change_detection import on_change_of
+from employee_self_service.employee_self_service.utils.instrumentation import instrumented
+from employee_self_service.employee_self_service.utils.job_router import routed
+
+EMPLOYEE_PARENT_FIELDS = ["reports_to", "external_report_to", "external_reporting_manager"]
+PULL_PARENT_FIELDS = ["employee", "reports_to", "external_reports_to"]
+ROW_COLUMNS = (
+	"name", "creation", "modified", "owner", "modified_by",
+	"ancestor", "ancestor_doctype", "descendant", "descendant_doctype", "depth",
+)
+
+
+def get_ancestors(node, max_depth=None, include_self=False):
+	"""Managers above ``node``, nearest first:
+	``[{ancestor, ancestor_doctype, depth}]``."""
+	conditions, params = "", {"node": node, "min_depth": 0 if include_self else 1}
+	if max_depth is not None:
+		conditions = "AND depth <= %(max_depth)s"
+		params["max_depth"] = cint(max_depth)
+	return frappe.db.sql(
+		"""
+		SELECT ancestor, ancestor_doctype, depth
+		FROM `tabReporting Hierarchy`
+		WHERE descendant = %(node)s AND depth >= %(min_depth)s {0}
+		ORDER BY depth
+		""".format(conditions),
+		params,
+		as_dict=True,
+	)
+
+
+def get_descendants(node, max_depth=None, doctype=None):
+	"""Everyone below ``node`` (optionally only ``doctype`` nodes):
+	``[{descendant, descendant_doctype, depth}]``."""
+	conditions, params = "", {"node": node}
+	if max_depth is not None:
+		conditions += " AND depth <= %(max_depth)s"
+		params["max_depth"] = cint(max_depth)
+	if doctype:
+		conditions += " AND descendant_doctype = %(doctype)s"
+		params["doctype"] = doctype
+	return frappe.db.sql(
+		"""
+		SELECT descendant, descendant_doctype, depth
+		FROM `tabReporting Hierarchy`
+		WHERE ancestor = %(node)s AND depth > 0 {0}
+		ORDER BY depth
+		""".format(conditions),
+		params,
+		as_dict=True,
+	)
+
+
+def is_above(manager, node):
+	"""True if ``manager`` is anywhere above ``node``."""
+	return bool(frappe.db.sql(
+		"""
+		SELECT 1 FROM `tabReporting Hierarchy`
+		WHERE descendant = %s AND ancestor = %s AND depth > 0
+		LIMIT 1
+		""",
+		(node, manager),
+	))
+
+
+def get_chain(node, node_doctype, max_depth):
+	"""``[(name, doctype)]`` of ``node`` and up to ``max_depth`` managers
+	above it. A node the table does not know yet (e.g. an Employee Pull
+	imported without hooks) is walked level by level instead."""
+	rows = get_ancestors(node, max_depth=max_depth, include_self=True)
+	if rows:
+		return [(r.ancestor, r.ancestor_doctype) for r in rows]
+
+	chain, seen = [], set()
+	while node and node not in seen and len(chain) <= max_depth:
+		seen.add(node)
+		chain.append((node, node_doctype))
+		node, node_doctype = get_parent_node(node, node_doctype)
+	return chain
+
+
+def get_parent_node(name, doctype):
+	"""``(parent, parent_doctype)`` of a node, or ``(None, None)``."""
+	if doctype == "Employee":
+		row = frappe.db.get_value("Employee", name, EMPLOYEE_PARENT_FIELDS, as_dict=True)
+		return _employee_parent(row) if row else (None, None)
+	row = frappe.db.get_value("Employee Pull", name, PULL_PARENT_FIELDS, as_dict=True)
+	return _pull_parent(row) if row else (None, None)
+
+
+@instrumented("hook")
+@on_change_of(*EMPLOYEE_PARENT_FIELDS)
+def sync_employee(doc, method=None):
+	"""Employee on_update hook. Also attaches Pulls that were waiting for
+	this Employee (their ``external_reports_to`` resolves to it)."""
+	move_node(doc.name, "Employee", *_employee_parent(doc))
+	own_pulls = frappe.get_all("Employee Pull", filters={"employee": doc.name}, pluck="name")
+	for child in frappe.get_all(
+		"Employee Pull",
+		or_filters=[
+			["external_reports_to", "like", "{0}-%".format(doc.name)],
+			["external_reports_to", "in", own_pulls or [doc.name]],
+		],
+		fields=["name"] + PULL_PARENT_FIELDS,
+	):
+		parent = _pull_parent(child)
+		if parent == (doc.name, "Employee"):
+			move_node(child.name, "Employee Pull", *parent)
+
+
+@instrumented("hook")
+@on_change_of(*PULL_PARENT_FIELDS)
+def sync_employee_pull(doc, method=None):
+	"""Employee Pull on_update hook. Also attaches nodes that were waiting
+	for this one: Pulls whose ``reports_to`` is this Pull's employee and
+	Employees whose external reporting manager is this Pull."""
+	move_node(doc.name, "Employee Pull", *_pull_parent(doc))
+	for child in frappe.get_all(
+		"Employee Pull",
+		filters={"reports_to": doc.employee, "name": ["!=", doc.name]},
+		fields=["name"] + PULL_PARENT_FIELDS,
+	):
+		move_node(child.name, "Employee Pull", *_pull_parent(child))
+	for child in frappe.get_all(
+		"Employee",
+		filters={"external_reporting_manager": 1, "external_report_to": doc.name},
+		fields=["name"] + EMPLOYEE_PARENT_FIELDS,
+	):
+		move_node(child.name, "Employee", *_employee_parent(child))
+
+
+@routed("bulk")
+@instrumented("job")
+def refresh_hierarchy():
+	"""Nightly safety net: rebuild the table in case a hook was skipped
+	(bulk imports, direct SQL updates)."""
+	rebuild_hierarchy()
+	frappe.db.commit()
+
+
+def remove_node(doc, method=None):
+	"""Employee / Employee Pull on_trash hook: detach the node; its
+	subtree becomes a set of roots until re-parented."""
+	subtree = [d.descendant for d in get_descendants(doc.name)] + [doc.name]
+	frappe.db.sql(
+		"DELETE FROM `tabReporting Hierarchy` WHERE descendant IN %(subtree)s AND depth > 0 "
+		"AND ancestor NOT IN %(subtree)s",
+		{"subtree": tuple(subtree)},
+	)
+	frappe.db.sql(
+		"DELETE FROM `tabReporting Hierarchy` WHERE ancestor = %(node)s OR descendant = %(node)s",
+		{"node": doc.name},
+	)
+
+
+def move_node(node, node_doctype, parent, parent_doctype):
+	"""Re-parent ``node`` (with its whole subtree) under ``parent``."""
+	current = frappe.db.sql(
+		"SELECT ancestor FROM `tabReporting Hierarchy` WHERE descendant = %s AND depth = 1",
+		node,
+	)
+	if current and current[0][0] == parent:
+		return
+
+	subtree = frappe.db.sql(
+		"""
+		SELECT descendant, descendant_doctype, depth
+		FROM `tabReporting Hierarchy`
+		WHERE ancestor = %s
+		""",
+		node,
+		as_dict=True,
+	)
+	if not subtree:
+		subtree = [frappe._dict(descendant=node, descendant_doctype=node_doctype, depth=0)]
+		_insert_rows([(node, node_doctype, node, node_doctype, 0)])
+
+	# Detach: drop every path from above the node into its subtree.
+	frappe.db.sql(
+		"""
+		DELETE FROM `tabReporting Hierarchy`
+		WHERE descendant IN %(subtree)s AND ancestor NOT IN %(subtree)s
+		""",
+		{"subtree": tuple(s.descendant for s in subtree)},
+	)
+
+	if not parent or parent in {s.descendant for s in subtree}:
+		# No manager, or a reporting loop: leave the node as a root.
+		return
+
+	above = get_ancestors(parent, include_self=True)
+	if not above:
+		# Parent not synced yet: give it its own row so that, once it is,
+		# this node moves along with it.
+		_insert_rows([(parent, parent_doctype, parent, parent_doctype, 0)])
+		above = [frappe._dict(ancestor=parent, ancestor_doctype=parent_doctype, depth=0)]
+	_insert_rows([
+		(a.ancestor, a.ancestor_doctype, s.descendant, s.descendant_doctype, a.depth + s.depth + 1)
+		for a in above
+		for s in subtree
+	])
+
+
+def rebuild_hierarchy():
+	"""Recompute the whole table from Employee and Employee Pull."""
+	pulls = {r.name: r for r in frappe.get_all("Employee Pull", fields=["name"] + PULL_PARENT_FIELDS)}
+	employees = frappe.get_all("Employee", fields=["name"] + EMPLOYEE_PARENT_FIELDS)
+	lookup = frappe._dict(
+		pulls=pulls,
+		pull_by_employee={},
+		employees={e.name for e in employees},
+	)
+	for pull in pulls.values():
+		lookup.pull_by_employee.setdefault(pull.employee, pull.name)
+
+	parents = {}
+	for row in employees:
+		parents[(row.name, "Employee")] = _employee_parent(row, lookup)
+	for row in pulls.values():
+		parents[(row.name, "Employee Pull")] = _pull_parent(row, lookup)
+
+	rows = []
+	for (name, doctype) in parents:
+		rows.append((name, doctype, name, doctype, 0))
+		seen, depth = {name}, 0
+		parent = parents[(name, doctype)]
+		while parent[0] and parent[0] not in seen and parent in parents:
+			depth += 1
+			seen.add(parent[0])
+			rows.append((parent[0], parent[1], name, doctype, depth))
+			parent = parents[parent]
+
+	frappe.db.sql("DELETE FROM `tabReporting Hierarchy`")
+	for i in range(0, len(rows), 500):
+		_insert_rows(rows[i:i + 500])
+	return len(rows)
+
+
+def _employee_parent(row, lookup=None):
+	"""``lookup`` (from ``rebuild_hierarchy``) answers from memory instead
+	of the database."""
+	if cint(row.get("external_reporting_manager")) and row.get("external_report_to"):
+		pull = row.get("external_report_to")
+		if (pull in lookup.pulls) if lookup else frappe.db.exists("Employee Pull", pull):
+			return pull, "Employee Pull"
+		return None, None
+	if row.get("reports_to"):
+		return row.get("reports_to"), "Employee"
+	return None, None
+
+
+def _pull_parent(row, lookup=None):
+	"""The remote manager's Pull first, else the local Employee named by
+	``external_reports_to`` (read from that Pull, since employee IDs may
+	contain hyphens; suffix-stripped when the Pull is missing)."""
+	if row.get("reports_to"):
+		if lookup:
+			parent = lookup.pull_by_employee.get(row.get("reports_to"))
+		else:
+			parent = frappe.db.get_value("Employee Pull", {"employee": row.get("reports_to")}, "name")
+		if parent:
+			return parent, "Employee Pull"
+
+	ext = row.get("external_reports_to")
+	if ext:
+		if lookup:
+			emp_id = (lookup.pulls.get(ext) or {}).get("employee")
+		else:
+			emp_id = frappe.db.get_value("Employee Pull", ext, "employee")
+		emp_id = emp_id or ext.rsplit("-", 1)[0]
+		if (emp_id in lookup.employees) if lookup else frappe.db.exists("Employee", emp_id):
+			return emp_id, "Employee"
+	return None, None
+
+
+def _insert_rows(rows):
+	if not rows:
+		return
+	timestamp, user = now(), frappe.session.user
+	values = [[frappe.generate_hash(length=10), timestamp, timestamp, user, user] + list(r) for r in rows]
+	frappe.db.sql(
+		"""
+		INSERT INTO `tabReporting Hierarchy` ({columns})
+		VALUES {rows}
+		""".format(
+			columns=", ".join("`{0}`".format(c) for c in ROW_COLUMNS),
+			rows=", ".join(["(" + ", ".join(["%s"] * len(ROW_COLUMNS)) + ")"] * len(values)),
+		),
+		tuple(v for row in values for v in row),
+	)
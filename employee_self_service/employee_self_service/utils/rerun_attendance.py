@@ -6,9 +6,12 @@ from __future__ import unicode_literals
 import frappe
 from frappe.utils import getdate, get_datetime, add_days, get_first_day, time_diff_in_hours
 from datetime import datetime
+from employee_self_service.employee_self_service.utils.job_router import routed
+from employee_self_service.employee_self_service.utils.leave_occupancy import get_leave_application
 
 
 @frappe.whitelist()
+@routed("bulk")
 def rerun_attendance_for_period(from_date=None, to_date=None, location=None):
 	"""
 	Re-run attendance processing for active employees over a date range.
@@ -27,6 +30,9 @@ def rerun_attendance_for_period(from_date=None, to_date=None, location=None):
 	   This is where an approved Half Day OTPL Leave (which no longer creates a
 	   Leave Application) is picked up and the day is marked Half Day with its
 	   late / early marks.
+
+	Called with keyword arguments (desk, API, ``bench execute --kwargs``) the
+	re-run is queued on the bulk queue; the summary goes to the log.
 	"""
 	from_date = getdate(from_date or "2026-06-01")
 	to_date = getdate(to_date or "2026-06-30")
@@ -199,21 +205,11 @@ def check_and_create_leave_attendance(employee, date):
 	references — same as when the leave is submitted.
 	Returns True if leave attendance was created, False otherwise.
 	"""
-	leave_app_name = frappe.db.sql("""
-		SELECT name
-		FROM `tabLeave Application`
-		WHERE employee = %s
-		AND from_date <= %s
-		AND to_date >= %s
-		AND docstatus = 1
-		ORDER BY modified DESC
-		LIMIT 1
-	""", (employee, date, date), as_dict=True)
-
+	leave_app_name = get_leave_application(employee, date)
 	if not leave_app_name:
 		return False
 
-	leave_doc = frappe.get_doc("Leave Application", leave_app_name[0].name)
+	leave_doc = frappe.get_doc("Leave Application", leave_app_name)
 	leave_doc.update_attendance()
 	return True
 
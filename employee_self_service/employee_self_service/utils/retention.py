@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026, Nesscale Solutions Private Limited and contributors
+# For license information, please see license.txt
+"""
+Retention for high-volume log doctypes.
+
+Policies live in the Retention Policies table of Employee Self Service
+Settings: a doctype, an age (days, on ``date_field``), an optional
+``condition_field`` IN ``condition_values`` filter, and an action.
+
+Every night matching rows are removed in oldest-first batches with a pause
+between batches and a per-policy cap, committing after each batch so
+locks stay short. ``Archive`` first appends the rows (and their child
+rows) as JSON lines to ``private/files/ess_archive/<doctype>/<YYYY-MM>.jsonl.gz``
+by the month of their age field. Row counts per policy are written to
+``retention_last_report`` in the settings.
+"""
+
+from __future__ import unicode_literals
+
+import gzip
+import json
+import os
+import time
+
+import frappe
+from frappe import _
+from frappe.model import default_fields
+from frappe.utils import add_days, cint, cstr, flt, get_datetime, now_datetime
+from employee_self_service.employee_self_service.utils.instrumentation import instrumented
+from employee_self_service.employee_self_service.utils.job_router import enqueue_job, routed
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_MAX_ROWS = 200000
+
+# Shipped defaults, added to the settings table by a patch. Notifications
+# only once read (the unread counter is not touched), sync queue rows only
+# once completed, Error Log only for the titles logged on every request.
+DEFAULT_POLICIES = [
+	{"document_type": "ESS Notification Log", "age_days": 90, "action": "Archive",
+		"condition_field": "read", "condition_values": "1"},
+	{"document_type": "ERP Sync Queue", "age_days": 30, "action": "Delete",
+		"condition_field": "status", "condition_values": "Completed"},
+	{"document_type": "Error Log", "age_days": 14, "action": "Delete",
+		"condition_field": "method", "condition_values": "Check-in Distance Validation\nfilters"},
+	{"document_type": "Team Leader Location Log", "age_days": 60, "action": "Archive", "date_field": "time"},
+	{"document_type": "Leader Location", "age_days": 60, "action": "Archive", "date_field": "datetime"},
+	{"document_type": "No Team Leader Error", "age_days": 90, "action": "Archive", "date_field": "datetime"},
+]
+
+
+@routed("bulk")
+@instrumented("job")
+def run_retention():
+	"""Nightly job: apply every enabled retention policy."""
+	settings = frappe.get_single("Employee Self Service Settings")
+	batch_size = cint(settings.retention_batch_size) or DEFAULT_BATCH_SIZE
+	pause = flt(settings.retention_batch_pause)
+	max_rows = cint(settings.retention_max_rows) or DEFAULT_MAX_ROWS
+
+	report = {"ran_at": cstr(now_datetime()), "policies": []}
+	for policy in settings.get("retention_policies") or []:
+		if not policy.enabled:
+			continue
+		result = {"document_type": policy.document_type, "action": policy.action}
+		try:
+			result["rows"] = apply_policy(policy, batch_size, pause, max_rows)
+		except Exception:
+			frappe.db.rollback()
+			frappe.log_error(
+				title="ESS Retention Error: {0}".format(policy.document_type),
+				message=frappe.get_traceback(),
+			)
+			result["error"] = True
+		report["policies"].append(result)
+
+	frappe.db.set_value(
+		"Employee Self Service Settings", None,
+		"retention_last_report", json.dumps(report, indent=1),
+	)
+	frappe.db.commit()
+	return report
+
+
+@frappe.whitelist()
+def run_retention_now():
+	frappe.only_for("System Manager")
+	enqueue_job(
+		"employee_self_service.employee_self_service.utils.retention.run_retention",
+		dedupe_key="employee_self_service.employee_self_service.utils.retention.run_retention",
+	)
+	frappe.msgprint(_("Retention job queued"), alert=True)
+
+
+def apply_policy(policy, batch_size=DEFAULT_BATCH_SIZE, pause=0, max_rows=DEFAULT_MAX_ROWS):
+	"""Purge (or archive then purge) the rows matching ``policy``. Returns
+	the number of rows removed."""
+	doctype = policy.document_type
+	meta = frappe.get_meta(doctype)
+	date_field = _validate_field(meta, policy.date_field or "creation")
+	conditions = "`{0}` < %(cutoff)s".format(date_field)
+	params = {"cutoff": add_days(now_datetime(), -cint(policy.age_days))}
+
+	if policy.condition_field:
+		values = [v.strip() for v in cstr(policy.condition_values).splitlines() if v.strip()]
+		if values:
+			conditions += " AND `{0}` IN %(values)s".format(_validate_field(meta, policy.condition_field))
+			params["values"] = tuple(values)
+
+	archive = policy.action == "Archive"
+	removed = 0
+	while removed < max_rows:
+		params["limit"] = min(batch_size, max_rows - removed)
+		rows = frappe.db.sql(
+			"""
+			SELECT {select}
+			FROM `tab{doctype}`
+			WHERE {conditions}
+			ORDER BY `{date_field}`
+			LIMIT %(limit)s
+			""".format(
+				select="*" if archive else "name, `{0}`".format(date_field),
+				doctype=doctype, conditions=conditions, date_field=date_field,
+			),
+			params,
+			as_dict=True,
+		)
+		if not rows:
+			break
+
+		names = [r.name for r in rows]
+		if archive:
+			_archive_rows(meta, rows, names, date_field)
+		_delete_rows(meta, names)
+		frappe.db.commit()
+
+		removed += len(rows)
+		if len(rows) < params["limit"]:
+			break
+		if pause:
+			time.sleep(pause)
+	return removed
+
+
+def _validate_field(meta, fieldname):
+	fieldname = cstr(fieldname).strip()
+	if fieldname not in default_fields and not meta.has_field(fieldname):
+		frappe.throw(_("{0} has no field {1}").format(meta.name, fieldname))
+	return fieldname
+
+
+def _archive_rows(meta, rows, names, date_field):
+	children = {}
+	for df in meta.get_table_fields():
+		for child in frappe.db.sql(
+			"""
+			SELECT * FROM `tab{0}`
+			WHERE parenttype = %(parenttype)s AND parent IN %(names)s
+			ORDER BY idx
+			""".format(df.options),
+			{"parenttype": meta.name, "names": tuple(names)},
+			as_dict=True,
+		):
+			children.setdefault((child.parent, child.parentfield), []).append(child)
+
+	by_month = {}
+	for row in rows:
+		for df in meta.get_table_fields():
+			row[df.fieldname] = children.get((row.name, df.fieldname), [])
+		month = get_datetime(row.get(date_field)).strftime("%Y-%m")
+		by_month.setdefault(month, []).append(row)
+
+	folder = frappe.get_site_path("private", "files", "ess_archive", frappe.scrub(meta.name))
+	frappe.create_folder(folder)
+	for month, month_rows in by_month.items():
+		# Appending adds a gzip member per batch; readers see one stream.
+		with gzip.open(os.path.join(folder, "{0}.jsonl.gz".format(month)), "at", encoding="utf-8") as f:
+			for row in month_rows:
+				f.write(json.dumps(row, default=str))
+				f.write("\n")
+
+
+def _delete_rows(meta, names):
+	if meta.name == "ESS Notification Log":
+		_reset_unread_counters(names)
+	elif meta.name == "ESS Broadcast":
+		_delete_broadcast_reads(names)
+
+	for df in meta.get_table_fields():
+		frappe.db.sql(
+			"DELETE FROM `tab{0}` WHERE parenttype = %(parenttype)s AND parent IN %(names)s".format(df.options),
+			{"parenttype": meta.name, "names": tuple(names)},
+		)
+	frappe.db.sql(
+		"DELETE FROM `tab{0}` WHERE name IN %(names)s".format(meta.name),
+		{"names": tuple(names)},
+	)
+
+
+def _reset_unread_counters(names):
+	# Raw DELETE skips the on_trash hook that keeps the unread counters in
+	# step; drop the counters of anyone losing an unread row so the next
+	# read rebuilds them.
+	from employee_self_service.employee_self_service.utils.notification_inbox import (
+		reset_unread_count,
+	)
+
+	for user in frappe.db.sql_list(
+		"""
+		SELECT DISTINCT recipient FROM `tabESS Notification Log`
+		WHERE name IN %(names)s AND `read` = 0
+		""",
+		{"names": tuple(names)},
+	):
+		reset_unread_count(user)
+
+
+def _delete_broadcast_reads(names):
+	# Same for broadcasts: their read markers go too, and the broadcast
+	# counters start a new generation.
+	from employee_self_service.employee_self_service.utils.notification_inbox import (
+		on_broadcast_delete,
+	)
+
+	frappe.db.sql(
+		"DELETE FROM `tabESS Broadcast Read` WHERE broadcast IN %(names)s",
+		{"names": tuple(names)},
+	)
+	on_broadcast_delete()
@@ -1,7 +1,9 @@
 import frappe
 from frappe.utils import today
 from employee_self_service.employee_self_service.utils.otpl_attendance import sync_leader_location_to_remote
+from employee_self_service.employee_self_service.utils.instrumentation import instrumented
 
+@instrumented("hook")
 def after_team_leader_location_update_insert(doc, method):
     """After insert of Team Leader Location Update Log,
     update location_update field on the first IN Employee Checkin of the day for that employee."""
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026, Nesscale Solutions Private Limited and contributors
+# For license information, please see license.txt
+"""
+Manager team view (the ESS Information panel on Employee).
+
+Rows for the employee, their manager and every reportee are built from
+three set-based queries (Employee, first IN check-in of the day grouped by
+employee, device registrations) instead of three queries per person.
+Remote ERPs are asked for external managers / reportees concurrently with
+a short timeout, and the merged payload is cached briefly per employee.
+"""
+
+from __future__ import unicode_literals
+
+from concurrent.futures import ThreadPoolExecutor
+
+import frappe
+import requests
+from frappe.utils import add_days, format_datetime, nowdate
+
+from employee_self_service.employee_self_service.utils.people_directory import get_person
+
+TEAM_VIEW_CACHE_TTL = 60  # seconds
+REMOTE_TIMEOUT = 5  # seconds, per remote ERP call
+REMOTE_MAX_WORKERS = 8
+
+
+def get_team_view(employee):
+	cache_key = "ess_team_view:{0}".format(employee)
+	cached = frappe.cache().get_value(cache_key)
+	if cached is not None:
+		return cached
+
+	result = _build_team_view(employee)
+	frappe.cache().set_value(cache_key, result, expires_in_sec=TEAM_VIEW_CACHE_TTL)
+	return result
+
+
+def get_employee_rows(employees, extra_fields=None):
+	"""ESS rows for ``employees`` keyed by employee ID.
+
+	Each row carries ``employee``, ``employee_name``, ``designation``,
+	``checkin_time`` (first IN today, HH:mm:ss) and ``device_registered``
+	(Yes/No), plus ``extra_fields`` from Employee. Unknown IDs are absent.
+	"""
+	employees = [e for e in set(employees or []) if e]
+	if not employees:
+		return {}
+	extra_fields = list(extra_fields or [])
+
+	details = frappe.get_all(
+		"Employee",
+		filters={"name": ["in", employees]},
+		fields=["name", "employee_name", "designation"] + extra_fields,
+	)
+	if not details:
+		return {}
+	found = [d.name for d in details]
+	checkins = get_first_checkins(found)
+	devices = get_registered_devices(found)
+
+	rows = {}
+	for d in details:
+		row = {
+			"employee": d.name,
+			"employee_name": d.employee_name or "",
+			"designation": d.designation or "",
+			"checkin_time": checkins.get(d.name, ""),
+			"device_registered": "Yes" if d.name in devices else "No",
+		}
+		for f in extra_fields:
+			row[f] = d.get(f) or ""
+		rows[d.name] = row
+	return rows
+
+
+def get_first_checkins(employees, date=None):
+	"""First IN check-in time (HH:mm:ss) on ``date`` per employee.
+
+	Uses a half-open ``time`` range rather than ``DATE(time)`` so the
+	index on ``time`` can be used.
+	"""
+	if not employees:
+		return {}
+	date = date or nowdate()
+	rows = frappe.db.sql(
+		"""
+		SELECT employee, MIN(time) AS first_in
+		FROM `tabEmployee Checkin`
+		WHERE employee IN %(employees)s
+		  AND log_type = 'IN'
+		  AND time >= %(start)s AND time < %(end)s
+		GROUP BY employee
+		""",
+		{"employees": tuple(employees), "start": date, "end": add_days(date, 1)},
+		as_dict=True,
+	)
+	return {r.employee: format_datetime(r.first_in, "HH:mm:ss") for r in rows if r.first_in}
+
+
+def get_registered_devices(employees):
+	if not employees:
+		return set()
+	return {
+		r.employee
+		for r in frappe.get_all(
+			"Employee Device Registration",
+			filters={"employee": ["in", list(employees)]},
+			fields=["employee"],
+			distinct=True,
+		)
+	}
+
+
+def call_remote_erps(api_method, params):
+	"""Call ``erp_sync.<api_method>`` on every enabled ERP concurrently and
+	return the successful payloads (in settings order). A slow or failing
+	remote costs at most ``REMOTE_TIMEOUT`` and is logged, not raised.
+	"""
+	targets = []
+	for s in frappe.get_all("ERP Sync Settings", filters={"enabled": 1}, fields=["name"]):
+		settings = frappe.get_doc("ERP Sync Settings", s.name)
+		targets.append((
+			s.name,
+			"{0}/api/method/employee_self_service.employee_self_service.utils.erp_sync.{1}".format(
+				settings.erp_url, api_method
+			),
+			{
+				"Authorization": "token {0}:{1}".format(
+					settings.get_password("api_key"),
+					settings.get_password("api_secret")
+				),
+				"Content-Type": "application/json"
+			},
+		))
+	if not targets:
+		return []
+
+	# Worker threads only do HTTP; no frappe.db / frappe.local access there.
+	def fetch(target):
+		name, url, headers = target
+		try:
+			response = requests.get(url, params=params, headers=headers, timeout=REMOTE_TIMEOUT)
+			if response.status_code == 200:
+				msg = response.json().get("message", {})
+				if msg.get("success"):
+					return name, msg.get("data"), None
+			return name, None, "HTTP {0}".format(response.status_code)
+		except Exception as e:
+			return name, None, repr(e)
+
+	with ThreadPoolExecutor(max_workers=min(len(targets), REMOTE_MAX_WORKERS)) as pool:
+		results = list(pool.map(fetch, targets))
+
+	payloads = []
+	for name, data, error in results:
+		if error:
+			frappe.log_error(
+				message=error,
+				title="ESS Info: Error calling remote ERP {0}".format(name)
+			)
+		elif data:
+			payloads.append(data)
+	return payloads
+
+
+def _build_team_view(employee):
+	emp_data = frappe.db.get_value(
+		"Employee", employee,
+		["reports_to", "external_reporting_manager", "external_report_to"],
+		as_dict=True
+	) or frappe._dict()
+
+	reportees = frappe.get_all(
+		"Employee",
+		filters={"reports_to": employee, "status": "Active"},
+		pluck="name",
+		order_by="employee_name asc"
+	)
+	local_ext_reportees = frappe.get_all(
+		"Employee",
+		filters={"external_report_to": employee, "status": "Active"},
+		pluck="name",
+		order_by="employee_name asc"
+	)
+
+	rows = get_employee_rows([employee, emp_data.reports_to] + reportees + local_ext_reportees)
+
+	external_manager = None
+	if emp_data.external_reporting_manager and emp_data.external_report_to:
+		external_manager = _get_external_manager(emp_data.external_report_to)
+
+	external_reportees = []
+	for payload in call_remote_erps("get_external_reportees", {"employee": employee}):
+		for rep in payload:
+			external_reportees.append({
+				"employee": rep.get("employee", ""),
+				"employee_name": rep.get("employee_name", ""),
+				"designation": rep.get("designation", ""),
+				"checkin_time": rep.get("checkin_time", ""),
+				"device_registered": rep.get("device_registered", "N/A"),
+				"is_external": True,
+				"is_external_reportee": True,
+			})
+	for name in local_ext_reportees:
+		if name in rows:
+			external_reportees.append(dict(rows[name], is_external_reportee=True))
+
+	return {
+		"self": rows.get(employee),
+		"reports_to": rows.get(emp_data.reports_to) if emp_data.reports_to else None,
+		"external_reports_to": external_manager,
+		"reportees": [rows[r] for r in reportees if r in rows],
+		"external_reportees": external_reportees,
+	}
+
+
+def _get_external_manager(manager):
+	for payload in call_remote_erps("get_external_employee_ess_details", {"employee": manager}):
+		ext = payload.get(manager) if isinstance(payload, dict) else None
+		if ext:
+			return {
+				"employee": ext.get("employee", ""),
+				"employee_name": ext.get("employee_name", ""),
+				"designation": ext.get("designation", ""),
+				"checkin_time": ext.get("checkin_time", ""),
+				"device_registered": ext.get("device_registered", "N/A"),
+				"is_external": True,
+			}
+
+	# Fallback to the local People Directory
+	person = get_person(manager)
+	if person:
+		return {
+			"employee": person.employee or "",
+			"employee_name": person.employee_name or "",
+			"designation": person.designation or person.company or "External",
+			"checkin_time": "",
+			"device_registered": "N/A",
+			"is_external": True,
+		}
+	return None
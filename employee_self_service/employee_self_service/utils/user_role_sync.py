@@ -5,8 +5,10 @@
 from __future__ import unicode_literals
 import frappe
 from employee_self_service.employee_self_service.utils.erp_sync import sync_employee_to_remote
+from employee_self_service.employee_self_service.utils.instrumentation import instrumented
 
 
+@instrumented("hook")
 def sync_employee_fields_from_user_roles(doc, method):
 	"""
 	Sync employee fields based on user roles
@@ -130,17 +130,42 @@ doc_events = {
             "employee_self_service.employee_self_service.utils.employee.assign_team_leader_role_on_temp_tl",
             "employee_self_service.employee_self_service.utils.employee_worker_sync.update_worker_fields_from_manager",
             "employee_self_service.employee_self_service.utils.erp_sync.sync_employee_to_remote",
-            "employee_self_service.employee_self_service.doctype.employee_device_registration.employee_device_registration.update_device_registration_status"
+            "employee_self_service.employee_self_service.doctype.employee_device_registration.employee_device_registration.update_device_registration_status",
+            "employee_self_service.employee_self_service.utils.reporting_hierarchy.sync_employee"
         ],
+        "on_trash": "employee_self_service.employee_self_service.utils.reporting_hierarchy.remove_node",
         "validate": "employee_self_service.employee_self_service.utils.employee_worker_sync.sync_worker_fields_before_save",
         "before_validate": "employee_self_service.employee_self_service.utils.employee.validate_employee"
     },
     "Employee Pull": {
-        "on_update": "employee_self_service.employee_self_service.utils.employee_worker_sync.update_workers_from_employee_pull"
+        "on_update": [
+            "employee_self_service.employee_self_service.utils.employee_worker_sync.update_workers_from_employee_pull",
+            "employee_self_service.employee_self_service.utils.reporting_hierarchy.sync_employee_pull"
+        ],
+        "on_trash": "employee_self_service.employee_self_service.utils.reporting_hierarchy.remove_node"
     },
     "Sales Order": {
         "on_update": "employee_self_service.employee_self_service.utils.erp_sync.sync_sales_order_to_remote",
     },
+    "Item": {
+        "on_update": "employee_self_service.employee_self_service.utils.item_catalogue.bump_catalogue_version",
+        "on_trash": "employee_self_service.employee_self_service.utils.item_catalogue.bump_catalogue_version"
+    },
+    "Item Price": {
+        "on_update": "employee_self_service.employee_self_service.utils.item_catalogue.bump_catalogue_version",
+        "on_trash": "employee_self_service.employee_self_service.utils.item_catalogue.bump_catalogue_version"
+    },
+    "Account": {
+        "on_update": "employee_self_service.employee_self_service.utils.pickers.clear_company_tree",
+        "on_trash": "employee_self_service.employee_self_service.utils.pickers.clear_company_tree"
+    },
+    "Cost Center": {
+        "on_update": "employee_self_service.employee_self_service.utils.pickers.clear_company_tree",
+        "on_trash": "employee_self_service.employee_self_service.utils.pickers.clear_company_tree"
+    },
+    "GL Entry": {
+        "on_submit": "employee_self_service.employee_self_service.utils.gl_statement.clear_closed_months"
+    },
     "Purchase Order": {
         "on_submit": "employee_self_service.employee_self_service.doctype.otpl_expense.otpl_expense.on_purchase_order_submit",
     },
@@ -148,7 +173,11 @@ doc_events = {
         "on_update": "employee_self_service.employee_self_service.utils.user_role_sync.sync_employee_fields_from_user_roles"
     },
     "Leave Application": {
-        "before_cancel": "employee_self_service.employee_self_service.doctype.otpl_leave.otpl_leave.validate_leave_application_cancel"
+        "before_cancel": "employee_self_service.employee_self_service.doctype.otpl_leave.otpl_leave.validate_leave_application_cancel",
+        "on_submit": "employee_self_service.employee_self_service.utils.leave_occupancy.sync_leave_application",
+        "on_cancel": "employee_self_service.employee_self_service.utils.leave_occupancy.sync_leave_application",
+        "on_update_after_submit": "employee_self_service.employee_self_service.utils.leave_occupancy.sync_leave_application",
+        "on_trash": "employee_self_service.employee_self_service.utils.leave_occupancy.sync_leave_application"
     },
     "Team Leader Location Log": {
         "after_insert": "employee_self_service.employee_self_service.utils.team_leader_location.after_team_leader_location_update_insert"
@@ -187,8 +216,23 @@ scheduler_events = {
         "45 0 * * *": [
             "employee_self_service.employee_self_service.utils.attendance_discrepancy_email.send_attendance_discrepancy_email"
         ],
+        "15 1 * * *": [
+            "employee_self_service.employee_self_service.utils.location_track.compact_tracks"
+        ],
+        "30 2 * * *": [
+            "employee_self_service.employee_self_service.utils.retention.run_retention"
+        ],
+        "0 3 * * *": [
+            "employee_self_service.employee_self_service.utils.reporting_hierarchy.refresh_hierarchy"
+        ],
         "*/5 * * * *": [
             "employee_self_service.employee_self_service.utils.erp_sync.process_pending_sync_queue"
+        ],
+        "*/15 * * * *": [
+            "employee_self_service.employee_self_service.utils.people_directory.refresh_people_directory"
+        ],
+        "* * * * *": [
+            "employee_self_service.employee_self_service.utils.map_markers.refresh_map_markers"
         ]
     },
 }
@@ -7,6 +7,11 @@ from employee_self_service.mobile.v1.api_utils import (
     ess_validate,
     exception_handler,
 )
+from employee_self_service.employee_self_service.utils.pickers import (
+    search_accounts,
+    search_cost_centers,
+    search_parties,
+)
 from employee_self_service.mobile.v1.file import get_attchment
 
 
@@ -26,13 +31,18 @@ def get_petty_expense_data():
 
 @frappe.whitelist()
 @ess_validate(methods=["GET"])
-def get_expense_account(company):
+def get_expense_account(company, txt=None, start=0, page_length=0):
     try:
-        accounts = frappe.get_list(
-            "Account",
-            filters={"company": company, "root_type": "Expense", "is_group": 0},
-            fields=["name"],
-        )
+        accounts = [
+            {"name": account["name"]}
+            for account in search_accounts(
+                company,
+                txt=txt,
+                root_type="Expense",
+                start=start,
+                page_length=page_length,
+            )
+        ]
         return gen_response(200, "Account list get successfully", accounts)
     except frappe.PermissionError as e:
         return gen_response(500, frappe.flags.error_message)
@@ -42,11 +52,14 @@ def get_expense_account(company):
 
 @frappe.whitelist()
 @ess_validate(methods=["GET"])
-def get_cost_center(company):
+def get_cost_center(company, txt=None, start=0, page_length=0):
     try:
-        cost_centers = frappe.get_list(
-            "Cost Center", filters={"company": company, "is_group": 0}, fields=["name"]
-        )
+        cost_centers = [
+            {"name": cost_center["name"]}
+            for cost_center in search_cost_centers(
+                company, txt=txt, start=start, page_length=page_length
+            )
+        ]
         return gen_response(200, "Cost Center list get successfully", cost_centers)
     except frappe.PermissionError as e:
         return gen_response(500, frappe.flags.error_message)
@@ -151,24 +164,15 @@ def get_petty_expense_entry(id):
 
 @frappe.whitelist()
 @ess_validate(methods=["GET"])
-def get_party(party_type):
+def get_party(party_type, txt=None, start=0, page_length=0):
+    """
+    Parties whose ID or name starts with ``txt``; pass ``page_length`` for
+    typeahead paging (0 returns every match).
+    """
     try:
-        if party_type == "Customer":
-            meta_data = frappe.get_list(
-                party_type, fields=["name", "customer_name as party_name"]
-            )
-        if party_type == "Employee":
-            meta_data = frappe.get_list(
-                party_type, fields=["name", "employee_name as party_name"]
-            )
-        if party_type == "Shareholder":
-            meta_data = frappe.get_list(
-                party_type, fields=["name", "title as party_name"]
-            )
-        if party_type == "Supplier":
-            meta_data = frappe.get_list(
-                party_type, fields=["name", "supplier_name as party_name"]
-            )
+        meta_data = search_parties(
+            party_type, txt=txt, start=start, page_length=page_length
+        )
         gen_response(200, "data get successfully", meta_data)
     except frappe.PermissionError:
         return gen_response(500, "Not permitted")
@@ -44,7 +44,8 @@ def ess_validate(methods):
     def wrapper(wrapped, instance, args, kwargs):
         if not frappe.local.request.method in methods:
             return gen_response(500, "Invalid Request Method")
-        return wrapped(*args, **kwargs)
+        with measure("api", "{0}.{1}".format(wrapped.__module__, wrapped.__name__)):
+            return wrapped(*args, **kwargs)
 
     return wrapper
 
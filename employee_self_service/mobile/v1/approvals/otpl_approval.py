@@ -6,6 +6,10 @@ from employee_self_service.mobile.v1.api_utils import (
     ess_validate,
     exception_handler,
 )
+from employee_self_service.employee_self_service.utils.notification_inbox import (
+    get_unread_count,
+)
+from employee_self_service.employee_self_service.utils.people_directory import attach_people
 
 
 def _get_marked_attendance_message(employee, employee_name, from_date, to_date):
@@ -86,7 +90,8 @@ def get_otpl_leave_approval_list(start=0, page_length=10):
                 "reason",
                 "status",
                 "modified",
-                "half_day_period"
+                "half_day_period",
+                "source_erp"
             ],
             filters=[
                 ["source_erp", "is", "set"],
@@ -105,10 +110,12 @@ def get_otpl_leave_approval_list(start=0, page_length=10):
         start = int(start)
         page_length = int(page_length)
         paginated_list = combined_list[start:start + page_length]
+        attach_people(paginated_list)
 
         # Clean up response - remove internal fields
         for item in paginated_list:
             item.pop("modified", None)
+            item.pop("source_erp", None)
 
         return gen_response(
             200, "Leave approval list retrieved successfully", paginated_list
@@ -820,7 +827,7 @@ def get_travel_approval_list(start=0, page_length=10):
         if emp_name:
             travel_pull_list = frappe.get_all(
                 "Travel Request Pull",
-                fields=travel_fields,
+                fields=travel_fields + ["source_erp"],
                 filters=[
                     ["source_erp", "is", "set"],
                     ["status", "=", "Pending"],
@@ -837,9 +844,11 @@ def get_travel_approval_list(start=0, page_length=10):
         start = int(start)
         page_length = int(page_length)
         paginated_list = combined_list[start:start + page_length]
+        attach_people(paginated_list)
 
         for item in paginated_list:
             item.pop("modified", None)
+            item.pop("source_erp", None)
 
         return gen_response(
             200, "Travel approval list retrieved successfully", paginated_list
@@ -1306,15 +1315,7 @@ def has_pending_notification_or_approval():
     try:
         current_user = frappe.session.user
 
-        unread_notification_exists = frappe.db.exists(
-            "ESS Notification Log",
-            {
-                "recipient": current_user,
-                "read": 0
-            }
-        )
-
-        if unread_notification_exists:
+        if get_unread_count(current_user):
             return gen_response(
                 200,
                 "Pending notification found",
@@ -0,0 +1,228 @@
+import base64
+import hashlib
+import hmac
+import json
+
+import frappe
+from frappe.utils import cstr, get_datetime
+from employee_self_service.mobile.v1.api_utils import (
+    gen_response,
+    ess_validate,
+    get_employee_by_user,
+    get_ess_settings,
+    exception_handler,
+)
+from employee_self_service.employee_self_service.utils.image_pipeline import (
+    attach_image_content,
+)
+
+"""Offline-first check-in sync.
+
+The app queues punches while the site has no signal and flushes them here
+in one round-trip instead of one create_employee_log + attach_checkin_image
+pair per punch. Each event carries a client-generated idempotency key
+(``client_event_id``), so a flush that is retried after a dropped response
+never creates the same punch twice.
+
+Event shape::
+
+    {
+        "client_event_id": "3f0c...",      # required, unique per punch
+        "log_type": "IN" | "OUT",         # required
+        "time": "2026-10-19 09:02:11",    # required, device clock
+        "unique_id": "<device id>",       # required, registered device
+        "location": "28.61,77.20",
+        "odometer_reading": 1234,
+        "today_work": "...",
+        "image": "<base64 jpeg>",         # optional
+        "image_name": "punch.jpg",
+        "signature": "<hex hmac>"         # see _event_signature
+    }
+"""
+
+MAX_EVENTS_PER_SYNC = 100
+
+
+@frappe.whitelist()
+@ess_validate(methods=["POST"])
+def sync_employee_logs(events=None):
+    """Insert a batch of offline check-in events in order, in one transaction.
+
+    Every event gets its own savepoint, so one bad event is rolled back and
+    reported without losing the others. Returns one result per event:
+    ``created`` (with ``checkin_id``), ``duplicate`` (already synced, with
+    the existing ``checkin_id``) or ``error`` (with ``message``).
+    """
+    try:
+        if isinstance(events, str):
+            events = json.loads(events)
+        if not events or not isinstance(events, list):
+            return gen_response(500, "events is required.")
+        if len(events) > MAX_EVENTS_PER_SYNC:
+            return gen_response(
+                500, f"At most {MAX_EVENTS_PER_SYNC} events can be synced at once."
+            )
+
+        emp_data = get_employee_by_user(
+            frappe.session.user,
+            fields=["name", "sales_order", "reports_to", "staff_type"],
+        )
+        if not emp_data:
+            return gen_response(404, "Employee not found")
+
+        api_secret = _get_api_secret(frappe.session.user)
+        if not api_secret:
+            # An empty key would make every signature forgeable.
+            return gen_response(403, "API secret is not set. Please log in again.")
+        registered_device = _get_registered_device(emp_data.get("name"))
+        already_synced = _get_synced_events(
+            [cstr(e.get("client_event_id")) for e in events if isinstance(e, dict)]
+        )
+
+        results = []
+        for event in events:
+            results.append(
+                _sync_event(event, emp_data, api_secret, registered_device, already_synced)
+            )
+
+        return gen_response(200, "Employee logs synced", {"results": results})
+    except Exception as e:
+        frappe.db.rollback()
+        return exception_handler(e)
+
+
+def _sync_event(event, emp_data, api_secret, registered_device, already_synced):
+    if not isinstance(event, dict):
+        return {"client_event_id": None, "status": "error", "message": "Invalid event."}
+
+    event_id = cstr(event.get("client_event_id")).strip()
+    result = {"client_event_id": event_id}
+
+    if event_id in already_synced:
+        result.update(status="duplicate", checkin_id=already_synced[event_id])
+        return result
+
+    error = _validate_event(event, event_id, api_secret, registered_device)
+    if error:
+        result.update(status="error", message=error)
+        return result
+
+    frappe.db.sql("SAVEPOINT checkin_sync_event")
+    try:
+        checkin_id = _insert_checkin(event, event_id, emp_data)
+    except frappe.DuplicateEntryError:
+        # Same key flushed by a concurrent request between our lookup and insert.
+        frappe.db.sql("ROLLBACK TO SAVEPOINT checkin_sync_event")
+        result.update(
+            status="duplicate",
+            checkin_id=frappe.db.get_value(
+                "Employee Checkin", {"client_event_id": event_id}, "name"
+            ),
+        )
+        return result
+    except Exception as e:
+        frappe.db.sql("ROLLBACK TO SAVEPOINT checkin_sync_event")
+        frappe.log_error(
+            title="Check-in Sync Error", message=frappe.get_traceback()
+        )
+        result.update(status="error", message=cstr(e))
+        return result
+
+    frappe.db.sql("RELEASE SAVEPOINT checkin_sync_event")
+    already_synced[event_id] = checkin_id
+    result.update(status="created", checkin_id=checkin_id)
+    return result
+
+
+def _validate_event(event, event_id, api_secret, registered_device):
+    if not event_id:
+        return "client_event_id is required."
+    if event.get("log_type") not in ("IN", "OUT"):
+        return "log_type must be IN or OUT."
+    if not event.get("time"):
+        return "time is required."
+    try:
+        get_datetime(event.get("time"))
+    except Exception:
+        return "time is not a valid datetime."
+
+    if registered_device and cstr(event.get("unique_id")) != registered_device:
+        return "Device not recognized. Please contact admin."
+
+    expected = _event_signature(event, api_secret)
+    if not hmac.compare_digest(expected, cstr(event.get("signature"))):
+        return "Invalid event signature."
+
+
+def _event_signature(event, api_secret):
+    """Hex HMAC-SHA256, keyed with the user's API secret (handed to the app
+    at login), over ``client_event_id|log_type|time|unique_id``."""
+    message = "|".join(
+        cstr(event.get(k))
+        for k in ("client_event_id", "log_type", "time", "unique_id")
+    )
+    return hmac.new(
+        cstr(api_secret).encode(), message.encode(), hashlib.sha256
+    ).hexdigest()
+
+
+def _insert_checkin(event, event_id, emp_data):
+    """Same document create_employee_log builds, plus the idempotency key."""
+    log_doc = frappe.get_doc(
+        dict(
+            doctype="Employee Checkin",
+            employee=emp_data.get("name"),
+            log_type=event.get("log_type"),
+            time=event.get("time"),
+            location=event.get("location"),
+            odometer_reading=event.get("odometer_reading"),
+            today_work=event.get("today_work"),
+            order=emp_data.get("sales_order") or None,
+            requested_from=emp_data.get("reports_to"),
+            approval_required=1 if emp_data.get("staff_type") == "Driver" else 0,
+            client_event_id=event_id,
+            device_unique_id=event.get("unique_id"),
+        )
+    ).insert(ignore_permissions=True)
+
+    if event.get("image"):
+        # Goes through the image pipeline: deduped by content hash, set with
+        # db_set (no re-run of the checkin hook chain), downscaled later.
+        attach_image_content(
+            "Employee Checkin",
+            log_doc.name,
+            "attendance_image",
+            base64.b64decode(event.get("image")),
+            event.get("image_name") or f"{event_id}.jpg",
+        )
+
+    return log_doc.name
+
+
+def _get_synced_events(event_ids):
+    event_ids = [e for e in event_ids if e]
+    if not event_ids:
+        return {}
+    return {
+        row.client_event_id: row.name
+        for row in frappe.get_all(
+            "Employee Checkin",
+            filters={"client_event_id": ["in", event_ids]},
+            fields=["name", "client_event_id"],
+        )
+    }
+
+
+def _get_registered_device(employee):
+    """The employee's registered unique_id, or None when device
+    restrictions are off (any device may then sync)."""
+    if not get_ess_settings().get("enable_device_restrictions"):
+        return None
+    return frappe.db.get_value(
+        "Employee Device Registration", {"employee": employee}, "unique_id"
+    )
+
+
+def _get_api_secret(user):
+    """The user's API secret, or None when none has been generated."""
+    return frappe.get_doc("User", user).get_password("api_secret", raise_exception=False)
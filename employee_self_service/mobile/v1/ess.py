@@ -36,16 +36,33 @@ from employee_self_service.mobile.v1.api_utils import (
     exception_handler,
 )
 from frappe.handler import upload_file
+from employee_self_service.employee_self_service.utils.image_pipeline import (
+    attach_uploaded_image,
+)
 from erpnext.accounts.utils import get_fiscal_year
 
 from employee_self_service.employee_self_service.doctype.push_notification.push_notification import (
     create_push_notification,
 )
-from erpnext.hr.doctype.leave_application.leave_application import (
-    get_leave_balance_on,
-    get_leaves_for_period,
+from employee_self_service.employee_self_service.utils.leave_balance import (
+    LeaveLedger,
+)
+from employee_self_service.employee_self_service.utils.notification_inbox import (
+    BROADCAST_PREFIX,
+    INBOX_MAX_PAGE_LENGTH,
+    get_broadcast_topic,
+    get_inbox,
+    get_unread_count,
+    is_broadcast,
+    mark_read,
 )
 from frappe.utils import add_to_date, get_datetime
+from employee_self_service.employee_self_service.utils.instrumentation import instrumented
+from employee_self_service.employee_self_service.utils.people_directory import (
+    get_people,
+    get_person_name,
+)
+from employee_self_service.employee_self_service.utils.gl_statement import get_statement
 
 DATE_FORMAT = "%Y-%m-%d"
 
@@ -249,18 +266,15 @@ def cancel_leave_application(*args, **kwargs):
 @ess_validate(methods=["GET"])
 def get_leave_type(from_date=None, to_date=None):
     try:
-        from erpnext.hr.doctype.leave_application.leave_application import (
-            get_leave_balance_on,
-        )
-
         if not from_date:
             from_date = today()
         emp_data = get_employee_by_user(frappe.session.user)
         leave_types = frappe.get_all(
             "Leave Type", filters={}, fields=["name", "'0' as balance"]
         )
+        ledger = LeaveLedger.load([emp_data.get("name")], from_date)
         for leave_type in leave_types:
-            leave_type["balance"] = get_leave_balance_on(
+            leave_type["balance"] = ledger.balance_on(
                 emp_data.get("name"),
                 leave_type.get("name"),
                 from_date,
@@ -483,112 +497,29 @@ def get_data(filters, leave_types):
     #             employee_name=employee.employee_name,
     #         )
 
+    employee = filters.get("employee")
+    employee_name = frappe.db.get_value("Employee", employee, "employee_name")
+    # One ledger read covers the opening balance (day before from_date) and
+    # every leave type's movements in the period.
+    ledger = LeaveLedger.load(
+        [employee], add_days(filters.get("from_date"), -1), leave_types=leave_types
+    )
+
     for leave_type in leave_types:
         row = {}
         row["leave_type"] = leave_type
-        row["employee"] = filters.get("employee")
-        row["employee_name"] = frappe.db.get_value(
-            "Employee", filters.get("employee"), "employee_name"
-        )
+        row["employee"] = employee
+        row["employee_name"] = employee_name
         row.update(
-            calculate_leaves_details(filters, leave_type, filters.get("employee"))
+            ledger.leave_details(
+                employee, leave_type, filters.get("from_date"), filters.get("to_date")
+            )
         )
 
-        # row += calculate_leaves_details(filters, leave_type, employee)
-
         data.append(row)
     return data
 
 
-def get_leave_ledger_entries(from_date, to_date, employee, leave_type):
-    records = frappe.db.sql(
-        """
-		SELECT
-			employee, leave_type, from_date, to_date, leaves, transaction_name, transaction_type
-			is_carry_forward, is_expired
-		FROM `tabLeave Ledger Entry`
-		WHERE employee=%(employee)s AND leave_type=%(leave_type)s
-			AND docstatus=1
-			AND (from_date between %(from_date)s AND %(to_date)s
-				OR to_date between %(from_date)s AND %(to_date)s
-				OR (from_date < %(from_date)s AND to_date > %(to_date)s))
-	""",
-        {
-            "from_date": from_date,
-            "to_date": to_date,
-            "employee": employee,
-            "leave_type": leave_type,
-        },
-        as_dict=1,
-    )
-
-    return records
-
-
-def calculate_leaves_details(filters, leave_type, employee):
-    ledger_entries = get_leave_ledger_entries(
-        filters.get("from_date"), filters.get("to_date"), employee, leave_type
-    )
-
-    # Leaves Deducted consist of both expired and leaves taken
-    leaves_deducted = (
-        get_leaves_for_period(
-            employee, leave_type, filters.get("from_date"), filters.get("to_date")
-        )
-        * -1
-    )
-
-    # removing expired leaves
-    leaves_taken = leaves_deducted - remove_expired_leave(ledger_entries)
-
-    opening = get_leave_balance_on(
-        employee, leave_type, add_days(filters.get("from_date"), -1)
-    )
-
-    new_allocation, expired_allocation = get_allocated_and_expired_leaves(
-        ledger_entries, filters.get("from_date"), filters.get("to_date")
-    )
-
-    # removing leaves taken from expired_allocation
-    expired_leaves = max(expired_allocation - leaves_taken, 0)
-
-    # Formula for calculating  closing balance
-    closing = max(opening + new_allocation - (leaves_taken + expired_leaves), 0)
-    return dict(
-        leaves_allocated=flt(new_allocation),
-        leaves_expired=flt(expired_leaves),
-        opening_balance=flt(opening),
-        leaves_taken=flt(leaves_taken),
-        closing_balance=flt(closing),
-    )
-    # return [opening, new_allocation, leaves_taken, expired_leaves, closing]
-
-
-def remove_expired_leave(records):
-    expired_within_period = 0
-    for record in records:
-        if record.is_expired:
-            expired_within_period += record.leaves
-    return expired_within_period * -1
-
-
-def get_allocated_and_expired_leaves(records, from_date, to_date):
-
-    from frappe.utils import getdate
-
-    new_allocation = 0
-    expired_leaves = 0
-
-    for record in records:
-        if record.to_date < getdate(today()) and record.leaves > 0:
-            expired_leaves += record.leaves
-
-        if record.from_date >= getdate(from_date) and record.leaves > 0:
-            new_allocation += record.leaves
-
-    return new_allocation, expired_leaves
-
-
 @frappe.whitelist()
 def get_expense_type():
     try:
@@ -913,12 +844,9 @@ def get_dashboard():
             "leave_message": leave_message
         }
         reports_to_name = None
-        if emp_data.get("reports_to"):
-            reports_to_name = frappe.db.get_value(
-                "Employee", emp_data.get("reports_to"), "employee_name"
-            )
-        if emp_data.get("external_report_to"):
-            reports_to_name = frappe.db.get_value("Employee Pull", emp_data.get("external_report_to"), "employee_name")
+        manager = emp_data.get("external_report_to") or emp_data.get("reports_to")
+        if manager:
+            reports_to_name = get_person_name(manager)
         
         dashboard_data["reports_to_name"] = reports_to_name
         dashboard_data["employee_image"] = emp_data.get("image")
@@ -1325,13 +1253,10 @@ def create_employee_log(
         # update_shift_last_sync(emp_data)
 
         if "file" in frappe.request.files:
-            file = upload_file()
-            file.attached_to_doctype = "Employee Checkin"
-            file.attached_to_name = log_doc.name
-            file.attached_to_field = "attendance_image"
-            file.save(ignore_permissions=True)
+            file = attach_uploaded_image(
+                "Employee Checkin", log_doc.name, "attendance_image"
+            )
             log_doc.attendance_image = file.get("file_url")
-            log_doc.save(ignore_permissions=True)
         # update_shift_last_sync(emp_data)
         update_reports_to(emp_data.get("name"), report_to, external,log_doc)
         return gen_response(200, "Employee log added",log_doc)
@@ -1365,23 +1290,11 @@ def attach_checkin_image(checkin_id):
         if "file" not in frappe.request.files:
             return gen_response(400, "No file provided")
 
-        # Delete old image if exists
-        if checkin_doc.attendance_image:
-            old_file_url = checkin_doc.attendance_image
-            file_doc = frappe.db.get_value("File", {"file_url": old_file_url}, "name")
-            if file_doc:
-                frappe.delete_doc("File", file_doc, ignore_permissions=True)
-
-        # Upload new file
-        file = upload_file()
-        file.attached_to_doctype = "Employee Checkin"
-        file.attached_to_name = checkin_doc.name
-        file.attached_to_field = "attendance_image"
-        file.save(ignore_permissions=True)
-
-        # Update checkin document with image URL
-        checkin_doc.attendance_image = file.get("file_url")
-        checkin_doc.save(ignore_permissions=True)
+        # Streams the upload to disk, replaces the previous image and sets
+        # attendance_image without re-saving the checkin.
+        file = attach_uploaded_image(
+            "Employee Checkin", checkin_doc.name, "attendance_image"
+        )
 
         return gen_response(
             200,
@@ -1418,6 +1331,7 @@ def get_last_log_type(dashboard_data, employee):
         dashboard_data["last_log_type"] = logs[0].log_type
 
 
+@instrumented("job")
 def daily_notice_board_event():
     create_employee_birthday_board("birthday")
     create_employee_birthday_board("work_anniversary")
@@ -1487,7 +1401,6 @@ def get_employees_having_an_event_today(event_type, date=None):
 @ess_validate(methods=["GET"])
 def get_task_list(start=0, page_length=10, filters=None):
     try:
-        frappe.log_error(title="filters", message=filters)
         tasks = frappe.get_list(
             "Task",
             fields=[
@@ -1508,67 +1421,103 @@ def get_task_list(start=0, page_length=10, filters=None):
             page_length=page_length,
             order_by="modified desc",
         )
-        for task in tasks:
-            # if frappe.session.user == task.get("assigned_by") or frappe.session.user == task.get("completed_by") or (task.get("assigned_to") and frappe.session.user in task.get("assigned_to")):
-            if task["exp_end_date"]:
-                task["exp_end_date"] = task["exp_end_date"].strftime("%d-%m-%Y")
-            get_task_comments(task)
-            task["project_name"] = frappe.db.get_value(
-                "Project", {"name": task.get("project")}, ["project_name"]
-            )
-            get_task_assigned_by(task)
-            if task.get("assigned_to"):
-                task["assigned_to"] = frappe.get_all(
-                    "User",
-                    filters=[
-                        ["User", "email", "in", json.loads(task.get("assigned_to"))]
-                    ],
-                    fields=["full_name as user", "user_image"],
-                    order_by="creation asc",
-                )
-            else:
-                task["assigned_to"] = []
-                # updated_task.append(task)
+        enrich_tasks(tasks)
 
         return gen_response(200, "Task list getting Successfully", tasks)
     except Exception as e:
         return exception_handler(e)
 
 
-def get_task_assigned_by(task):
-    task["assigned_by"] = frappe.db.get_value(
-        "User",
-        {"name": task.get("assigned_by")},
-        ["full_name as user", "user_image"],
-        as_dict=1,
-    )
-
+def enrich_tasks(tasks):
+    """Add comments, project name, assigned-by and assignee profiles to a
+    page of tasks with one Comment, one Project and one User query for the
+    whole page."""
+    for task in tasks:
+        task["assigned_to"] = (
+            json.loads(task.get("assigned_to")) if task.get("assigned_to") else []
+        )
 
-def get_task_comments(task):
-    comments = frappe.get_all(
-        "Comment",
-        filters={
-            "reference_name": ["like", "%{0}%".format(task.get("name"))],
-            "comment_type": "Comment",
-        },
-        fields=[
-            "content as comment",
-            "comment_by",
-            "reference_name",
-            "creation",
-            "comment_email",
-        ],
-    )
+    task_names = [task.get("name") for task in tasks]
+    comments_by_task = {}
+    comments = []
+    if task_names:
+        comments = frappe.get_all(
+            "Comment",
+            filters={
+                "reference_doctype": "Task",
+                "reference_name": ["in", task_names],
+                "comment_type": "Comment",
+            },
+            fields=[
+                "content as comment",
+                "comment_by",
+                "reference_name",
+                "creation",
+                "comment_email",
+            ],
+            order_by="modified desc",
+        )
     for comment in comments:
-        comment["commented"] = pretty_date(comment["creation"])
-        comment["creation"] = comment["creation"].strftime("%I:%M %p")
-        user_image = frappe.get_value(
-            "User", comment.comment_email, "user_image", cache=True
+        comments_by_task.setdefault(comment.reference_name, []).append(comment)
+
+    project_names = {task.get("project") for task in tasks if task.get("project")}
+    projects = {}
+    if project_names:
+        projects = dict(
+            frappe.get_all(
+                "Project",
+                filters={"name": ["in", list(project_names)]},
+                fields=["name", "project_name"],
+                as_list=True,
+            )
         )
-        comment["user_image"] = user_image
 
-    task["comments"] = comments
-    task["num_comments"] = len(comments)
+    emails = {c.comment_email for c in comments if c.comment_email}
+    for task in tasks:
+        emails.update(task["assigned_to"])
+        if task.get("assigned_by"):
+            emails.add(task.get("assigned_by"))
+    users = {}
+    if emails:
+        users = {
+            u.name: u
+            for u in frappe.get_all(
+                "User",
+                filters={"name": ["in", list(emails)]},
+                fields=["name", "full_name", "user_image", "creation"],
+            )
+        }
+
+    for task in tasks:
+        if task["exp_end_date"]:
+            task["exp_end_date"] = task["exp_end_date"].strftime("%d-%m-%Y")
+
+        task_comments = comments_by_task.get(task.get("name"), [])
+        for comment in task_comments:
+            comment["commented"] = pretty_date(comment["creation"])
+            comment["creation"] = comment["creation"].strftime("%I:%M %p")
+            user = users.get(comment.comment_email)
+            comment["user_image"] = user.user_image if user else None
+        task["comments"] = task_comments
+        task["num_comments"] = len(task_comments)
+
+        task["project_name"] = projects.get(task.get("project"))
+
+        assigned_by = users.get(task.get("assigned_by"))
+        task["assigned_by"] = (
+            frappe._dict(user=assigned_by.full_name, user_image=assigned_by.user_image)
+            if assigned_by
+            else None
+        )
+
+        assignees = sorted(
+            (users[email] for email in task["assigned_to"] if email in users),
+            key=lambda u: u.creation,
+        )
+        task["assigned_to"] = [
+            frappe._dict(user=u.full_name, user_image=u.user_image) for u in assignees
+        ]
+    return tasks
 
 
 def validate_assign_task(task_id):
@@ -2198,7 +2147,11 @@ def employee_device_info(**kwargs):
         #     if existing_registration.get("employee") != emp_data.get("name"):
         #         return gen_response(500, "Device already registered with another employee.")
 
-        return gen_response(200, "Device information saved successfully!")
+        return gen_response(
+            200,
+            "Device information saved successfully!",
+            {"broadcast_topic": get_broadcast_topic()},
+        )
     except Exception as e:
         return exception_handler(e)
 
@@ -2244,38 +2197,77 @@ def auto_login_with_device_token(**kwargs):
 @ess_validate(methods=["GET"])
 def notification_list():
     try:
-        # Get notifications from ESS Notification Log for the current user
-        filters = [
-            ["ESS Notification Log", "recipient", "=", frappe.session.user]
-        ]
-
-        notification = frappe.get_all(
-            "ESS Notification Log",
-            filters=filters,
-            fields=[
-                "name",
-                "notification_name as title",
-                "subject",
-                "message",
-                "creation",
-                "`read`",
-                "document_type",
-                "reference_document",
-                "reference_name",
-            ],
-            order_by="creation desc",
-        )
+        # Every notification and broadcast of the current user; newer apps
+        # page through get_notification_inbox instead.
+        notification, cursor = [], None
+        while True:
+            rows, cursor = get_inbox(
+                frappe.session.user, cursor=cursor, page_length=INBOX_MAX_PAGE_LENGTH
+            )
+            notification.extend(rows)
+            if not cursor:
+                break
 
+        user_image = frappe.get_value("User", frappe.session.user, "user_image")
         for notified in notification:
             notified["creation"] = pretty_date(notified.get("creation"))
-            notified["user_image"] = frappe.get_value(
-                "User", frappe.session.user, "user_image"
-            )
+            notified["user_image"] = user_image
         return gen_response(200, "Notification list get successfully", notification)
     except Exception as e:
         return exception_handler(e)
 
 
+@frappe.whitelist()
+@ess_validate(methods=["GET"])
+def get_notification_inbox(cursor=None, page_length=20):
+    """
+    Cursor-paginated notification list. Pass back ``next_cursor`` to get
+    the next page; it is null on the last page.
+    """
+    try:
+        notifications, next_cursor = get_inbox(
+            frappe.session.user, cursor=cursor, page_length=page_length
+        )
+        user_image = frappe.get_value("User", frappe.session.user, "user_image")
+        for notified in notifications:
+            notified["creation"] = pretty_date(notified.get("creation"))
+            notified["user_image"] = user_image
+        return gen_response(
+            200,
+            "Notification list get successfully",
+            {
+                "notifications": notifications,
+                "next_cursor": next_cursor,
+                "unread_count": get_unread_count(frappe.session.user),
+            },
+        )
+    except Exception as e:
+        return exception_handler(e)
+
+
+@frappe.whitelist()
+@ess_validate(methods=["POST"])
+def mark_notifications_as_read(notification_names=None):
+    """
+    Mark the given notifications (JSON list) or, when none are passed, all
+    of the current user's notifications as read.
+    """
+    try:
+        if isinstance(notification_names, str):
+            notification_names = json.loads(notification_names)
+        updated = mark_read(frappe.session.user, notification_names)
+        return gen_response(
+            200,
+            "Notifications marked as read successfully",
+            {
+                "updated": updated,
+                "unread_count": get_unread_count(frappe.session.user),
+            },
+        )
+    except Exception as e:
+        return exception_handler(e)
+
+
 @frappe.whitelist()
 @ess_validate(methods=["POST"])
 def mark_notification_as_read():
@@ -2286,14 +2278,24 @@ def mark_notification_as_read():
         if not notification_name:
             return gen_response(400, "notification_name is required")
 
-        doc = frappe.get_doc("ESS Notification Log", notification_name)
+        if is_broadcast(notification_name):
+            # Broadcasts belong to everyone.
+            if not frappe.db.exists(
+                "ESS Broadcast", notification_name[len(BROADCAST_PREFIX):]
+            ):
+                raise frappe.DoesNotExistError
+        else:
+            recipient = frappe.db.get_value(
+                "ESS Notification Log", notification_name, "recipient"
+            )
+            if recipient is None:
+                raise frappe.DoesNotExistError
 
-        # Check if the notification belongs to the current user
-        if doc.recipient != frappe.session.user:
-            return gen_response(403, "Not authorized to mark this notification as read")
+            # Check if the notification belongs to the current user
+            if recipient != frappe.session.user:
+                return gen_response(403, "Not authorized to mark this notification as read")
 
-        doc.read = 1
-        doc.save(ignore_permissions=True)
+        mark_read(frappe.session.user, [notification_name])
         frappe.db.commit()
 
         return gen_response(200, "Notification marked as read successfully")
@@ -2301,6 +2303,7 @@ def mark_notification_as_read():
         return exception_handler(e)
 
 
+@instrumented("job")
 def send_notification_on_event():
     birthday_events = get_employees_having_an_event_today("birthday", date=today())
     for event in birthday_events:
@@ -2345,6 +2348,7 @@ def global_holiday_list(date=None):
     return holidays
 
 
+@instrumented("job")
 def on_holiday_event():
     holiday_list = global_holiday_list(date=today())
     for holiday in holiday_list:
@@ -2434,7 +2438,7 @@ def get_manager_login_status():
                 )
 
                 if not latest_checkin or not latest_checkin.get("location"):
-                    manager_name = frappe.db.get_value("Employee Pull",{"employee": emp_data.get("external_report_to")}, "employee_name")
+                    manager_name = get_person_name(emp_data.get("external_report_to"))
                     return gen_response(
                         200,
                         f"External reporting manager {manager_name} has not checked in today. Please wait for manager to check in first.",
@@ -2770,7 +2774,13 @@ def update_profile_picture():
 @frappe.whitelist()
 @ess_validate(methods=["GET"])
 def get_transactions(
-    from_date=None, to_date=None, party_type=None, party=None, download="false"
+    from_date=None,
+    to_date=None,
+    party_type=None,
+    party=None,
+    download="false",
+    start=0,
+    page_length=None,
 ):
     try:
         from_date = getdate(from_date)
@@ -2783,6 +2793,8 @@ def get_transactions(
         if not party:
             emp_data = get_employee_by_user(frappe.session.user)
             party = [emp_data.get("name")]
+        elif isinstance(party, str):
+            party = json.loads(party) if party.startswith("[") else [party]
         allowed_party_types = ["Employee", "Customer"]
 
         if party_type not in allowed_party_types:
@@ -2791,116 +2803,80 @@ def get_transactions(
                     ", ".join(allowed_party_types)
                 )
             )
+        # Same access as the General Ledger report this used to run, which
+        # validated the parties and applied the user's permissions.
+        if not frappe.get_cached_doc("Report", "General Ledger").is_permitted():
+            raise frappe.PermissionError
+        for name in party:
+            if not frappe.db.exists(party_type, name):
+                frappe.throw(_("Invalid {0}: {1}").format(party_type, name))
+            if not frappe.has_permission(party_type, doc=name):
+                raise frappe.PermissionError
         filters_report = {
             "company": global_defaults.get("default_company"),
             "from_date": from_date,
             "to_date": to_date,
-            "account": [],
             "party_type": party_type,
             "party": party,
-            "group_by": "Group by Party",
-            "cost_center": [],
-            "project": [],
-            "include_dimensions": 1,
         }
-        if party_type == "Employee" and isinstance(party, list) and len(party) == 1:
+        if party_type == "Employee" and len(party) == 1:
             filters_report["party_name"] = frappe.db.get_value(
                 party_type, party[0], "employee_name"
             )
         else:
-            filters_report["party_name"] = (
-                ", ".join(party) if party and len(party) > 0 else ""
-            )
+            filters_report["party_name"] = ", ".join(party)
 
-        from frappe.desk.query_report import run
-
-        res = run("General Ledger", filters=filters_report, ignore_prepared_report=True)
-        data = []
-        total = {}
-        opening_balance = {}
-        if res.get("result"):
-            for row in res.get("result"):
-                if "gl_entry" in row.keys():
-                    data.append(
-                        {
-                            "posting_date": row.get("posting_date").strftime(
-                                "%d-%m-%Y"
-                            ),
-                            "voucher_type": row.get("voucher_type"),
-                            "voucher_no": row.get("voucher_no"),
-                            "debit": fmt_money(
-                                row.get("debit"),
-                                currency=global_defaults.get("default_currency"),
-                            ),
-                            "credit": fmt_money(
-                                row.get("credit"),
-                                currency=global_defaults.get("default_currency"),
-                            ),
-                            "balance": fmt_money(
-                                row.get("balance"),
-                                currency=global_defaults.get("default_currency"),
-                            ),
-                            "party_type": row.get("party_type"),
-                            "party": row.get("party"),
-                        }
-                    )
+        statement = get_statement(
+            filters_report["company"],
+            party_type,
+            party,
+            from_date,
+            to_date,
+            start=0 if download == "true" else start,
+            page_length=None if download == "true" else page_length,
+        )
+        currency = global_defaults.get("default_currency")
 
-                    if flt(row.get("balance")) >= 0:
-                        row["color"] = "red"
-                    else:
-                        row["color"] = "green"
-                if "'Opening'" in row.values():
-                    opening_balance = {
-                        "account": "Opening",
-                        "posting_date": from_date.strftime("%d-%m-%Y"),
-                        "credit": fmt_money(
-                            row.get("credit"),
-                            currency=global_defaults.get("default_currency"),
-                        ),
-                        "debit": fmt_money(
-                            row.get("debit"),
-                            currency=global_defaults.get("default_currency"),
-                        ),
-                        "balance": fmt_money(
-                            row.get("balance"),
-                            currency=global_defaults.get("default_currency"),
-                        ),
-                    }
-                if "'Total'" in row.values():
-                    total = {
-                        "account": "Total",
-                        "posting_date": to_date.strftime("%d-%m-%Y"),
-                        "credit": fmt_money(
-                            row.get("credit"),
-                            currency=global_defaults.get("default_currency"),
-                        ),
-                        "debit": fmt_money(
-                            row.get("debit"),
-                            currency=global_defaults.get("default_currency"),
-                        ),
-                        "balance": fmt_money(
-                            row.get("balance"),
-                            currency=global_defaults.get("default_currency"),
-                        ),
-                    }
-            data.insert(0, opening_balance)
-            data.append(total)
+        def summary_row(label, posting_date, row):
+            return {
+                "account": label,
+                "posting_date": posting_date.strftime("%d-%m-%Y"),
+                "credit": fmt_money(row["credit"], currency=currency),
+                "debit": fmt_money(row["debit"], currency=currency),
+                "balance": fmt_money(row["balance"], currency=currency),
+            }
 
+        data = [
+            {
+                "posting_date": row.posting_date.strftime("%d-%m-%Y"),
+                "voucher_type": row.voucher_type,
+                "voucher_no": row.voucher_no,
+                "debit": fmt_money(row.debit, currency=currency),
+                "credit": fmt_money(row.credit, currency=currency),
+                "balance": fmt_money(row.balance, currency=currency),
+                "party_type": row.party_type,
+                "party": row.party,
+            }
+            for row in statement["entries"]
+        ]
+        data.insert(0, summary_row("Opening", from_date, statement["opening"]))
+        data.append(summary_row("Total", to_date, statement["total"]))
+
+        if download == "true":
             from frappe.utils.print_format import report_to_pdf
 
-            if download == "true":
-                html = frappe.render_template(
-                    "employee_self_service/templates/employee_statement.html",
-                    {
-                        "data": data,
-                        "filters": filters_report,
-                        "user": frappe.db.get_value(
-                            "User", frappe.session.user, "full_name"
-                        ),
-                    },
-                    is_path=True,
-                )
-                return report_to_pdf(html)
+            html = frappe.render_template(
+                "employee_self_service/templates/employee_statement.html",
+                {
+                    "data": data,
+                    "filters": filters_report,
+                    "user": frappe.db.get_value(
+                        "User", frappe.session.user, "full_name"
+                    ),
+                },
+                is_path=True,
+            )
+            return report_to_pdf(html)
         return gen_response(200, "Ledger Get Successfully", data)
     except frappe.PermissionError:
         return gen_response(500, "Not permitted general ledger report")
@@ -2941,6 +2917,7 @@ def get_employee_list(start=0, page_length=20):
         return exception_handler(e)
 
 
+@instrumented("hook")
 def send_notification_for_task_assign(doc, event):
     from frappe.utils.data import strip_html
 
@@ -3325,8 +3302,12 @@ def get_nearby_team_leaders(latitude=None, longitude=None):
             business_vertical = emp_data.get("business_vertical") or emp_data.get("external_business_vertical")
             if business_vertical:
                 business_line_doc = frappe.get_doc("Business Line", business_vertical)
+                people = get_people([
+                    business_line_doc.reporting_manager,
+                    business_line_doc.external_reporting_manager,
+                ])
                 if business_line_doc.reporting_manager:
-                    employee_name = frappe.db.get_value("Employee", business_line_doc.reporting_manager, "employee_name")
+                    employee_name = (people.get(business_line_doc.reporting_manager) or {}).get("employee_name")
                     nearby_leaders.append({
                         "employee": business_line_doc.reporting_manager,
                         "employee_name": employee_name,
@@ -3334,7 +3315,7 @@ def get_nearby_team_leaders(latitude=None, longitude=None):
                         "external": 0,
                     })
                 if business_line_doc.external_reporting_manager:
-                    employee_name = frappe.db.get_value("Employee Pull", business_line_doc.external_reporting_manager, "employee_name")
+                    employee_name = (people.get(business_line_doc.external_reporting_manager) or {}).get("employee_name")
                     nearby_leaders.append({
                         "employee": business_line_doc.external_reporting_manager,
                         "employee_name": employee_name,
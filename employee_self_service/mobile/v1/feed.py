@@ -31,52 +31,159 @@ def ess_post(**data):
         return exception_handler(e)
 
 
+POST_CARD_CACHE_TTL = 24 * 60 * 60  # seconds; keys change with `modified`
+POST_CHILD_TABLES = {
+    "ess_post_attachment": "ESS Post Attachment",
+    "ess_post_poll_options": "ESS Post Poll Options",
+    "ess_post_poll_log": "ESS Post Poll Log",
+}
+
+
 def get_ess_post(post_name):
-    post_details = json.loads(frappe.get_doc("ESS Post", post_name).as_json())
-    post_details = remove_default_fields(post_details)
-    # post_details["comments"] = get_comments(
-    #     post.get("name"), limit=2, internal=True
-    # )
-    post_details["comments_count"] = frappe.db.count(
-        "Comment",
-        {
-            "reference_doctype": "ESS Post",
-            "reference_name": post_name,
-            "comment_type": "Comment",
-        },
+    posts = frappe.get_all(
+        "ESS Post",
+        filters={"name": post_name},
+        fields=["name", "modified", "_liked_by"],
     )
-    if post_details.get("_liked_by"):
-        post_details["likes_count"] = len(json.loads(post_details["_liked_by"]))
-        likes_list = json.loads(post_details["_liked_by"])
-        if frappe.session.user in likes_list:
-            post_details["liked_by_me"] = True
+    if not posts:
+        raise frappe.DoesNotExistError(_("ESS Post {0} not found").format(post_name))
+    return assemble_feed(posts)[0]
+
+
+def assemble_feed(posts):
+    """Render ``posts`` (rows with ``name``, ``modified`` and ``_liked_by``)
+    for the current user in a fixed number of queries.
+
+    The viewer-independent card (post fields and child tables) is cached
+    per ``modified``; comment counts, likes, liker profiles and the
+    viewer's poll vote are resolved for the whole page at once.
+    """
+    if not posts:
+        return []
+    user = frappe.session.user
+    names = [p.name for p in posts]
+
+    cards = {}
+    missing = []
+    for post in posts:
+        card = frappe.cache().get_value(_post_card_key(post))
+        if card is None:
+            missing.append(post)
         else:
-            post_details["liked_by_me"] = False
+            cards[post.name] = card
+    for post, card in zip(missing, _build_post_cards([p.name for p in missing])):
+        frappe.cache().set_value(
+            _post_card_key(post), card, expires_in_sec=POST_CARD_CACHE_TTL
+        )
+        cards[post.name] = card
 
-        post_details["_liked_by"] = frappe.get_all(
-            "User",
-            filters=[["name", "in", likes_list]],
-            fields=["name", "full_name", "user_image"],
+    comment_counts = dict(
+        frappe.db.sql(
+            """
+            SELECT reference_name, COUNT(*)
+            FROM `tabComment`
+            WHERE reference_doctype = 'ESS Post'
+              AND reference_name IN %(names)s
+              AND comment_type = 'Comment'
+            GROUP BY reference_name
+            """,
+            {"names": tuple(names)},
         )
+    )
 
-    else:
-        post_details["likes_count"] = 0
-        post_details["liked_by_me"] = False
-    if post_details.get("post_type") == "Poll":
-        post_details["my_vote"] = frappe.db.get_value(
-            "ESS Post Poll Log",
-            {"user": frappe.session.user, "parent": post_details.get("name")},
-            "answer",
+    raw_likes = {p.name: p._liked_by for p in posts}
+    likes = {n: json.loads(v) if v else [] for n, v in raw_likes.items()}
+    likers = set()
+    for liked_by in likes.values():
+        likers.update(liked_by)
+    liker_profiles = {}
+    if likers:
+        liker_profiles = {
+            u.name: u
+            for u in frappe.get_all(
+                "User",
+                filters=[["name", "in", list(likers)]],
+                fields=["name", "full_name", "user_image"],
+            )
+        }
+
+    poll_posts = [n for n in names if cards[n].get("post_type") == "Poll"]
+    my_votes = {}
+    if poll_posts:
+        my_votes = dict(
+            frappe.get_all(
+                "ESS Post Poll Log",
+                filters={"user": user, "parent": ["in", poll_posts]},
+                fields=["parent", "answer"],
+                as_list=True,
+            )
+        )
+
+    feed = []
+    for name in names:
+        post_details = dict(cards[name])
+        post_details["comments_count"] = comment_counts.get(name, 0)
+
+        liked_by = likes[name]
+        post_details["likes_count"] = len(liked_by)
+        post_details["liked_by_me"] = user in liked_by
+        # Likes don't touch `modified`, so never trust the cached value.
+        post_details["_liked_by"] = (
+            [liker_profiles[u] for u in liked_by if u in liker_profiles]
+            if liked_by
+            else raw_likes[name]
         )
-        post_details["total_vote"] = len(post_details.get("ess_post_poll_log"))
-        
-    if frappe.session.user != post_details.get('user'):
-        del post_details["ess_post_poll_log"]
-    else:
-        for poll_log in post_details["ess_post_poll_log"]:
-            remove_default_fields(poll_log)
-        
-    return post_details
+
+        if post_details.get("post_type") == "Poll":
+            post_details["my_vote"] = my_votes.get(name)
+            post_details["total_vote"] = len(post_details.get("ess_post_poll_log") or [])
+
+        if user != post_details.get("user"):
+            post_details.pop("ess_post_poll_log", None)
+        else:
+            post_details["ess_post_poll_log"] = [
+                remove_default_fields(dict(poll_log))
+                for poll_log in post_details.get("ess_post_poll_log") or []
+            ]
+        feed.append(post_details)
+    return feed
+
+
+def _post_card_key(post):
+    return "ess_post_card:{0}:{1}".format(post.name, post.modified)
+
+
+def _build_post_cards(names):
+    """Post documents as ``get_doc(...).as_json()`` would serialize them,
+    for many posts: one query for the posts and one per child table."""
+    if not names:
+        return []
+    posts = {
+        p.name: p
+        for p in frappe.get_all("ESS Post", filters={"name": ["in", names]}, fields=["*"])
+    }
+    for fieldname, child_doctype in POST_CHILD_TABLES.items():
+        for post in posts.values():
+            post[fieldname] = []
+        for row in frappe.get_all(
+            child_doctype,
+            filters={
+                "parent": ["in", names],
+                "parenttype": "ESS Post",
+                "parentfield": fieldname,
+            },
+            fields=["*"],
+            order_by="idx asc",
+        ):
+            row["doctype"] = child_doctype
+            posts[row.parent][fieldname].append(row)
+
+    cards = []
+    for name in names:
+        post = posts[name]
+        post["doctype"] = "ESS Post"
+        cards.append(remove_default_fields(json.loads(frappe.as_json(post))))
+    return cards
 
 
 @frappe.whitelist()
@@ -91,15 +198,12 @@ def get_feed(my_post=False, start=0, page_length=10):
         posts = frappe.get_all(
             "ESS Post",
             filters=filters,
-            fields=["name"],
+            fields=["name", "modified", "_liked_by"],
             start=start,
             page_length=page_length,
             order_by="post_datetime desc",
         )
-        feed_details = []
-        for post in posts:
-            post_details = get_ess_post(post_name=post.name)
-            feed_details.append(post_details)
+        feed_details = assemble_feed(posts)
         return gen_response(200, "post details get successfully", feed_details)
     except Exception as e:
         return exception_handler(e)
@@ -15,6 +15,10 @@ from employee_self_service.mobile.v1.api_utils import (
     check_workflow_exists,
 )
 from erpnext.accounts.party import get_dashboard_info
+from employee_self_service.employee_self_service.utils.item_catalogue import (
+    get_catalogue,
+    get_item_rates,
+)
 
 """order list api for mobile app"""
 
@@ -189,14 +193,46 @@ def get_customer_list(start=0, page_length=10, filters=None):
 
 @frappe.whitelist()
 @ess_validate(methods=["GET"])
-def get_item_list():
+def get_item_list(start=0, page_length=0, search=None):
+    try:
+        frappe.has_permission("Item", "read", throw=True)
+        catalogue = get_catalogue(
+            _get_price_list(), start=start, page_length=page_length, search=search
+        )
+        gen_response(
+            200, "Item list get successfully", _format_item_rates(catalogue["items"])
+        )
+    except frappe.PermissionError:
+        return gen_response(500, "Not permitted for item")
+    except Exception as e:
+        exception_handler(e)
+
+
+@frappe.whitelist()
+@ess_validate(methods=["GET"])
+def get_item_catalogue(start=0, page_length=100, search=None, since=None):
+    """
+    Paged item catalogue for delta sync: pass the returned ``next_since``
+    as ``since`` to get only items changed after the previous call.
+    """
     try:
-        item_list = frappe.get_list(
-            "Item",
-            fields=["name", "item_name", "item_code", "image"],
+        frappe.has_permission("Item", "read", throw=True)
+        catalogue = get_catalogue(
+            _get_price_list(),
+            start=start,
+            page_length=page_length,
+            search=search,
+            since=since,
+        )
+        gen_response(
+            200,
+            "Item list get successfully",
+            {
+                "items": _format_item_rates(catalogue["items"]),
+                "version": catalogue["version"],
+                "next_since": catalogue["next_since"],
+            },
         )
-        items = get_items_rate(item_list)
-        gen_response(200, "Item list get successfully", items)
     except frappe.PermissionError:
         return gen_response(500, "Not permitted for item")
     except Exception as e:
@@ -204,23 +240,27 @@ def get_item_list():
 
 
 def get_items_rate(items):
-    global_defaults = get_global_defaults()
-    ess_settings = get_ess_settings()
-    price_list = ess_settings.get("default_price_list")
+    rates = get_item_rates([item.name for item in items], _get_price_list())
+    for item in items:
+        item["rate"] = rates.get(item.name, 0.0)
+    return _format_item_rates(items)
+
+
+def _get_price_list():
+    price_list = get_ess_settings().get("default_price_list")
     if not price_list:
         frappe.throw(_("Please set price list in ess settings."))
+    return price_list
+
+
+def _format_item_rates(items):
+    currency = get_global_defaults().get("default_currency")
+    formatted = []
     for item in items:
-        item_price = frappe.get_all(
-            "Item Price",
-            filters={"item_code": item.name, "price_list": price_list},
-            fields=["price_list_rate"],
-        )
-        item["rate_currency"] = fmt_money(
-            item_price[0].price_list_rate if item_price else 0.0,
-            currency=global_defaults.get("default_currency"),
-        )
-        item["rate"] = item_price[0].price_list_rate if item_price else 0.0
-    return items
+        item = dict(item)
+        item["rate_currency"] = fmt_money(item.get("rate") or 0.0, currency=currency)
+        formatted.append(item)
+    return formatted
 
 
 @frappe.whitelist()
@@ -9,6 +9,10 @@ from employee_self_service.mobile.v1.api_utils import (
     get_actions,
     check_workflow_exists,
 )
+from employee_self_service.employee_self_service.utils.pickers import (
+    search_accounts,
+    search_parties,
+)
 
 
 """payment entry meta data"""
@@ -56,24 +60,15 @@ def get_defaults_for_pe(payment_entry_meta):
 
 @frappe.whitelist()
 @ess_validate(methods=["GET"])
-def get_party(party_type):
+def get_party(party_type, txt=None, start=0, page_length=0):
+    """
+    Parties whose ID or name starts with ``txt``; pass ``page_length`` for
+    typeahead paging (0 returns every match).
+    """
     try:
-        if party_type == "Customer":
-            meta_data = frappe.get_list(
-                party_type, fields=["name", "customer_name as party_name"]
-            )
-        if party_type == "Employee":
-            meta_data = frappe.get_list(
-                party_type, fields=["name", "employee_name as party_name"]
-            )
-        if party_type == "Shareholder":
-            meta_data = frappe.get_list(
-                party_type, fields=["name", "title as party_name"]
-            )
-        if party_type == "Supplier":
-            meta_data = frappe.get_list(
-                party_type, fields=["name", "supplier_name as party_name"]
-            )
+        meta_data = search_parties(
+            party_type, txt=txt, start=start, page_length=page_length
+        )
         gen_response(200, "data get successfully", meta_data)
     except frappe.PermissionError:
         return gen_response(500, "Not permitted")
@@ -111,7 +106,9 @@ Account list will be based on payment type
 
 @frappe.whitelist()
 @ess_validate(methods=["GET"])
-def get_account_paid_from_list(party_type, payment_type, company):
+def get_account_paid_from_list(
+    party_type, payment_type, company, txt=None, start=0, page_length=0
+):
     try:
         if payment_type == "Receive":
             if party_type in ["Employee", "Shareholder", "Supplier"]:
@@ -122,15 +119,16 @@ def get_account_paid_from_list(party_type, payment_type, company):
         if payment_type == "Pay" or payment_type == "Internal Transfer":
             account_type = ["Bank", "Cash"]
 
-        accounts = frappe.get_list(
-            "Account",
-            pluck="name",
-            filters={
-                "account_type": ["in", account_type],
-                "is_group": 0,
-                "company": company,
-            },
-        )
+        accounts = [
+            account["name"]
+            for account in search_accounts(
+                company,
+                txt=txt,
+                account_types=account_type,
+                start=start,
+                page_length=page_length,
+            )
+        ]
         gen_response(200, "Account list get successfully", accounts)
     except frappe.PermissionError:
         return gen_response(500, "Not permitted for Account list")
@@ -146,7 +144,9 @@ Account list will be based on payment type
 
 @frappe.whitelist()
 @ess_validate(methods=["GET"])
-def get_account_paid_to_list(party_type, payment_type, company):
+def get_account_paid_to_list(
+    party_type, payment_type, company, txt=None, start=0, page_length=0
+):
     try:
         if payment_type == "Receive" or payment_type == "Internal Transfer":
             account_type = ["Bank", "Cash"]
@@ -157,15 +157,16 @@ def get_account_paid_to_list(party_type, payment_type, company):
             if party_type == "Customer":
                 account_type = ["Receivable"]
 
-        accounts = frappe.get_list(
-            "Account",
-            pluck="name",
-            filters={
-                "account_type": ["in", account_type],
-                "is_group": 0,
-                "company": company,
-            },
-        )
+        accounts = [
+            account["name"]
+            for account in search_accounts(
+                company,
+                txt=txt,
+                account_types=account_type,
+                start=start,
+                page_length=page_length,
+            )
+        ]
 
         gen_response(200, "Account list get successfully", accounts)
     except frappe.PermissionError:
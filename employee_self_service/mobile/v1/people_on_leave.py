@@ -6,6 +6,7 @@ from employee_self_service.mobile.v1.api_utils import (
     get_employee_by_user,
     exception_handler,
 )
+from employee_self_service.employee_self_service.utils.leave_occupancy import get_employees_on_leave
 
 
 @frappe.whitelist()
@@ -31,22 +32,10 @@ def get_people_on_leave(date=None):
 
         check_date = getdate(date) if date else getdate(today())
 
-        employees_on_leave = frappe.db.sql(
-            """
-            SELECT
-                la.employee,
-                la.employee_name
-            FROM `tabLeave Application` la
-            WHERE
-                la.status = 'Approved'
-                AND la.docstatus = 1
-                AND la.from_date <= %(date)s
-                AND la.to_date >= %(date)s
-            ORDER BY la.employee_name ASC
-            """,
-            {"date": check_date},
-            as_dict=True,
-        )
+        employees_on_leave = [
+            {"employee": row.employee, "employee_name": row.employee_name}
+            for row in get_employees_on_leave(check_date).values()
+        ]
 
         return gen_response(
             200,
@@ -1,6 +1,8 @@
 import frappe
 from frappe.utils import cint
 
+from employee_self_service.employee_self_service.utils.people_directory import get_person_name
+
 
 def update_reports_to(employee_name, report_to, external,log_doc=None):
     """Update the reporting manager for an employee.
@@ -34,9 +36,6 @@ def update_reports_to(employee_name, report_to, external,log_doc=None):
         if log_doc:
             log_doc.reports_to = report_to
             log_doc.reports_to_change = 1
-            if cint(external) == 1:
-                log_doc.reports_to_name = frappe.db.get_value("Employee Pull", report_to, "employee_name")
-            else:
-                log_doc.reports_to_name = frappe.db.get_value("Employee", report_to, "employee_name")
+            log_doc.reports_to_name = get_person_name(report_to)
 
             log_doc.save(ignore_permissions=True)
\ No newline at end of file
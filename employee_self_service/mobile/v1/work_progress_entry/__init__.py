@@ -7,7 +7,9 @@ from employee_self_service.mobile.v1.api_utils import (
     get_employee_by_user
 )
 from frappe.utils import today
-from frappe.handler import upload_file
+from employee_self_service.employee_self_service.utils.image_pipeline import (
+    attach_uploaded_image,
+)
 
 @frappe.whitelist()
 @ess_validate(methods=["GET"])
@@ -156,23 +158,11 @@ def upload_register_image(work_progress_entry_name):
         if "file" not in frappe.request.files:
             return gen_response(400, "No file provided")
 
-        # Delete old image if exists
-        if work_progress_entry_doc.register_image:
-            old_file_url = work_progress_entry_doc.register_image
-            file_doc = frappe.db.get_value("File", {"file_url": old_file_url}, "name")
-            if file_doc:
-                frappe.delete_doc("File", file_doc, ignore_permissions=True)
-
-        # Upload new file
-        file = upload_file()
-        file.attached_to_doctype = "Work Progress Entry"
-        file.attached_to_name = work_progress_entry_doc.name
-        file.attached_to_field = "register_image"
-        file.save(ignore_permissions=True)
-
-        # Update work progress entry document with image URL
-        work_progress_entry_doc.register_image = file.get("file_url")
-        work_progress_entry_doc.save(ignore_permissions=True)
+        # Streams the upload to disk, replaces the previous image and sets
+        # register_image without re-saving the entry.
+        file = attach_uploaded_image(
+            "Work Progress Entry", work_progress_entry_doc.name, "register_image"
+        )
 
         return gen_response(
             200,
@@ -0,0 +1,19 @@
+import frappe
+
+from employee_self_service.employee_self_service.utils.retention import DEFAULT_POLICIES
+
+
+def execute():
+	frappe.reload_doc("employee_self_service", "doctype", "ess_retention_policy")
+	frappe.reload_doc("employee_self_service", "doctype", "employee_self_service_settings")
+
+	settings = frappe.get_single("Employee Self Service Settings")
+	existing = {p.document_type for p in settings.get("retention_policies") or []}
+	for policy in DEFAULT_POLICIES:
+		if policy["document_type"] in existing:
+			continue
+		if not frappe.db.exists("DocType", policy["document_type"]):
+			continue
+		settings.append("retention_policies", dict(policy, enabled=1))
+	settings.flags.ignore_mandatory = True
+	settings.save(ignore_permissions=True)
@@ -0,0 +1,9 @@
+import frappe
+
+from employee_self_service.employee_self_service.utils.gl_statement import GL_INDEX
+
+
+def execute():
+	"""Index GL Entry for party statements: openings and pages are ranges
+	on ``posting_date`` within one party."""
+	frappe.db.add_index("GL Entry", GL_INDEX)
@@ -0,0 +1,12 @@
+import frappe
+
+from employee_self_service.employee_self_service.utils.pickers import PARTY_TITLE_FIELDS
+
+
+def execute():
+	"""Index the party title columns searched by the mobile typeahead
+	pickers (prefix LIKE on name or title)."""
+	for doctype, fieldname in PARTY_TITLE_FIELDS.items():
+		if not frappe.db.table_exists(doctype) or not frappe.db.has_column(doctype, fieldname):
+			continue
+		frappe.db.add_index(doctype, [fieldname])
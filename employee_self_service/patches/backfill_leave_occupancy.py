@@ -0,0 +1,9 @@
+import frappe
+
+from employee_self_service.employee_self_service.utils.leave_occupancy import rebuild
+
+
+def execute():
+	"""Fill Leave Occupancy from every submitted Leave Application."""
+	frappe.reload_doc("employee_self_service", "doctype", "leave_occupancy")
+	rebuild()
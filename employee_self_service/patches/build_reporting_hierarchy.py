@@ -0,0 +1,10 @@
+import frappe
+
+from employee_self_service.employee_self_service.utils.reporting_hierarchy import rebuild_hierarchy
+
+
+def execute():
+	"""Fill Reporting Hierarchy from the current Employee / Employee Pull
+	reporting fields."""
+	frappe.reload_doc("employee_self_service", "doctype", "reporting_hierarchy")
+	rebuild_hierarchy()
@@ -0,0 +1,17 @@
+import frappe
+
+SETTINGS = "Employee Self Service Settings"
+DEFAULTS = {"image_max_dimension": 1600, "image_quality": 80}
+
+
+def execute():
+	frappe.reload_doc("employee_self_service", "doctype", "employee_self_service_settings")
+
+	# Single defaults only apply on first install; existing sites read the
+	# new fields as 0, which turns downscaling off.
+	for fieldname, default in DEFAULTS.items():
+		if not frappe.db.sql(
+			"SELECT 1 FROM `tabSingles` WHERE doctype = %s AND field = %s",
+			(SETTINGS, fieldname),
+		):
+			frappe.db.set_value(SETTINGS, None, fieldname, default)
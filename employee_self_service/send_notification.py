@@ -5,6 +5,8 @@ from frappe import enqueue
 from frappe.utils import parse_val, cint
 from employee_self_service.utils import notification_log
 from employee_self_service.employee_self_service.doctype.ess_notification.v12_compatible import cast
+from employee_self_service.employee_self_service.utils.instrumentation import instrumented
+from employee_self_service.employee_self_service.utils.job_router import enqueue_job
 
 
 event_mapping = {
@@ -20,6 +22,7 @@ event_mapping = {
 
 
 @frappe.whitelist()
+@instrumented("hook")
 def notification(doc, event):
     try:
         if frappe.db.exists("DocType", "ESS Notification"):
@@ -113,6 +116,8 @@ def notification_processing(doc, event):
         "Error Log",
         "ESS Notification",
         "ESS Notification Log",
+        "ESS Broadcast",
+        "ESS Broadcast Read",
     ):
         return
 
@@ -187,8 +192,8 @@ def notification_processing(doc, event):
             document_type = doc.document_type
             document_name = doc.document_name
 
-        frappe.enqueue(
-            send_notification,
+        enqueue_job(
+            "employee_self_service.send_notification.send_notification",
             notification_name=notification["name"],
             doctype_name=doc.doctype,
             subject=subject,
@@ -197,7 +202,6 @@ def notification_processing(doc, event):
             document_type=document_type,
             document_name=document_name,
             other_info=other_info,
-            queue="short",
         )
 
 